@@ -9,6 +9,7 @@ sys.path.append(os.getcwd())
 # REMOVE
 
 from Imports.constants import LANGUAGES
+from Modules.Scan.constants import SCAN_POOL_TYPES
 from Modules.Translate.translator import LANGUAGE_NAME
 
 
@@ -25,6 +26,42 @@ class Config(BaseModel):
     backup_folder: str = "~/Music/Backups"
     no_auth: bool = False
 
+    # Network:
+    max_concurrent_requests: int = 8  # requests to vgmdb in flight at once
+    max_requests_per_second: float = 4  # per host, shared by every request to vgmdb (api, covers, scans), 0 for no limit, hosts on this machine are not limited
+    request_burst: int = 8  # requests a host may get at once before the limit applies
+    fallback_api_urls: list[str] = []  # more vgmdb.info compatible servers, tried in order when the ones before them fail or are slow
+    hedge_requests: bool = True  # send a request to the next server too when the first one is slower than usual, the first response is used
+    prefetch_albums: int = 2  # while working on an album, search for and fetch the next albums (0 to turn off)
+    prefetch_memory_mb: int = 64  # maximum memory held by albums fetched from vgmdb (prefetched ones included) and their covers
+    http_cache: bool = True  # keep vgmdb responses on disk between runs, so that albums and searches seen before are not downloaded again
+    http_cache_mb: int = 128  # least recently used responses are evicted beyond this size
+
+    # Scanning:
+    scan_index: bool = True  # remember the tags of scanned files on disk and only read files which changed since the last scan
+    scan_workers: int = 1  # number of workers reading tags concurrently while scanning
+    scan_pool_type: SCAN_POOL_TYPES = "thread"
+    scan_queue_size: int = 0  # number of albums scanned ahead in a background thread while the current album is being worked on (0 disables it)
+    max_open_files: int = 256  # audio files kept open at once, least recently used ones are closed (and saved if modified) beyond this
+    max_open_files_mb: int = 512  # estimated memory (mostly embedded pictures) of audio files kept open at once
+    scan_only: bool = False  # only scan, writing the found albums to scan_snapshot if given, nothing is tagged or organized
+    scan_snapshot: str | None = None  # written by a scan_only run, otherwise albums are loaded from it instead of scanning root_dir
+
+    # Runs:
+    plan: str | None = None  # write the tag changes and renames of every album to this plan instead of modifying any file
+    apply_plan: str | None = None  # only apply the tag changes and renames of this plan (for albums under root_dir), nothing is fetched
+    journal: bool = True  # record what was done to every album and file, so that an interrupted run can be resumed
+    resume: bool = False  # skip what the journal of the previous run on root_dir says is done, and finish what it left half done
+
+    # Saving:
+    save_workers: int = 4  # number of files saved concurrently after tagging an album
+    max_write_mb_per_second: float = 0  # disk writes of saves, renames and backups are throttled to this (0 for no limit)
+    max_write_operations_per_second: float = 0  # same, for the number of writes (each save, rename or copied chunk) per second
+    stream_pictures: bool = False  # compare and embed the cover while saving, a file at a time within picture_memory_mb, instead of keeping every file of the album open with its pictures
+    picture_memory_mb: int = 256  # memory (in MB) pictures of files being saved may take with stream_pictures, files are saved one by one beyond this
+    verify_audio: bool = True  # hash the audio data of every file before and after saving it, files whose audio changed are reported
+    reserve_padding: bool = True  # keep the padding after the tags and reserve more when a file has to be rewritten anyway, so that tagging again only writes the metadata
+
     # Tagging:
     # Album specific flags
     tag: bool = True
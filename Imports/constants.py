@@ -1,5 +1,7 @@
+import os
 from typing import Literal
 
 
 LANGUAGES = Literal["english", "translated", "romaji", "japanese", "other"]
 THREAD_EXECUTOR_NUM_THREADS = 8
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "VGMDB-Auto-Tagger")  # persistent data shared between runs (scan index, etc)
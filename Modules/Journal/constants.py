@@ -0,0 +1,9 @@
+from typing import Literal
+
+JOURNAL_FORMAT = "vgmdb-auto-tagger-journal"
+JOURNAL_VERSION = 1
+JOURNAL_FOLDER_NAME = "journals"  # inside CACHE_DIR, one journal per root directory
+JOURNAL_FSYNC_INTERVAL_ENTRIES = 256  # entries are handed to the os right away, but only forced to disk this often (and at the end of every album)
+JOURNAL_FSYNC_INTERVAL_SECONDS = 5.0
+
+JOURNAL_STAGES = Literal["fetched", "confirmed", "tagged", "saved", "renamed", "done"]  # "saved" is also recorded per file
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Optional
+from pydantic import BaseModel
+
+from Imports.constants import CACHE_DIR
+from Modules.Journal import constants
+from Modules.Journal.constants import JOURNAL_STAGES
+from Modules.Journal.models.journal_entry import AlbumJournalState, JournalEntry
+from Modules.Utils.general_utils import get_default_logger
+
+"""
+the journal records the stages every album went through during a run, and every file saved, so that an interrupted run can be resumed
+renames are only recorded per album, organizing an album again leaves the files it already renamed alone
+it is a JSON-lines file: a header line followed by one JournalEntry per line, only ever appended to while resuming (a new run starts a new journal)
+"""
+
+logger = get_default_logger(__name__, "info")
+
+
+class JournalException(Exception):
+    pass
+
+
+class JournalHeader(BaseModel):
+    format: str
+    version: int
+    root_dir: str
+
+
+class Journal:
+    """
+    every entry is handed to the os as soon as it is recorded, so a crash or Ctrl+C of the program loses nothing
+    entries are only forced to disk in batches (and by sync, at the end of every album), a power loss can only lose the last batch
+    """
+
+    def __init__(self, root_dir: str, resume: bool = False, journal_path: Optional[str] = None):
+        self.root_dir = os.path.abspath(root_dir)
+        self.journal_path = journal_path if journal_path else get_journal_path(root_dir)
+        self.album_states: dict[str, AlbumJournalState] = {}
+        self.lock = threading.Lock()
+        self.syncs = 0
+        self._pending_entries, self._last_sync_time = 0, time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+        if resume and os.path.exists(self.journal_path) and os.path.getsize(self.journal_path):
+            self._replay()
+        self._file = open(self.journal_path, "a" if resume else "w", encoding="utf-8")
+        if not self._file.tell():
+            self._file.write(JournalHeader(format=constants.JOURNAL_FORMAT, version=constants.JOURNAL_VERSION, root_dir=self.root_dir).model_dump_json() + "\n")
+            self._file.flush()
+        elif not _ends_with_newline(self.journal_path):
+            self._file.write("\n")  # do not continue an entry cut short by a power loss
+
+    def get_album_state(self, album_key: str) -> Optional[AlbumJournalState]:
+        """album_key is given by get_album_key, the album may have been renamed by the run which recorded it"""
+        return self.album_states.get(_normalize_path(album_key))
+
+    def record(self, album_key: str, stage: JOURNAL_STAGES, file_path: Optional[str] = None, album_id: Optional[str] = None, new_path: Optional[str] = None):
+        """safe to call from several threads, new_path of a renamed album is its new album key"""
+        entry = JournalEntry(album=_normalize_path(album_key), stage=stage, file=_normalize_path(file_path) if file_path else None, album_id=album_id, new_path=new_path)
+        line = entry.model_dump_json(exclude_none=True) + "\n"
+        with self.lock:
+            self._apply(entry)
+            self._file.write(line)
+            self._file.flush()
+            self._pending_entries += 1
+            if self._pending_entries >= constants.JOURNAL_FSYNC_INTERVAL_ENTRIES or time.monotonic() - self._last_sync_time >= constants.JOURNAL_FSYNC_INTERVAL_SECONDS:
+                self._sync()
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def close(self):
+        with self.lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
+
+    # private functions
+    def _sync(self):
+        if not self._pending_entries:
+            return
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+        self._pending_entries, self._last_sync_time = 0, time.monotonic()
+
+    def _replay(self):
+        with open(self.journal_path, "r", encoding="utf-8") as file:
+            try:
+                header = JournalHeader.model_validate_json(file.readline())
+            except ValueError as e:
+                raise JournalException(f"{self.journal_path} is not a journal") from e
+            if header.format != constants.JOURNAL_FORMAT or header.version != constants.JOURNAL_VERSION:
+                raise JournalException(f"{self.journal_path} is not a journal of version {constants.JOURNAL_VERSION}, run again without resuming")
+            for line_number, line in enumerate(file, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(JournalEntry.model_validate_json(line))
+                except ValueError:  # the last entry can be cut short by a power loss
+                    logger.warning(f"ignoring invalid entry on line {line_number} of {self.journal_path}")
+
+    def _apply(self, entry: JournalEntry):
+        state = self.album_states.setdefault(entry.album, AlbumJournalState())
+        if entry.file:
+            if entry.stage == "saved":
+                state.saved_files.add(entry.file)
+            return
+        state.stages.add(entry.stage)
+        if entry.album_id:
+            state.album_id = entry.album_id
+        if entry.stage == "renamed" and entry.new_path:
+            self.album_states[_normalize_path(entry.new_path)] = state  # found under its new name when resuming
+
+
+def get_album_key(album_folder_path: str, file_paths: Optional[list[str]] = None) -> str:
+    """
+    the key of an album in the journal: its folder, along with a hash of its files (file_paths) when the folder holds several albums
+    '/Music/OST' -> '/Music/OST', with file_paths -> '/Music/OST#3f2c9a1b04de'
+    """
+    album_folder_path = _normalize_path(album_folder_path)
+    if not file_paths:
+        return album_folder_path
+    relative_paths = sorted(os.path.relpath(_normalize_path(file_path), album_folder_path) for file_path in file_paths)
+    return f"{album_folder_path}#{hashlib.sha1(chr(0).join(relative_paths).encode('utf-8')).hexdigest()[:12]}"
+
+
+def get_journal_path(root_dir: str) -> str:
+    root_dir = _normalize_path(root_dir)
+    root_dir_hash = hashlib.sha1(root_dir.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, constants.JOURNAL_FOLDER_NAME, f"{os.path.basename(root_dir) or 'root'}-{root_dir_hash}.jsonl")
+
+
+# private functions
+def _normalize_path(path: str) -> str:
+    return os.path.normpath(os.path.abspath(path))
+
+
+def _ends_with_newline(file_path: str) -> bool:
+    with open(file_path, "rb") as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b"\n"
@@ -0,0 +1,27 @@
+import os
+from pydantic import BaseModel
+
+from Modules.Journal.constants import JOURNAL_STAGES
+
+
+class JournalEntry(BaseModel):
+    album: str  # album key (see get_album_key) when the album was started
+    stage: JOURNAL_STAGES
+    file: str | None = None  # set when a single file was saved
+    album_id: str | None = None  # set when fetched
+    new_path: str | None = None  # set when renamed
+
+
+class AlbumJournalState(BaseModel):
+    """what a previous run got done for an album"""
+
+    album_id: str | None = None
+    stages: set[str] = set()
+    saved_files: set[str] = set()
+
+    @property
+    def done(self) -> bool:
+        return "done" in self.stages
+
+    def is_file_saved(self, file_path: str) -> bool:
+        return os.path.normpath(os.path.abspath(file_path)) in self.saved_files
@@ -2,8 +2,10 @@ import os
 from pathlib import Path
 from Imports.config import Config
 from Modules.Utils.general_utils import cleanDate, getProperCount
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
 from Modules.Scan.models.local_album_data import LocalAlbumData, LocalTrackData
 from Modules.Utils.general_utils import get_default_logger, getFirstProperOrNone, ifNot
+from Modules.Utils.io_governor import get_io_governor
 from Modules.Organize.models.organize_result import FileOrganizeResult, FolderOrganizeResult
 from Modules.Organize.template import TemplateResolver
 from Modules.Organize.organize_utils import clean_name, extract_disc_name_from_folder_name, extract_disc_number_from_folder_name, extract_track_name_from_file_name, extract_track_number_from_file_name, get_base_folder_under_parent
@@ -18,7 +20,7 @@ class Organizer:
         self.local_album_data = local_album_data
         self.config = config
         self.sample_file = local_album_data.get_one_sample_track()
-        self.audio_manager = self.sample_file.audio_manager
+        self.sample_tags = self.sample_file.tags
         self.album_folder_path = local_album_data.album_folder_path
 
     def organize(self) -> FolderOrganizeResult:
@@ -33,31 +35,7 @@ class Organizer:
 
     def commit_changes(self, folder_organize_result: FolderOrganizeResult):
         """manually commit changes given by organize function"""
-        if self.config.rename_files:
-            for file_organize_result in folder_organize_result.file_organize_results:
-                new_path = file_organize_result.new_path
-                if not new_path:
-                    logger.debug(f"new name not present for {file_organize_result.old_name}")
-                    continue
-                if file_organize_result.old_path == new_path:
-                    continue
-                logger.info(f"renaming {file_organize_result.old_name} to {file_organize_result.new_name}")
-                try:
-                    base_folder_path = os.path.dirname(new_path)
-                    os.makedirs(base_folder_path, exist_ok=True)
-                    os.rename(file_organize_result.old_path, new_path)
-                except Exception as e:
-                    logger.error(f"error in renaming file {file_organize_result.old_name}: {e}")
-
-        if self.config.rename_folder and folder_organize_result.new_path != folder_organize_result.old_path:
-            if not folder_organize_result.new_path:
-                logger.error(f"new name not present for {folder_organize_result.old_name}")
-                return
-            logger.info(f"renaming {folder_organize_result.old_name} to {folder_organize_result.new_name}")
-            try:
-                os.rename(folder_organize_result.old_path, folder_organize_result.new_path)
-            except Exception as e:
-                logger.error(f"error in renaming folder {folder_organize_result.old_name}: {e}")
+        commit_folder_organize_result(folder_organize_result, rename_files=self.config.rename_files, rename_folder=self.config.rename_folder)
 
     # Private Functions
     def _organize_album_files(self) -> list[FileOrganizeResult]:
@@ -129,40 +107,73 @@ class Organizer:
         return os.path.join(new_disc_folder_name, new_file_name)
 
     def _get_track_number(self, file: LocalTrackData) -> int | None:
-        track_numbers: list[int | None] = [file.audio_manager.getTrackNumber(), extract_track_number_from_file_name(file.file_name)]
+        track_numbers: list[int | None] = [file.tags.track_number, extract_track_number_from_file_name(file.file_name)]
         return getFirstProperOrNone(track_numbers)
 
     def _get_total_tracks(self, file: LocalTrackData) -> int | None:
-        return file.audio_manager.getTotalTracks()
+        return file.tags.total_tracks
 
     def _get_disc_number(self, file: LocalTrackData, disc_folder_name: str | None) -> int | None:
-        disc_numbers: list[int | None] = [file.audio_manager.getDiscNumber(), extract_disc_number_from_folder_name(disc_folder_name)]
+        disc_numbers: list[int | None] = [file.tags.disc_number, extract_disc_number_from_folder_name(disc_folder_name)]
         return getFirstProperOrNone(disc_numbers)
 
     def _get_total_discs(self, file: LocalTrackData) -> int | None:
-        return file.audio_manager.getTotalDiscs()
+        return file.tags.total_discs
 
     def _get_disc_name(self, file: LocalTrackData, disc_folder_name: str | None) -> str | None:
-        disc_names = [getFirstProperOrNone(file.audio_manager.getDiscName()), extract_disc_name_from_folder_name(disc_folder_name)]
+        disc_names = [getFirstProperOrNone(file.tags.disc_name), extract_disc_name_from_folder_name(disc_folder_name)]
         return getFirstProperOrNone(disc_names)
 
     def _get_title(self, file: LocalTrackData) -> str | None:
-        titles: list[str | None] = [getFirstProperOrNone(file.audio_manager.getTitle()), extract_track_name_from_file_name(file.file_name)]
+        titles: list[str | None] = [getFirstProperOrNone(file.tags.title), extract_track_name_from_file_name(file.file_name)]
         return getFirstProperOrNone(titles)
 
     def _get_album_template_mapping(self) -> dict[str, str | None]:
-        date = cleanDate(ifNot(self.audio_manager.getDate(), ""))
+        date = cleanDate(ifNot(self.sample_tags.date, ""))
         if not date:
-            date = cleanDate(ifNot(getFirstProperOrNone(self.audio_manager.getCustomTag("year")), ""))
+            date = cleanDate(ifNot(getFirstProperOrNone(self.sample_tags.year), ""))
         if date:
             date = date.replace("-", ".")
         else:
             date = None
         return {
-            "albumname": getFirstProperOrNone(self.audio_manager.getAlbum()) if not self.config.same_folder_name else None,
+            "albumname": getFirstProperOrNone(self.sample_tags.album) if not self.config.same_folder_name else None,
             "foldername": self.local_album_data.album_folder_name,
-            "catalog": getFirstProperOrNone(self.audio_manager.getCatalog()),
+            "catalog": getFirstProperOrNone(self.sample_tags.catalog),
             "date": date,
-            "barcode": getFirstProperOrNone(self.audio_manager.getCustomTag("barcode")),
+            "barcode": getFirstProperOrNone(self.sample_tags.barcode),
             "format": self.sample_file.get_audio_source(),
         }
+
+
+def commit_folder_organize_result(folder_organize_result: FolderOrganizeResult, rename_files: bool, rename_folder: bool):
+    """renames the files and then the folder as given by Organizer.organize, also used to apply the renames of a plan"""
+    for file_organize_result in folder_organize_result.file_organize_results:
+        # open audio managers would point to the old paths after renaming, tagging already saved whatever it finished
+        get_audio_manager_pool().discard(file_organize_result.old_path, save=False)
+
+    if rename_files:
+        for file_organize_result in folder_organize_result.file_organize_results:
+            new_path = file_organize_result.new_path
+            if not new_path:
+                logger.debug(f"new name not present for {file_organize_result.old_name}")
+                continue
+            if file_organize_result.old_path == new_path:
+                continue
+            logger.info(f"renaming {file_organize_result.old_name} to {file_organize_result.new_name}")
+            try:
+                base_folder_path = os.path.dirname(new_path)
+                os.makedirs(base_folder_path, exist_ok=True)
+                get_io_governor().rename(file_organize_result.old_path, new_path)
+            except Exception as e:
+                logger.error(f"error in renaming file {file_organize_result.old_name}: {e}")
+
+    if rename_folder and folder_organize_result.new_path != folder_organize_result.old_path:
+        if not folder_organize_result.new_path:
+            logger.error(f"new name not present for {folder_organize_result.old_name}")
+            return
+        logger.info(f"renaming {folder_organize_result.old_name} to {folder_organize_result.new_name}")
+        try:
+            get_io_governor().rename(folder_organize_result.old_path, folder_organize_result.new_path)
+        except Exception as e:
+            logger.error(f"error in renaming folder {folder_organize_result.old_name}: {e}")
@@ -0,0 +1,5 @@
+PLAN_FORMAT = "vgmdb-auto-tagger-plan"
+PLAN_VERSION = 1  # bump when AlbumPlan or TagChange change incompatibly
+PLAN_SIDECAR_FOLDER_SUFFIX = ".data"  # binary tag data (covers) is stored in <plan file>.data/<sha256 of the data>
+
+PLAN_APPLY_ALBUMS_AHEAD = 4  # albums whose files are being saved while the renames of an earlier album are waiting for its files
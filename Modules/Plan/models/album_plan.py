@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+from Modules.Organize.models.organize_result import FolderOrganizeResult
+from Modules.Tag.models.tag_change import TagChange
+
+
+class FileTagPlan(BaseModel):
+    file_path: str
+    size: int  # size and modification time of the file when it was planned, the file is not tagged if it changed since
+    modification_time: int
+    changes: list[TagChange]
+
+
+class AlbumPlan(BaseModel):
+    album_folder_path: str
+    vgmdb_link: str | None = None
+    file_tag_plans: list[FileTagPlan] = []
+    folder_organize_result: FolderOrganizeResult | None = None
+    rename_files: bool = True
+    rename_folder: bool = True
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.file_tag_plans and not self.folder_organize_result
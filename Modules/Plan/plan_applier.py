@@ -0,0 +1,81 @@
+import os
+import concurrent.futures
+from collections import deque
+from typing import Iterable, Iterator
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Organize.organizer import commit_folder_organize_result
+from Modules.Plan import constants
+from Modules.Plan.models.album_plan import AlbumPlan, FileTagPlan
+from Modules.Tag.models.tag_result import AlbumTagResult, FileTagResult
+from Modules.Tag.padded_save import save_with_padding
+from Modules.Utils.general_utils import get_default_logger
+from Modules.Utils.io_governor import get_io_governor
+from Modules.Verify.audio_verifier import get_audio_verifier
+
+logger = get_default_logger(__name__, "info")
+
+
+class PlanApplier:
+    """
+    applies the tag changes and renames of planned albums without any network access
+    files of several albums are saved concurrently (config.save_workers at once), an album is renamed once all of its files are saved
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+    def apply(self, album_plans: Iterable[AlbumPlan]) -> Iterator[tuple[AlbumPlan, AlbumTagResult]]:
+        """yields the albums in plan order as they are finished"""
+        pending: deque[tuple[AlbumPlan, list[concurrent.futures.Future[FileTagResult]]]] = deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.config.save_workers)) as executor:
+            for album_plan in album_plans:
+                pending.append((album_plan, [executor.submit(self._apply_file_tag_plan, file_tag_plan) for file_tag_plan in album_plan.file_tag_plans]))
+                if len(pending) > constants.PLAN_APPLY_ALBUMS_AHEAD:
+                    yield self._finish_album(*pending.popleft())
+            while pending:
+                yield self._finish_album(*pending.popleft())
+
+    # private functions
+    def _finish_album(self, album_plan: AlbumPlan, futures: list[concurrent.futures.Future[FileTagResult]]) -> tuple[AlbumPlan, AlbumTagResult]:
+        tag_result = AlbumTagResult(file_tag_results=[future.result() for future in futures])
+        if album_plan.folder_organize_result:
+            if tag_result.failed_file_tag_results:
+                logger.error(f"not renaming {album_plan.album_folder_path}, some of its files could not be tagged")
+            else:
+                commit_folder_organize_result(album_plan.folder_organize_result, rename_files=album_plan.rename_files, rename_folder=album_plan.rename_folder)
+        return album_plan, tag_result
+
+    def _apply_file_tag_plan(self, file_tag_plan: FileTagPlan) -> FileTagResult:
+        """errors are collected in the result of the file, like while tagging"""
+        changed_fields = list(dict.fromkeys(change.field for change in file_tag_plan.changes))
+        result = FileTagResult(file_path=file_tag_plan.file_path, changed_fields=changed_fields, changes=file_tag_plan.changes)
+        try:
+            stat = os.stat(file_tag_plan.file_path)
+            if (stat.st_size, stat.st_mtime_ns) != (file_tag_plan.size, file_tag_plan.modification_time):
+                raise Exception("the file changed since it was planned, plan it again")
+            hash_before = get_audio_verifier().submit(file_tag_plan.file_path) if self.config.verify_audio else None
+            audio_manager = AudioFactory.buildAudioManager(file_tag_plan.file_path)  # not pooled, every file is opened once
+            for change in file_tag_plan.changes:
+                change.apply(audio_manager)
+            if hash_before:
+                concurrent.futures.wait([hash_before])  # the audio has to be hashed before the file changes
+            if not self.config.reserve_padding:
+                audio_manager.save()
+                stats = None
+            else:
+                stats = save_with_padding(audio_manager)
+        except Exception as e:
+            result.error = f"{type(e).__name__} -> {e}"
+            logger.error(f"unable to apply the plan of {file_tag_plan.file_path}, error: {result.error}")
+            return result
+        result.saved = True
+        if hash_before:
+            result.audio_intact = get_audio_verifier().compare(file_tag_plan.file_path, hash_before, get_audio_verifier().submit(file_tag_plan.file_path))
+        if stats:
+            result.in_place, result.bytes_written = stats.in_place, stats.bytes_written
+        else:
+            result.bytes_written = os.path.getsize(file_tag_plan.file_path)
+        get_io_governor().throttle(result.bytes_written)
+        return result
@@ -0,0 +1,127 @@
+import hashlib
+import os
+from typing import IO, Iterator
+from pydantic import BaseModel
+
+from Modules.Plan import constants
+from Modules.Plan.models.album_plan import AlbumPlan
+from Modules.Utils.general_utils import get_default_logger
+
+"""
+a plan holds the exact tag changes and renames worked out for every album, so that the slow and interactive part (searching, fetching
+and confirming) can be done at one time and the heavy disk I/O at another, without any network access
+a plan is a JSON-lines file: a header line followed by one AlbumPlan per line, binary tag data like covers is stored once per distinct
+value in a sidecar folder next to the plan (named after its sha256) and referenced from the changes
+"""
+
+logger = get_default_logger(__name__, "info")
+
+
+class PlanException(Exception):
+    pass
+
+
+class PlanHeader(BaseModel):
+    format: str
+    version: int
+
+
+class PlanWriter:
+    """appends albums to a plan as soon as they are planned, so an interrupted planning session keeps what was already planned"""
+
+    def __init__(self, plan_path: str):
+        self.plan_path = plan_path
+        self.sidecar_folder = get_sidecar_folder(plan_path)
+        self.albums_written = 0
+        os.makedirs(os.path.dirname(os.path.abspath(plan_path)), exist_ok=True)
+        if os.path.exists(plan_path) and os.path.getsize(plan_path):
+            with open(plan_path, "r", encoding="utf-8") as file:
+                _read_header(file, plan_path)  # only add to files which are plans
+        self._file = open(plan_path, "a", encoding="utf-8")
+        if not self._file.tell():
+            self._file.write(PlanHeader(format=constants.PLAN_FORMAT, version=constants.PLAN_VERSION).model_dump_json() + "\n")
+            self._file.flush()
+
+    def __enter__(self) -> "PlanWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, album_plan: AlbumPlan):
+        sidecars: dict[int, str] = {}  # the files of an album share the same bytes (like the cover), hash them only once
+        for change in [change for file_tag_plan in album_plan.file_tag_plans for change in file_tag_plan.changes]:
+            if change.data is None:
+                continue
+            if id(change.data) not in sidecars:
+                sidecars[id(change.data)] = self._write_sidecar(change.data)
+            change.data_sidecar = sidecars[id(change.data)]
+        self._file.write(album_plan.model_dump_json(exclude_defaults=True) + "\n")
+        self._file.flush()
+        self.albums_written += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        logger.info(f"wrote {self.albums_written} albums to plan {self.plan_path}")
+
+    # private functions
+    def _write_sidecar(self, data: bytes) -> str:
+        name = hashlib.sha256(data).hexdigest()
+        sidecar_path = os.path.join(self.sidecar_folder, name)
+        if not os.path.exists(sidecar_path):
+            os.makedirs(self.sidecar_folder, exist_ok=True)
+            temp_path = f"{sidecar_path}.partial"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, sidecar_path)
+        return name
+
+
+def get_sidecar_folder(plan_path: str) -> str:
+    return plan_path + constants.PLAN_SIDECAR_FOLDER_SUFFIX
+
+
+def read_plan(plan_path: str) -> Iterator[AlbumPlan]:
+    """yields the albums of a plan with the data of their changes loaded from the sidecar folder"""
+    sidecar_folder = get_sidecar_folder(plan_path)
+    with open(plan_path, "r", encoding="utf-8") as file:
+        _read_header(file, plan_path)
+        for line_number, line in enumerate(file, start=2):
+            if not line.strip():
+                continue
+            try:
+                album_plan = AlbumPlan.model_validate_json(line)
+            except ValueError as e:
+                raise PlanException(f"invalid album on line {line_number} of {plan_path}: {e}") from e
+            _load_sidecars(album_plan, sidecar_folder)
+            yield album_plan
+
+
+# private functions
+def _read_header(file: IO[str], plan_path: str) -> PlanHeader:
+    try:
+        header = PlanHeader.model_validate_json(file.readline())
+    except ValueError as e:
+        raise PlanException(f"{plan_path} is not a plan") from e
+    if header.format != constants.PLAN_FORMAT:
+        raise PlanException(f"{plan_path} is not a plan")
+    if header.version != constants.PLAN_VERSION:
+        raise PlanException(f"{plan_path} has plan version {header.version}, expected {constants.PLAN_VERSION}, plan the albums again")
+    return header
+
+
+def _load_sidecars(album_plan: AlbumPlan, sidecar_folder: str):
+    """every distinct sidecar is read once per album, the files of an album share the same bytes"""
+    loaded: dict[str, bytes] = {}
+    for change in [change for file_tag_plan in album_plan.file_tag_plans for change in file_tag_plan.changes]:
+        if not change.data_sidecar:
+            continue
+        if change.data_sidecar not in loaded:
+            try:
+                with open(os.path.join(sidecar_folder, change.data_sidecar), "rb") as file:
+                    loaded[change.data_sidecar] = file.read()
+            except OSError as e:
+                raise PlanException(f"missing data of {change.field} for {album_plan.album_folder_path} in {sidecar_folder}: {e}") from e
+        change.data = loaded[change.data_sidecar]
@@ -0,0 +1,78 @@
+from typing import Optional
+
+from Modules.Scan.models.local_album_data import LocalTrackData
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Utils.general_utils import is_date_in_YYYY_MM_DD
+
+"""
+groups the audio files of a folder into albums
+every file is bucketed by its album keys (vgmdb link, catalog number, barcode, album name and full release date) in a single pass,
+files sharing a bucket belong to the same album, and buckets are merged transitively with a union-find
+so a file sharing the catalog number with one file and the album name with another ties all three together
+"""
+
+AlbumKey = tuple[str, str]
+ALBUM_KEY_FIELDS = ("vgmdb_link", "catalog", "barcode", "album")
+
+
+class DisjointSet:
+    """union-find over the integers 0..size-1, with path compression and union by size"""
+
+    def __init__(self, size: int):
+        self.parents = list(range(size))
+        self.sizes = [1] * size
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parents[root] != root:
+            root = self.parents[root]
+        while self.parents[item] != root:
+            self.parents[item], item = root, self.parents[item]
+        return root
+
+    def union(self, first: int, second: int):
+        first_root, second_root = self.find(first), self.find(second)
+        if first_root == second_root:
+            return
+        if self.sizes[first_root] < self.sizes[second_root]:
+            first_root, second_root = second_root, first_root
+        self.parents[second_root] = first_root
+        self.sizes[first_root] += self.sizes[second_root]
+
+
+def get_album_keys(tags: LocalTrackTags) -> list[AlbumKey]:
+    """the (field, value) pairs which tie a file to the other files of its album"""
+    keys: list[AlbumKey] = [(field, value) for field in ALBUM_KEY_FIELDS for value in getattr(tags, field)]
+    if tags.date and is_date_in_YYYY_MM_DD(tags.date):
+        keys.append(("date", tags.date))
+    return keys
+
+
+def cluster_tracks(tracks: list[LocalTrackData]) -> Optional[list[list[LocalTrackData]]]:
+    """
+    splits tracks into albums, in the order in which each album is first encountered
+    returns None if any track has no album keys at all, since it can not be attributed to an album
+    """
+    if not tracks:
+        return None
+    disjoint_set = DisjointSet(len(tracks))
+    first_track_with_key: dict[AlbumKey, int] = {}
+    for index, track in enumerate(tracks):
+        keys = get_album_keys(track.tags)
+        if not keys:
+            return None
+        for key in keys:
+            first_index = first_track_with_key.setdefault(key, index)
+            if first_index != index:
+                disjoint_set.union(first_index, index)
+
+    clusters: dict[int, list[LocalTrackData]] = {}
+    for index, track in enumerate(tracks):
+        clusters.setdefault(disjoint_set.find(index), []).append(track)
+    return list(clusters.values())
+
+
+def are_clusters_side_by_side(clusters: list[list[LocalTrackData]]) -> bool:
+    """true if files of more than one album lie directly inside the scanned folder, i.e. the folder itself is a mix of albums"""
+    clusters_with_direct_files = sum(1 for cluster in clusters if any(track.depth_in_parent_folder == 1 for track in cluster))
+    return clusters_with_direct_files > 1
@@ -0,0 +1,225 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, cast
+from unigen import AudioFactory, IAudioManager
+
+from Modules.Scan import constants
+from Modules.Utils.general_utils import get_default_logger
+from Modules.Utils.io_governor import get_io_governor
+
+logger = get_default_logger(__name__, "info")
+
+MUTATING_METHOD_PREFIXES = ("set", "delete", "clear")
+
+
+class _PoolEntry:
+    def __init__(self, audio_manager: IAudioManager, size: int):
+        self.audio_manager = audio_manager
+        self.size = size
+        self.dirty = False
+        self.save_on_close = False  # set by mark_for_saving, changes which were not marked are dropped when the file is closed
+        self.lock = threading.Lock()  # held while the audio manager is being used, entries in use are never evicted
+
+
+class AudioManagerPool:
+    """
+    process wide LRU pool of open audio managers, bounded by the number of open files and their estimated size in memory
+    least recently used audio managers are evicted when a bound is exceeded, modified ones only once they were marked for saving (and they are saved first)
+    so that the changes of a tagging pass which failed halfway never reach the disk
+    with evict_modified turned off, modified audio managers are never evicted, they stay open until they are saved or discarded (used while planning)
+    """
+
+    def __init__(self, max_open_files: int = constants.AUDIO_MANAGER_POOL_MAX_OPEN_FILES, max_bytes: int = constants.AUDIO_MANAGER_POOL_MAX_BYTES):
+        self.max_open_files = max_open_files
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+        self.total_bytes = 0
+        self.opened, self.evicted = 0, 0
+        self.evict_modified = True
+
+    def get_handle(self, file_path: str) -> IAudioManager:
+        """returns a lightweight handle which opens (or reopens) the actual audio manager whenever it is used"""
+        return cast(IAudioManager, PooledAudioManager(self, file_path))
+
+    def use(self, file_path: str, operation: Callable[[IAudioManager], Any], mutates: bool = False, saves: bool = False, added_bytes: int = 0) -> Any:
+        """run operation on the open audio manager of file_path, opening it if needed, added_bytes grows its estimated size (like an embedded picture)"""
+        entry = self._acquire(file_path)
+        try:
+            result = operation(entry.audio_manager)
+            if mutates:
+                entry.dirty = True
+            if saves:
+                entry.dirty, entry.save_on_close = False, False
+            if added_bytes:
+                with self.lock:
+                    entry.size += added_bytes
+                    if self.entries.get(file_path) is entry:
+                        self.total_bytes += added_bytes
+            return result
+        finally:
+            entry.lock.release()
+            if added_bytes:
+                self._evict()
+
+    def get_size(self, file_path: str) -> Optional[int]:
+        """estimated memory used by the audio manager of file_path, None if it is not open"""
+        with self.lock:
+            entry = self.entries.get(file_path)
+        return entry.size if entry else None
+
+    def is_dirty(self, file_path: str) -> bool:
+        with self.lock:
+            entry = self.entries.get(file_path)
+        return bool(entry and entry.dirty)
+
+    def mark_for_saving(self, file_path: str):
+        """the changes to file_path are complete, the pool may save them whenever it closes the file"""
+        with self.lock:
+            entry = self.entries.get(file_path)
+            if entry:
+                entry.save_on_close = True
+
+    def discard(self, file_path: str, save: bool = True):
+        """close the audio manager of file_path (saving it first if it was modified and marked for saving), use before moving or deleting the file"""
+        with self.lock:
+            entry = self.entries.pop(file_path, None)
+            if entry:
+                self.total_bytes -= entry.size
+        if entry and save:
+            self._save_if_marked(file_path, entry)
+        elif entry and entry.dirty:
+            logger.debug(f"dropping the unsaved changes of {file_path}")
+
+    def flush(self):
+        """save every modified audio manager marked for saving"""
+        with self.lock:
+            entries = list(self.entries.items())
+        for file_path, entry in entries:
+            with entry.lock:
+                self._save_if_marked(file_path, entry)
+
+    def configure(self, max_open_files: int, max_bytes: int):
+        with self.lock:
+            self.max_open_files, self.max_bytes = max_open_files, max_bytes
+        self._evict()
+
+    # private functions
+    def _acquire(self, file_path: str) -> _PoolEntry:
+        """returns the entry of file_path with its lock held"""
+        while True:
+            with self.lock:
+                entry = self.entries.get(file_path)
+                if entry:
+                    self.entries.move_to_end(file_path)
+            if not entry:
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                entry = _PoolEntry(audio_manager, self._estimate_size(audio_manager))
+                with self.lock:
+                    existing_entry = self.entries.get(file_path)
+                    if existing_entry:  # opened by another thread in the meantime
+                        entry = existing_entry
+                        self.entries.move_to_end(file_path)
+                    else:
+                        self.entries[file_path] = entry
+                        self.total_bytes += entry.size
+                        self.opened += 1
+            entry.lock.acquire()
+            with self.lock:
+                still_open = self.entries.get(file_path) is entry
+            if still_open:
+                break
+            entry.lock.release()  # evicted before we could lock it, open again
+        self._evict()
+        return entry
+
+    def _evict(self):
+        evicted: list[tuple[str, _PoolEntry]] = []
+        with self.lock:
+            for file_path, entry in list(self.entries.items()):
+                if len(self.entries) <= self.max_open_files and self.total_bytes <= self.max_bytes:
+                    break
+                if not entry.lock.acquire(blocking=False):  # currently in use
+                    continue
+                if entry.dirty and (not entry.save_on_close or not self.evict_modified):
+                    entry.lock.release()
+                    continue
+                del self.entries[file_path]
+                self.total_bytes -= entry.size
+                self.evicted += 1
+                evicted.append((file_path, entry))
+        for file_path, entry in evicted:
+            try:
+                self._save_if_marked(file_path, entry)
+            except Exception as e:
+                logger.error(f"unable to save {file_path} while closing it, error:\n{e}")
+            finally:
+                entry.lock.release()
+
+    def _save_if_marked(self, file_path: str, entry: _PoolEntry):
+        if not entry.dirty:
+            return
+        if not entry.save_on_close:
+            logger.debug(f"dropping the unsaved changes of {file_path}, they were not marked for saving")
+            return
+        logger.debug(f"saving modified audio manager of {file_path} before closing it")
+        entry.audio_manager.save()
+        entry.dirty, entry.save_on_close = False, False
+        get_io_governor().throttle(os.path.getsize(file_path))  # assume the whole file was rewritten
+
+    def _estimate_size(self, audio_manager: IAudioManager) -> int:
+        """embedded pictures are by far the largest part of an open audio manager"""
+        try:
+            pictures_size = sum(len(picture.data) for picture in audio_manager.getAllPictures())
+        except Exception:
+            pictures_size = 0
+        return constants.AUDIO_MANAGER_BASE_SIZE_ESTIMATE + pictures_size
+
+
+class PooledAudioManager:
+    """
+    stand in for an IAudioManager, forwards every call to the audio manager kept open by the pool
+    calls to setters, deleters and clearTags mark the file as modified, save marks it as clean
+    """
+
+    def __init__(self, pool: AudioManagerPool, file_path: str):
+        self._pool = pool
+        self._file_path = file_path
+
+    def run(self, operation: Callable[[IAudioManager], Any], mutates: bool = False, saves: bool = False) -> Any:
+        """run operation on the actual audio manager while the pool holds it open, for things IAudioManager does not cover (like saving with padding)"""
+        return self._pool.use(self._file_path, operation, mutates=mutates, saves=saves)
+
+    def __getattr__(self, name: str) -> Any:
+        if not callable(getattr(IAudioManager, name, None)):
+            return self._pool.use(self._file_path, lambda audio_manager: getattr(audio_manager, name))
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            operation: Callable[[IAudioManager], Any] = lambda audio_manager: getattr(audio_manager, name)(*args, **kwargs)
+            added_bytes = len(args[0]) if name == "setPictureOfType" and args and isinstance(args[0], bytes) else 0
+            return self._pool.use(self._file_path, operation, mutates=name.startswith(MUTATING_METHOD_PREFIXES), saves=name == "save", added_bytes=added_bytes)
+
+        return call
+
+
+IAudioManager.register(PooledAudioManager)
+
+
+def run_on_audio_manager(audio_manager: IAudioManager, operation: Callable[[IAudioManager], Any], mutates: bool = False, saves: bool = False) -> Any:
+    """run operation on the actual audio manager behind audio_manager, which may be a pool handle"""
+    if isinstance(audio_manager, PooledAudioManager):
+        return audio_manager.run(operation, mutates=mutates, saves=saves)
+    return operation(audio_manager)
+
+_audio_manager_pool: Optional[AudioManagerPool] = None
+_audio_manager_pool_lock = threading.Lock()
+
+
+def get_audio_manager_pool() -> AudioManagerPool:
+    """maintain a single pool throughout the process"""
+    global _audio_manager_pool
+    with _audio_manager_pool_lock:
+        if not _audio_manager_pool:
+            _audio_manager_pool = AudioManagerPool()
+        return _audio_manager_pool
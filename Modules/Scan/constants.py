@@ -1,2 +1,15 @@
+from typing import Literal
+
 MAX_FOLDER_DEPTH_OF_ALBUM = 2
-DEFAULT_DISC_NUMBER = 1
\ No newline at end of file
+DEFAULT_DISC_NUMBER = 1
+SCAN_INDEX_FILE_NAME = "scan_index.sqlite"
+SCAN_INDEX_VERSION = 2  # bump when LocalTrackTags changes, indexed files are read again
+SCAN_INDEX_COMMIT_INTERVAL = 500  # number of updated files after which the scan index is committed to disk
+SCAN_SNAPSHOT_FORMAT = "vgmdb-auto-tagger-scan-snapshot"
+SCAN_SNAPSHOT_VERSION = 2  # bump when LocalAlbumDataModel or LocalTrackTags change incompatibly
+
+AUDIO_MANAGER_POOL_MAX_OPEN_FILES = 256
+AUDIO_MANAGER_POOL_MAX_BYTES = 512 * 1024 * 1024
+AUDIO_MANAGER_BASE_SIZE_ESTIMATE = 64 * 1024  # rough memory used by an open audio manager apart from its embedded pictures
+
+SCAN_POOL_TYPES = Literal["thread", "process"]  # threads are enough for network storage where opening a file is latency bound, processes help when parsing is cpu bound
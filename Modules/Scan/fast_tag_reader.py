@@ -0,0 +1,342 @@
+"""
+header only tag reader for the fields of LocalTrackTags
+instead of fully parsing a file (including multi megabyte embedded pictures) like unigen does, only the metadata headers are walked with small bounded reads,
+reading the payloads which hold the needed fields and seeking over everything else (pictures, padding, audio data)
+the fields are mapped exactly like the unigen wrappers do, anything not handled here returns None so that the caller can fall back to unigen
+"""
+import os
+import re
+import struct
+from itertools import zip_longest
+from typing import BinaryIO, Callable, Iterator, Optional
+from mutagen.id3 import ID3TimeStamp
+from unigen.wrapper.utils import cleanDate, convertStringToNumber, getFirstElement, splitAndGetFirst, splitAndGetSecond
+
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Tag import custom_tags
+
+CATALOG_KEYS = ["CATALOGNUMBER", "CATALOG", "LABELNO"]
+BARCODE_KEYS = ["barcode", "BARCODE"]
+DISC_NAME_KEYS = ["DISCSUBTITLE", "DISCNAME"]
+VORBIS_DATE_KEYS = ["date", "ORIGINALDATE", "year", "ORIGINALYEAR"]
+ID3_ALTERNATE_ALBUM_NAME_KEY = "Alternate Album Name"
+ID3_ALTERNATE_TITLE_KEY = "Alternate Title"
+
+FLAC_VORBIS_COMMENT_BLOCK_TYPE = 4
+ID3_TEXT_FRAMES = {"TIT2", "TALB", "TPOS", "TRCK", "TDRC", "TYER", "TDAT", "TIME"}
+ID3_ENCODINGS = {0: ("latin1", b"\x00"), 1: ("utf-16", b"\x00\x00"), 2: ("utf-16-be", b"\x00\x00"), 3: ("utf-8", b"\x00")}
+ID3_FRAME_ID_PATTERN = re.compile(rb"[A-Z0-9]{4}")
+MP4_FREEFORM_KEY_PREFIX = "----:com.apple.iTunes:"
+MP4_TEXT_ATOMS = {b"\xa9nam", b"\xa9alb", b"\xa9day"}
+MP4_PAIR_ATOMS = {b"disk", b"trkn"}
+
+
+class UnhandledLayoutError(Exception):
+    """the file uses a layout which the fast reader does not handle, unigen should read it instead"""
+
+
+def read_track_tags_fast(file_path: str) -> Optional[LocalTrackTags]:
+    """
+    reads the tags of LocalTrackTags from FLAC, MP3 and M4A files without parsing the rest of the file
+    returns None if the file is not handled by the fast path, never raises
+    """
+    _, extension = os.path.splitext(file_path)
+    reader = FAST_READERS.get(extension.lower())
+    if not reader:
+        return None
+    try:
+        with open(file_path, "rb") as file:
+            return reader(file)
+    except Exception:
+        return None  # unhandled layouts and broken files alike are left to unigen, which reports the proper error
+
+
+# private functions
+def _read_flac(file: BinaryIO) -> Optional[LocalTrackTags]:
+    if file.read(4) != b"fLaC":
+        return None  # files with leading ID3 tags are handled by unigen
+    while True:
+        header = file.read(4)
+        if len(header) != 4:
+            return None
+        is_last_block, block_type, block_length = header[0] & 0x80, header[0] & 0x7F, int.from_bytes(header[1:4], "big")
+        if block_type == FLAC_VORBIS_COMMENT_BLOCK_TYPE:
+            return _tags_from_vorbis_comments(_parse_vorbis_comments(_read_exactly(file, block_length)))
+        if is_last_block:
+            return LocalTrackTags()  # untagged, mutagen loads such files without any tags
+        file.seek(block_length, os.SEEK_CUR)  # STREAMINFO, PICTURE, PADDING, ...
+
+
+def _parse_vorbis_comments(data: bytes) -> dict[str, list[str]]:
+    """returns values keyed by the lowercase field name, vorbis field names are case insensitive"""
+    vendor_length = struct.unpack_from("<I", data, 0)[0]
+    position = 4 + vendor_length
+    count = struct.unpack_from("<I", data, position)[0]
+    position += 4
+    comments: dict[str, list[str]] = {}
+    for _ in range(count):
+        length = struct.unpack_from("<I", data, position)[0]
+        position += 4
+        comment = data[position : position + length]
+        position += length
+        if len(comment) != length:
+            raise UnhandledLayoutError("truncated vorbis comment")
+        key, separator, value = comment.partition(b"=")
+        if not separator:
+            continue
+        comments.setdefault(key.decode("ascii").lower(), []).append(value.decode("utf-8", "replace"))
+    return comments
+
+
+def _tags_from_vorbis_comments(comments: dict[str, list[str]]) -> LocalTrackTags:
+    def get(key: str) -> list[str]:
+        return comments.get(key.lower(), [])
+
+    date = _search_multiple_keys(get, VORBIS_DATE_KEYS)
+    disc_number, track_number = getFirstElement(get("discnumber")), getFirstElement(get("tracknumber"))
+    total_discs = get("disctotal") or get("totaldiscs") or splitAndGetSecond(disc_number)
+    total_tracks = get("tracktotal") or get("totaltracks") or splitAndGetSecond(track_number)
+    return LocalTrackTags(
+        title=get("title"),
+        disc_number=convertStringToNumber(splitAndGetFirst(disc_number)),
+        total_discs=convertStringToNumber(getFirstElement(total_discs)),
+        track_number=convertStringToNumber(splitAndGetFirst(track_number)),
+        total_tracks=convertStringToNumber(getFirstElement(total_tracks)),
+        disc_name=_search_multiple_keys(get, DISC_NAME_KEYS),
+        album=get("album"),
+        catalog=_search_multiple_keys(get, CATALOG_KEYS),
+        barcode=_search_multiple_keys(get, BARCODE_KEYS),
+        date=cleanDate(date[0]) if date else None,
+        year=get(custom_tags.YEAR),
+        vgmdb_link=get(custom_tags.VGMDB_LINK),
+        vgmdb_id=get(custom_tags.VGMDB_ID),
+    )
+
+
+def _read_id3(file: BinaryIO) -> Optional[LocalTrackTags]:
+    header = file.read(10)
+    if len(header) != 10 or header[:3] != b"ID3":
+        return None  # unigen adds an empty ID3 tag to such files, let it do that
+    major_version, tag_flags = header[3], header[5]
+    if major_version not in (3, 4) or tag_flags & 0xC0:
+        return None  # ID3v2.2, unsynchronised tags and extended headers are handled by unigen
+    tag_end = 10 + _decode_syncsafe(header[6:10])
+    unsupported_frame_flags = 0x4F if major_version == 4 else 0xE0  # grouping, compression, encryption, unsynchronisation, data length
+    text_frames: dict[str, list[str]] = {}
+    custom_frames: dict[str, list[str]] = {}
+    position = 10
+    while position + 10 <= tag_end:
+        file.seek(position)
+        frame_header = _read_exactly(file, 10)
+        frame_id = frame_header[:4]
+        if frame_id[0] == 0:
+            break  # reached the padding
+        if not ID3_FRAME_ID_PATTERN.fullmatch(frame_id):
+            return None
+        frame_size = _decode_syncsafe(frame_header[4:8]) if major_version == 4 else int.from_bytes(frame_header[4:8], "big")
+        position += 10 + frame_size
+        if position > tag_end:
+            return None
+        frame_name = frame_id.decode("ascii")
+        if frame_name != "TXXX" and frame_name not in ID3_TEXT_FRAMES:
+            continue  # APIC and everything else is skipped without being read
+        if frame_header[9] & unsupported_frame_flags:
+            return None
+        values = _decode_id3_text(_read_exactly(file, frame_size), major_version)
+        if frame_name == "TXXX":
+            if values:
+                custom_frames.setdefault(values[0], []).extend(values[1:])
+        else:
+            text_frames.setdefault(frame_name, []).extend(values)
+    return _tags_from_id3_frames(text_frames, custom_frames, major_version)
+
+
+def _decode_id3_text(data: bytes, major_version: int) -> list[str]:
+    """decodes the null separated values of a text frame, the same way mutagen does"""
+    if not data:
+        return []
+    codec, terminator = ID3_ENCODINGS[data[0]]
+    data = data[1:]
+    values: list[str] = []
+    while data:
+        index = data.find(terminator)
+        while index != -1 and index % len(terminator):  # utf-16 terminators are aligned to code units
+            index = data.find(terminator, index + 1)
+        if index == -1:
+            values.append(data.decode(codec))
+            break
+        values.append(data[:index].decode(codec))
+        data = data[index + len(terminator) :]
+        if major_version < 4 and not data.strip(b"\x00"):
+            break  # zero padded values of older versions are not a list of empty strings
+    return values
+
+
+def _tags_from_id3_frames(text_frames: dict[str, list[str]], custom_frames: dict[str, list[str]], major_version: int) -> LocalTrackTags:
+    def get_custom(key: str) -> list[str]:
+        return custom_frames.get(key, [])
+
+    dates = text_frames.get("TDRC", [])
+    if major_version < 4 and not dates:
+        dates = _convert_id3v23_dates(text_frames.get("TYER", []), text_frames.get("TDAT", []), text_frames.get("TIME", []))
+    title, album = text_frames.get("TIT2", []), text_frames.get("TALB", [])
+    disc_number, track_number = getFirstElement(text_frames.get("TPOS", [])), getFirstElement(text_frames.get("TRCK", []))
+    return LocalTrackTags(
+        title=title + get_custom(ID3_ALTERNATE_TITLE_KEY) if title else [],
+        disc_number=convertStringToNumber(splitAndGetFirst(disc_number)),
+        total_discs=convertStringToNumber(splitAndGetSecond(disc_number)),
+        track_number=convertStringToNumber(splitAndGetFirst(track_number)),
+        total_tracks=convertStringToNumber(splitAndGetSecond(track_number)),
+        disc_name=_search_multiple_keys(get_custom, DISC_NAME_KEYS),
+        album=album + get_custom(ID3_ALTERNATE_ALBUM_NAME_KEY) if album else [],
+        catalog=_search_multiple_keys(get_custom, CATALOG_KEYS),
+        barcode=_search_multiple_keys(get_custom, BARCODE_KEYS),
+        date=cleanDate(str(ID3TimeStamp(dates[0]))) if dates else None,
+        year=get_custom(custom_tags.YEAR),
+        vgmdb_link=get_custom(custom_tags.VGMDB_LINK),
+        vgmdb_id=get_custom(custom_tags.VGMDB_ID),
+    )
+
+
+def _convert_id3v23_dates(years: list[str], dates: list[str], times: list[str]) -> list[str]:
+    """mirrors how mutagen upgrades TYER, TDAT and TIME frames into TDRC"""
+    timestamps: list[str] = []
+    for year, date, time in zip_longest(years, dates, times, fillvalue=""):
+        year_match = re.match(r"([0-9]+)\Z", year)
+        date_match = re.match(r"([0-9]{2})([0-9]{2})\Z", date)
+        time_match = re.match(r"([0-9]{2})([0-9]{2})\Z", time)
+        timestamp = ""
+        if year_match:
+            timestamp += year_match.group(1)
+            if date_match:
+                timestamp += "-%s-%s" % date_match.groups()[::-1]
+                if time_match:
+                    timestamp += "T%s:%s:00" % time_match.groups()
+        if timestamp:
+            timestamps.append(timestamp)
+    return timestamps
+
+
+def _read_mp4(file: BinaryIO) -> Optional[LocalTrackTags]:
+    file_size = os.fstat(file.fileno()).st_size
+    moov = _find_atom(file, 0, file_size, b"moov", top_level=True)  # mdat is skipped over whether it comes before or after moov
+    if not moov:
+        return None
+    ilst = None
+    udta = _find_atom(file, *moov, b"udta")
+    meta = udta and _find_atom(file, *udta, b"meta")
+    if meta:
+        ilst = _find_atom(file, meta[0] + 4, meta[1], b"ilst")  # meta is a full atom, 4 bytes of version and flags precede its children
+    if not ilst:
+        return LocalTrackTags()  # untagged, mutagen loads such files without any tags
+    texts: dict[str, list[str]] = {}
+    pairs: dict[str, list[tuple[int, int]]] = {}
+    for name, start, end in list(_iter_atoms(file, *ilst)):
+        if name not in MP4_TEXT_ATOMS and name not in MP4_PAIR_ATOMS and name != b"----":
+            continue  # covr and everything else is skipped without being read
+        file.seek(start)
+        data = _read_exactly(file, end - start)
+        if name == b"----":
+            key, values = _parse_mp4_freeform(data)
+            texts.setdefault(key, []).extend(values)
+        elif name in MP4_PAIR_ATOMS:
+            pairs.setdefault(name.decode("latin-1"), []).extend(struct.unpack(">2H", value[2:6]) for _, value in _iter_mp4_data(data))
+        else:
+            items = list(_iter_mp4_data(data))
+            if all(data_type in (0, 1) for data_type, _ in items):  # mutagen ignores text atoms holding other data types
+                texts.setdefault(name.decode("latin-1"), []).extend(value.decode("utf-8") for _, value in items)
+    return _tags_from_mp4_items(texts, pairs)
+
+
+def _iter_atoms(file: BinaryIO, start: int, end: int, top_level: bool = False) -> Iterator[tuple[bytes, int, int]]:
+    """yields (name, payload start, payload end) of every atom between start and end, reading only the atom headers"""
+    position = start
+    while position + 8 <= end:
+        file.seek(position)
+        size, name = struct.unpack(">I4s", _read_exactly(file, 8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", _read_exactly(file, 8))[0]
+            header_size = 16
+        elif size == 0 and top_level:
+            size = end - position  # the last top level atom may extend till the end of the file
+        if size < header_size or position + size > end:
+            raise UnhandledLayoutError(f"invalid atom size of {name!r}")
+        yield name, position + header_size, position + size
+        position += size
+
+
+def _find_atom(file: BinaryIO, start: int, end: int, name: bytes, top_level: bool = False) -> Optional[tuple[int, int]]:
+    for atom_name, atom_start, atom_end in _iter_atoms(file, start, end, top_level):
+        if atom_name == name:
+            return atom_start, atom_end
+    return None
+
+
+def _iter_mp4_data(data: bytes, position: int = 0) -> Iterator[tuple[int, bytes]]:
+    """yields (data type, value) of the data atoms inside an ilst item"""
+    while position < len(data):
+        length, name = struct.unpack_from(">I4s", data, position)
+        if name != b"data" or length < 16 or position + length > len(data):
+            raise UnhandledLayoutError(f"unexpected atom {name!r} inside an ilst item")
+        yield int.from_bytes(data[position + 9 : position + 12], "big"), data[position + 16 : position + length]
+        position += length
+
+
+def _parse_mp4_freeform(data: bytes) -> tuple[str, list[str]]:
+    """freeform (----) items hold a mean atom, a name atom and the data atoms"""
+    mean_length = struct.unpack_from(">I", data, 0)[0]
+    mean = data[12:mean_length]
+    name_length = struct.unpack_from(">I", data, mean_length)[0]
+    name = data[mean_length + 12 : mean_length + name_length]
+    key = (b"----:" + mean + b":" + name).decode("latin-1")
+    return key, [value.decode("utf-8") for _, value in _iter_mp4_data(data, mean_length + name_length)]
+
+
+def _tags_from_mp4_items(texts: dict[str, list[str]], pairs: dict[str, list[tuple[int, int]]]) -> LocalTrackTags:
+    def get_custom(key: str) -> list[str]:
+        return texts.get(f"{MP4_FREEFORM_KEY_PREFIX}{key}", [])
+
+    disk, track = getFirstElement(pairs.get("disk", [])), getFirstElement(pairs.get("trkn", []))
+    date = texts.get("\xa9day")
+    return LocalTrackTags(
+        title=texts.get("\xa9nam", []),
+        disc_number=convertStringToNumber(disk[0]) if disk else None,  # type: ignore
+        total_discs=convertStringToNumber(disk[1]) if disk else None,  # type: ignore
+        track_number=convertStringToNumber(track[0]) if track else None,  # type: ignore
+        total_tracks=convertStringToNumber(track[1]) if track else None,  # type: ignore
+        disc_name=_search_multiple_keys(get_custom, DISC_NAME_KEYS),
+        album=texts.get("\xa9alb", []),
+        catalog=_search_multiple_keys(get_custom, CATALOG_KEYS),
+        barcode=_search_multiple_keys(get_custom, BARCODE_KEYS),
+        date=cleanDate(date[0]) if date else None,
+        year=get_custom(custom_tags.YEAR),
+        vgmdb_link=get_custom(custom_tags.VGMDB_LINK),
+        vgmdb_id=get_custom(custom_tags.VGMDB_ID),
+    )
+
+
+def _search_multiple_keys(get: Callable[[str], list[str]], keys: list[str]) -> list[str]:
+    for key in keys:
+        values = get(key)
+        if values:
+            return values
+    return []
+
+
+def _decode_syncsafe(data: bytes) -> int:
+    return (data[0] & 0x7F) << 21 | (data[1] & 0x7F) << 14 | (data[2] & 0x7F) << 7 | (data[3] & 0x7F)
+
+
+def _read_exactly(file: BinaryIO, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise UnhandledLayoutError("unexpected end of file")
+    return data
+
+
+FAST_READERS: dict[str, Callable[[BinaryIO], Optional[LocalTrackTags]]] = {
+    ".flac": _read_flac,
+    ".mp3": _read_id3,
+    ".m4a": _read_mp4,
+}
@@ -1,36 +1,77 @@
 import os
-
-# REMOVE
 import sys
 
+# REMOVE
 from Modules.Organize.template import TemplateResolver
 
 sys.path.append(os.getcwd())
 # REMOVE
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel
 from unigen import IAudioManager
 from Modules.Print.constants import LINE_SEPARATOR, SUB_LINE_SEPARATOR
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
+from Modules.Scan.models.local_track_tags import LocalTrackTags
 
 
-class LocalTrackData(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
-    file_path: str = Field(frozen=True)
-    depth_in_parent_folder: int
-    audio_manager: IAudioManager
+class LocalTrackData:
+    """
+    a supported audio file found while scanning, holds a snapshot of the tags used for album detection
+    unless an audio manager is provided during creation, the audio manager is a handle into the process wide AudioManagerPool,
+    so the file is only opened when it is actually used and closed again when the pool runs out of room
+    a recursive scan creates one of these per file, so it is a slotted class storing the (interned) folder, the file name and the (interned) extension
+    instead of a pydantic model, use LocalTrackDataModel for serialization
+    """
+
+    __slots__ = ("_folder_path", "_file_name", "_extension", "depth_in_parent_folder", "tags", "_audio_manager")
+
+    def __init__(self, file_path: str, depth_in_parent_folder: int, tags: LocalTrackTags | None = None, audio_manager: IAudioManager | None = None):
+        folder_path, file_name = os.path.split(file_path)
+        self._folder_path = sys.intern(folder_path)  # shared by every track of a folder
+        self._file_name = file_name
+        self._extension = sys.intern(os.path.splitext(file_name)[1])
+        self.depth_in_parent_folder = depth_in_parent_folder
+        self._audio_manager = audio_manager
+        if tags is None:
+            tags = LocalTrackTags.from_audio_manager(audio_manager) if audio_manager else LocalTrackTags()
+        self.tags = tags
+
+    @property
+    def file_path(self) -> str:
+        return os.path.join(self._folder_path, self._file_name)
+
+    @property
+    def audio_manager(self) -> IAudioManager:
+        if self._audio_manager is None:
+            self._audio_manager = get_audio_manager_pool().get_handle(self.file_path)
+        return self._audio_manager
 
     @property
     def file_name(self) -> str:
-        return os.path.basename(os.path.normpath(self.file_path))
+        return self._file_name
 
     @property
     def extension(self) -> str:
         """get extension of file (like .flac, .mp3, etc)"""
-        _, extension = os.path.splitext(self.file_path)
-        return extension
+        return self._extension
 
     def __hash__(self) -> int:
         return self.file_path.__hash__()  # for being able to create a set
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LocalTrackData):
+            return NotImplemented
+        return self._file_name == other._file_name and self._folder_path == other._folder_path
+
+    def __repr__(self) -> str:
+        return f"LocalTrackData(file_path={self.file_path!r}, depth_in_parent_folder={self.depth_in_parent_folder})"
+
+    def to_model(self) -> "LocalTrackDataModel":
+        return LocalTrackDataModel(file_path=self.file_path, depth_in_parent_folder=self.depth_in_parent_folder, tags=self.tags)
+
+    @classmethod
+    def from_model(cls, model: "LocalTrackDataModel") -> "LocalTrackData":
+        return cls(model.file_path, model.depth_in_parent_folder, model.tags)
+
     def get_audio_source(self) -> str | None:
 
         audio_source_format_lossless = "{{{source}-{codec}}|source|codec}{ {bits}bit}{ {sample_rate}kHz}"
@@ -112,22 +153,39 @@ class LocalTrackData(BaseModel):
         ).evaluate(audio_source_format_lossy)
 
 
-class LocalDiscData(BaseModel):
-    tracks: dict[int, LocalTrackData] = {}
+class LocalDiscData:
+    __slots__ = ("tracks",)
+
+    def __init__(self, tracks: dict[int, LocalTrackData] | None = None):
+        self.tracks: dict[int, LocalTrackData] = tracks if tracks is not None else {}
 
     @property
     def total_tracks(self) -> int:
         return len(self.tracks)
 
 
-class LocalAlbumData(BaseModel):
+class LocalAlbumData:
     """
     an object containing the data of files representing an audio album present in a file system
+    slotted like LocalTrackData, use LocalAlbumDataModel for serialization
     """
 
-    album_folder_path: str
-    discs: dict[int, LocalDiscData] = {}  # files with proper disc number (default = 1) and track numbers already present
-    unclean_tracks: list[LocalTrackData] = []  # files without track number tags, maybe we can still tag them somehow? (accoust_id, name similarity, etc)
+    __slots__ = ("album_folder_path", "discs", "unclean_tracks", "shares_album_folder")
+
+    def __init__(
+        self,
+        album_folder_path: str,
+        discs: dict[int, LocalDiscData] | None = None,
+        unclean_tracks: list[LocalTrackData] | None = None,
+        shares_album_folder: bool = False,
+    ):
+        self.album_folder_path = album_folder_path
+        self.discs: dict[int, LocalDiscData] = discs if discs is not None else {}  # files with proper disc number (default = 1) and track numbers already present
+        self.unclean_tracks: list[LocalTrackData] = unclean_tracks if unclean_tracks is not None else []  # files without track number tags, maybe we can still tag them somehow? (accoust_id, name similarity, etc)
+        self.shares_album_folder = shares_album_folder  # the folder also holds files of other albums, so it must not be renamed as a whole
+
+    def __repr__(self) -> str:
+        return f"LocalAlbumData(album_folder_path={self.album_folder_path!r}, total_discs={self.total_discs}, total_tracks={self.total_tracks_in_album})"
 
     @property
     def album_folder_name(self) -> str:
@@ -171,12 +229,49 @@ class LocalAlbumData(BaseModel):
         all_tracks = self.get_all_tracks()
         return all_tracks[0] if all_tracks else self.unclean_tracks[0]  # if there are no clean tracks, there must be at least one unclean track
 
+    def to_model(self) -> "LocalAlbumDataModel":
+        return LocalAlbumDataModel(
+            album_folder_path=self.album_folder_path,
+            discs={disc_number: {track_number: track.to_model() for track_number, track in disc.tracks.items()} for disc_number, disc in self.discs.items()},
+            unclean_tracks=[track.to_model() for track in self.unclean_tracks],
+            shares_album_folder=self.shares_album_folder,
+        )
+
+    @classmethod
+    def from_model(cls, model: "LocalAlbumDataModel") -> "LocalAlbumData":
+        return cls(
+            album_folder_path=model.album_folder_path,
+            discs={
+                disc_number: LocalDiscData({track_number: LocalTrackData.from_model(track) for track_number, track in tracks.items()})
+                for disc_number, tracks in model.discs.items()
+            },
+            unclean_tracks=[LocalTrackData.from_model(track) for track in model.unclean_tracks],
+            shares_album_folder=model.shares_album_folder,
+        )
+
     def _does_track_exist(self, disc_number: int, track_number: int) -> bool:
         if disc_number not in self.discs or track_number not in self.discs[disc_number].tracks:
             return False
         return True
 
 
+class LocalTrackDataModel(BaseModel):
+    """serializable form of LocalTrackData"""
+
+    file_path: str
+    depth_in_parent_folder: int
+    tags: LocalTrackTags = LocalTrackTags()
+
+
+class LocalAlbumDataModel(BaseModel):
+    """serializable form of LocalAlbumData"""
+
+    album_folder_path: str
+    discs: dict[int, dict[int, LocalTrackDataModel]] = {}
+    unclean_tracks: list[LocalTrackDataModel] = []
+    shares_album_folder: bool = False
+
+
 def test():
     from Modules.Scan.scanner import Scanner
 
@@ -188,7 +283,7 @@ def test():
     sample = album.get_one_sample_track()
     print(sample.get_audio_source())
     print(album.pprint())
-    LocalAlbumData(**album.model_dump())
+    LocalAlbumData.from_model(album.to_model())
 
 
 if __name__ == "__main__":
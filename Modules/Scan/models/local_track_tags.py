@@ -0,0 +1,69 @@
+from typing import Any
+from pydantic import BaseModel
+from unigen import IAudioManager
+from unigen.wrapper.utils import cleanDate
+
+from Modules.Tag import custom_tags
+
+
+class LocalTrackTags(BaseModel):
+    """
+    lightweight snapshot of the tags read from an audio file while scanning, cheap to store and compare
+    it is read once per file and kept up to date with the changes made by the Tagger, so that the organizer and the CLI never query the audio manager again
+    """
+
+    title: list[str] = []
+    disc_number: int | None = None
+    total_discs: int | None = None
+    track_number: int | None = None
+    total_tracks: int | None = None
+    disc_name: list[str] = []
+    album: list[str] = []
+    catalog: list[str] = []
+    barcode: list[str] = []
+    date: str | None = None
+    year: list[str] = []  # custom tag, used when there is no date
+    vgmdb_link: list[str] = []
+    vgmdb_id: list[str] = []
+
+    @classmethod
+    def from_audio_manager(cls, audio_manager: IAudioManager) -> "LocalTrackTags":
+        return cls(
+            title=audio_manager.getTitle(),
+            disc_number=audio_manager.getDiscNumber(),
+            total_discs=audio_manager.getTotalDiscs(),
+            track_number=audio_manager.getTrackNumber(),
+            total_tracks=audio_manager.getTotalTracks(),
+            disc_name=audio_manager.getDiscName(),
+            album=audio_manager.getAlbum(),
+            catalog=audio_manager.getCatalog(),
+            barcode=audio_manager.getBarcode(),
+            date=audio_manager.getDate(),
+            year=audio_manager.getCustomTag(custom_tags.YEAR),
+            vgmdb_link=audio_manager.getCustomTag(custom_tags.VGMDB_LINK),
+            vgmdb_id=audio_manager.getCustomTag(custom_tags.VGMDB_ID),
+        )
+
+    def update(self, method: str, args: list[Any]):
+        """mirrors a call to a setter of IAudioManager, setters of tags which are not part of the snapshot are ignored"""
+        if method == "setDate":
+            self.date = cleanDate(args[0])
+        elif method == "setCustomTag":
+            key, value = args
+            if key in CUSTOM_TAG_FIELDS:
+                setattr(self, CUSTOM_TAG_FIELDS[key], list(value))
+        elif method in SETTER_FIELDS:
+            for field, value in zip(SETTER_FIELDS[method], args):
+                setattr(self, field, list(value) if isinstance(value, list) else value)
+
+
+SETTER_FIELDS = {
+    "setTitle": ("title",),
+    "setDiscNumbers": ("disc_number", "total_discs"),
+    "setTrackNumbers": ("track_number", "total_tracks"),
+    "setDiscName": ("disc_name",),
+    "setAlbum": ("album",),
+    "setCatalog": ("catalog",),
+    "setBarcode": ("barcode",),
+}
+CUSTOM_TAG_FIELDS = {custom_tags.YEAR: "year", custom_tags.VGMDB_LINK: "vgmdb_link", custom_tags.VGMDB_ID: "vgmdb_id"}
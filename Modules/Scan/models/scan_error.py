@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class ScanError(BaseModel):
+    """an audio file which could not be read while scanning"""
+
+    file_path: str
+    error_type: str
+    message: str
+
+    def pprint(self) -> str:
+        return f"{self.file_path}: {self.error_type} -> {self.message}"
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+from Imports.constants import CACHE_DIR
+from Modules.Scan import constants
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Scan.walker import FileStat
+from Modules.Utils.general_utils import get_default_logger
+
+logger = get_default_logger(__name__, "info")
+
+
+class ScanIndex:
+    """
+    on-disk index of already scanned audio files, keyed on path and validated using size, mtime and inode
+    a file is only read again by the scanner when its stat changes
+    """
+
+    def __init__(self, index_file_path: Optional[str] = None):
+        self.index_file_path = index_file_path if index_file_path else os.path.join(CACHE_DIR, constants.SCAN_INDEX_FILE_NAME)
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_file_path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.index_file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != constants.SCAN_INDEX_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS files")  # indexed with other fields, every file is read again
+            self.connection.execute(f"PRAGMA user_version = {constants.SCAN_INDEX_VERSION}")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                tags TEXT NOT NULL
+            )
+            """
+        )
+        self.connection.commit()
+        self.hits, self.misses = 0, 0
+        self._pending_writes = 0
+
+    def get(self, file_path: str, file_stat: FileStat) -> Optional[LocalTrackTags]:
+        """returns the indexed tags of the file if the file has not changed since it was indexed"""
+        with self.lock:
+            row = self.connection.execute("SELECT size, mtime_ns, inode, tags FROM files WHERE path = ?", (file_path,)).fetchone()
+        if not row or FileStat(*row[:3]) != file_stat:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return LocalTrackTags.model_validate_json(row[3])
+
+    def put(self, file_path: str, file_stat: FileStat, tags: LocalTrackTags):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode, tags) VALUES (?, ?, ?, ?, ?)",
+                (file_path, file_stat.size, file_stat.mtime_ns, file_stat.inode, tags.model_dump_json()),
+            )
+            self._pending_writes += 1
+            if self._pending_writes >= constants.SCAN_INDEX_COMMIT_INTERVAL:
+                self._commit()
+
+    def prune(self, root_dir: str, existing_file_paths: Iterable[str]):
+        """remove entries of files under root_dir which do not exist anymore"""
+        existing = set(existing_file_paths)
+        prefix = os.path.join(root_dir, "")
+        with self.lock:
+            rows = self.connection.execute("SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)).fetchall()
+            removed = [(path,) for (path,) in rows if path not in existing]
+            if removed:
+                self.connection.executemany("DELETE FROM files WHERE path = ?", removed)
+                logger.debug(f"removed {len(removed)} stale entries from scan index")
+            self._commit()
+
+    def commit(self):
+        with self.lock:
+            self._commit()
+
+    def close(self):
+        with self.lock:
+            self._commit()
+            self.connection.close()
+
+    # private functions
+    def _commit(self):
+        self.connection.commit()
+        self._pending_writes = 0
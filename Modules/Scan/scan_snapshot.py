@@ -0,0 +1,129 @@
+import gzip
+import os
+from typing import IO, Callable, Iterable, Iterator, Optional
+from pydantic import BaseModel
+
+from Modules.Scan import constants
+from Modules.Scan.models.local_album_data import LocalAlbumData, LocalAlbumDataModel, LocalTrackDataModel
+from Modules.Utils.general_utils import get_default_logger
+
+"""
+scan snapshots persist what the Scanner found, so that a library can be scanned on the machine holding it (where disk access is fast)
+and tagged or organized later, possibly from another machine, without reading the audio files again
+a snapshot is a JSON-lines file (gzip compressed if its name ends with .gz): a header line followed by one LocalAlbumDataModel per line
+paths are stored relative to the scanned root with "/" as the separator, so a snapshot can be loaded against another mount point of the same library
+"""
+
+logger = get_default_logger(__name__, "info")
+
+
+class ScanSnapshotException(Exception):
+    pass
+
+
+class ScanSnapshotHeader(BaseModel):
+    format: str = constants.SCAN_SNAPSHOT_FORMAT
+    version: int = constants.SCAN_SNAPSHOT_VERSION
+    root_dir: str  # the root the snapshot was scanned from, for information only
+
+
+class ScanSnapshotWriter:
+    """writes albums as they are scanned, the snapshot only replaces an existing file once it is closed successfully"""
+
+    def __init__(self, snapshot_path: str, root_dir: str):
+        self.snapshot_path = snapshot_path
+        self.root_dir = os.path.abspath(root_dir)
+        self.albums_written = 0
+        self._temp_path = f"{snapshot_path}.partial"
+        os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+        self._file = _open_snapshot(self._temp_path, "w", compressed=snapshot_path.endswith(".gz"))
+        self._file.write(ScanSnapshotHeader(root_dir=self.root_dir).model_dump_json() + "\n")
+
+    def __enter__(self) -> "ScanSnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(discard=exc_type is not None)
+
+    def write(self, album: LocalAlbumData):
+        model = _map_paths(album.to_model(), self._to_relative_path)
+        self._file.write(model.model_dump_json(exclude_defaults=True) + "\n")
+        self.albums_written += 1
+
+    def close(self, discard: bool = False):
+        """an unfinished snapshot is discarded, a partial scan must not be mistaken for the whole library"""
+        if self._file.closed:
+            return
+        self._file.close()
+        if discard:
+            os.remove(self._temp_path)
+            return
+        os.replace(self._temp_path, self.snapshot_path)
+        logger.info(f"wrote {self.albums_written} albums to scan snapshot {self.snapshot_path}")
+
+    # private functions
+    def _to_relative_path(self, path: str) -> str:
+        relative_path = os.path.relpath(os.path.abspath(path), self.root_dir)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            raise ScanSnapshotException(f"{path} is outside of the snapshot root {self.root_dir}")
+        return relative_path.replace(os.sep, "/")
+
+
+def write_scan_snapshot(snapshot_path: str, root_dir: str, albums: Iterable[LocalAlbumData]) -> int:
+    """returns the number of albums written"""
+    with ScanSnapshotWriter(snapshot_path, root_dir) as writer:
+        for album in albums:
+            writer.write(album)
+    return writer.albums_written
+
+
+def read_scan_snapshot_header(snapshot_path: str) -> ScanSnapshotHeader:
+    with _open_snapshot(snapshot_path, "r") as file:
+        return _read_header(file, snapshot_path)
+
+
+def read_scan_snapshot(snapshot_path: str, root_dir: Optional[str] = None) -> Iterator[LocalAlbumData]:
+    """
+    yields the albums of a snapshot with their paths rebased onto root_dir (the root the snapshot was scanned from if not provided)
+    only the snapshot is read, the audio files are opened lazily through the AudioManagerPool once they are actually used
+    """
+    with _open_snapshot(snapshot_path, "r") as file:
+        header = _read_header(file, snapshot_path)
+        root_dir = os.path.abspath(root_dir if root_dir else header.root_dir)
+        to_absolute_path = lambda path: os.path.normpath(os.path.join(root_dir, *path.split("/")))
+        for line_number, line in enumerate(file, start=2):
+            if not line.strip():
+                continue
+            try:
+                model = LocalAlbumDataModel.model_validate_json(line)
+            except ValueError as e:
+                raise ScanSnapshotException(f"invalid album on line {line_number} of {snapshot_path}: {e}") from e
+            yield LocalAlbumData.from_model(_map_paths(model, to_absolute_path))
+
+
+# private functions
+def _open_snapshot(file_path: str, mode: str, compressed: Optional[bool] = None) -> IO[str]:
+    if compressed if compressed is not None else file_path.endswith(".gz"):
+        return gzip.open(file_path, mode + "t", encoding="utf-8")  # type: ignore
+    return open(file_path, mode, encoding="utf-8")
+
+
+def _read_header(file: IO[str], snapshot_path: str) -> ScanSnapshotHeader:
+    try:
+        header = ScanSnapshotHeader.model_validate_json(file.readline())
+    except ValueError as e:
+        raise ScanSnapshotException(f"{snapshot_path} is not a scan snapshot") from e
+    if header.format != constants.SCAN_SNAPSHOT_FORMAT:
+        raise ScanSnapshotException(f"{snapshot_path} is not a scan snapshot")
+    if header.version != constants.SCAN_SNAPSHOT_VERSION:
+        raise ScanSnapshotException(f"{snapshot_path} has snapshot version {header.version}, expected {constants.SCAN_SNAPSHOT_VERSION}, scan the library again")
+    return header
+
+
+def _map_paths(model: LocalAlbumDataModel, convert_path: Callable[[str], str]) -> LocalAlbumDataModel:
+    """converts every path of the album in place"""
+    model.album_folder_path = convert_path(model.album_folder_path)
+    tracks: list[LocalTrackDataModel] = [track for tracks in model.discs.values() for track in tracks.values()] + model.unclean_tracks
+    for track in tracks:
+        track.file_path = convert_path(track.file_path)
+    return model
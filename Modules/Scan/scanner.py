@@ -1,16 +1,22 @@
 import os
-from typing import Optional
+import queue
+import threading
+from typing import Any, Iterator, Optional
 from Modules.Print.constants import SUB_LINE_SEPARATOR
 
 from Modules.Scan import constants
-from Modules.Tag import custom_tags
+from Modules.Scan.album_clustering import are_clusters_side_by_side, cluster_tracks
 from Modules.Scan.models.local_album_data import LocalAlbumData, LocalTrackData
-from Modules.Utils.general_utils import get_default_logger, is_date_in_YYYY_MM_DD, cleanDate
-from unigen import AudioFactory, UnsupportedFileFormatError, isFileFormatSupported
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Scan.models.scan_error import ScanError
+from Modules.Scan.scan_index import ScanIndex
+from Modules.Scan.tag_reader import TagReaderPool
+from Modules.Scan.walker import LibraryTree, LibraryWalker, WalkStats
+from Modules.Utils.general_utils import get_default_logger
 
 
 """
-need to check if the folder contains exactly one album.
+need to check which albums (usually exactly one) a folder contains.
 ways to identify:
     * Maximum depth must be less than constants.MAX_FOLDER_DEPTH_OF_ALBUM (=2) because folder structure can (or rather, should) be at max like:
         Album:
@@ -26,67 +32,128 @@ ways to identify:
             thanks.txt
             cover.jpg
     * Only considering the depth of folders which contain at least one music file
-    * For a folder to considered as an album, every audio file must have one of the following common amongst them entirely:
+    * Every audio file must share at least one of the following with the other files of its album (see album_clustering):
+        * vgmdb link
         * album name
         * catalog number
         * barcode
         * date (only if full date is available in YYYY-MM-DD form)
+    * A folder holding files of several albums side by side is split into one album per group of files
 """
 
 logger = get_default_logger(__name__, "info")
 
 
 class Scanner:
+    def __init__(self, scan_index: Optional[ScanIndex] = None, scan_workers: int = 1, scan_pool_type: constants.SCAN_POOL_TYPES = "thread"):
+        """
+        provide scan_index to only read the tags of files which changed since they were last scanned
+        provide scan_workers > 1 to read the tags of multiple files concurrently (useful for network storage)
+        """
+        self.scan_index = scan_index
+        self.walker = LibraryWalker(collect_file_stats=scan_index is not None)
+        self.tag_reader = TagReaderPool(scan_workers, scan_pool_type)
+        self.last_walk_stats: Optional[WalkStats] = None
+        self.scan_errors: list[ScanError] = []  # files which could not be read, in the order they were encountered
+
     def scan_albums_recursively(self, root_dir: str) -> list[LocalAlbumData]:
         """scans for all albums inside root_folder recursively"""
+        return list(self.iter_albums_recursively(root_dir))
+
+    def iter_albums_recursively(self, root_dir: str, queue_size: int = 0) -> Iterator[LocalAlbumData]:
+        """
+        yields albums inside root_folder as soon as each one is found, folders are only read when the scan reaches them
+        provide queue_size > 0 to keep scanning in a background thread, up to queue_size albums ahead of the consumer
+        """
         root_dir = self._convert_path_to_absolute(root_dir)
-        max_depths: dict[str, int] = {}
-        self._precalculate_max_depths_with_audio_files(root_dir, max_depths)
-        albums = self._scan_albums_recursively(root_dir, max_depths)
-        return albums
+        if queue_size > 0:
+            yield from self._iter_in_background(self._iter_albums_in_library(root_dir), queue_size)
+        else:
+            yield from self._iter_albums_in_library(root_dir)
+
+    def scan_album_in_folder_if_exists(self, folder_path: str, tree: Optional[LibraryTree] = None) -> Optional[LocalAlbumData]:
+        """returns a single album if the given folders contains files belonging to a single album, provide tree to avoid walking the folder again"""
+        albums = self.scan_albums_in_folder(folder_path, tree)
+        return albums[0] if len(albums) == 1 else None
 
-    def scan_album_in_folder_if_exists(self, folder_path: str) -> Optional[LocalAlbumData]:
-        """returns a single album if the given folders contains files belonging to a single album"""
+    def scan_albums_in_folder(self, folder_path: str, tree: Optional[LibraryTree] = None) -> list[LocalAlbumData]:
+        """
+        returns the albums made up by the files of the given folder, or an empty list if the folder is not an album folder
+        files of several albums lying side by side in the folder are split into one album each, all sharing the folder
+        """
         folder_path = self._convert_path_to_absolute(folder_path)
         logger.info(SUB_LINE_SEPARATOR)
         logger.info(f"Scanning {folder_path}")
         logger.info(SUB_LINE_SEPARATOR)
-        audio_files = self.get_supported_audio_files_in_folder(folder_path)
-        if not self._does_audio_files_belong_to_one_album_only(audio_files):
-            return None
-        return self._compile_album_data_from_track_data(folder_path, audio_files)
+        tree = tree if tree else self._walk(folder_path)
+        audio_files = self._get_supported_audio_files_in_folder(folder_path, -1, tree)
+        if self.scan_index:
+            self.scan_index.commit()
+        clusters = cluster_tracks(audio_files)
+        if not clusters:
+            return []
+        if len(clusters) > 1 and not are_clusters_side_by_side(clusters):
+            return []  # albums are kept in separate sub folders, they are found while scanning those
+        if len(clusters) > 1:
+            logger.info(f"splitting {folder_path} into {len(clusters)} albums")
+        return [self._compile_album_data_from_track_data(folder_path, cluster, shares_album_folder=len(clusters) > 1) for cluster in clusters]
 
     def get_supported_audio_files_in_folder(self, folder_path: str, max_depth: int = -1) -> list[LocalTrackData]:
         """get a list of all supported audio files inside a folder, provide max_depth for recursion depth while scanning"""
         folder_path = self._convert_path_to_absolute(folder_path)
-        return self._get_supported_audio_files_in_folder(folder_path, max_depth)
+        audio_files = self._get_supported_audio_files_in_folder(folder_path, max_depth, self._walk(folder_path))
+        if self.scan_index:
+            self.scan_index.commit()
+        return audio_files
+
+    def close(self):
+        """release the tag reading workers and the scan index"""
+        self.tag_reader.close()
+        if self.scan_index:
+            self.scan_index.close()
 
     # private functions
-    def _get_supported_audio_files_in_folder(self, folder_path: str, max_depth: int, current_depth: int = 1) -> list[LocalTrackData]:
-        if max_depth > 0 and current_depth > max_depth:
-            return []
-        audio_tracks: list[LocalTrackData] = []
-        for entry in os.listdir(folder_path):
-            entry_path = os.path.join(folder_path, entry)
-            if os.path.isfile(entry_path):
-                try:
-                    audio_manager = AudioFactory.buildAudioManager(entry_path)
-                    audio_tracks.append(LocalTrackData(file_path=entry_path, audio_manager=audio_manager, depth_in_parent_folder=current_depth))
-                except UnsupportedFileFormatError:
-                    pass
-                except Exception as e:
-                    logger.error(f"unable to read the file at {folder_path}, error:\n{e}")
-            elif os.path.isdir(entry_path):
-                audio_tracks.extend(self._get_supported_audio_files_in_folder(entry_path, max_depth, current_depth + 1))
-        return audio_tracks
-
-    def _compile_album_data_from_track_data(self, parent_directory: str, audio_files: list[LocalTrackData]) -> LocalAlbumData:
+    def _walk(self, folder_path: str) -> LibraryTree:
+        tree = self.walker.walk(folder_path)
+        self.last_walk_stats = tree.stats
+        logger.debug(tree.stats.pprint())
+        return tree
+
+    def _get_supported_audio_files_in_folder(self, folder_path: str, max_depth: int, tree: LibraryTree) -> list[LocalTrackData]:
+        audio_files = tree.get_audio_files(folder_path, max_depth)
+        tags: list[Optional[LocalTrackTags]] = [self._get_indexed_tags(file_path, tree) for file_path, _ in audio_files]
+
+        indices_to_read = [i for i, track_tags in enumerate(tags) if track_tags is None]
+        read_results = self.tag_reader.read([audio_files[i][0] for i in indices_to_read])
+        for i, (read_tags, error) in zip(indices_to_read, read_results):
+            file_path = audio_files[i][0]
+            if error:
+                self._report_scan_error(error)
+                continue
+            tags[i] = read_tags
+            file_stat = tree.file_stats.get(file_path)
+            if read_tags and self.scan_index and file_stat:
+                self.scan_index.put(file_path, file_stat, read_tags)
+
+        return [LocalTrackData(file_path=file_path, tags=track_tags, depth_in_parent_folder=depth) for (file_path, depth), track_tags in zip(audio_files, tags) if track_tags]
+
+    def _get_indexed_tags(self, file_path: str, tree: LibraryTree) -> Optional[LocalTrackTags]:
+        file_stat = tree.file_stats.get(file_path)
+        if not self.scan_index or not file_stat:
+            return None
+        return self.scan_index.get(file_path, file_stat)
+
+    def _report_scan_error(self, error: ScanError):
+        self.scan_errors.append(error)
+        logger.debug(f"unable to read the file at {error.pprint()}")
+
+    def _compile_album_data_from_track_data(self, parent_directory: str, audio_files: list[LocalTrackData], shares_album_folder: bool = False) -> LocalAlbumData:
         """it is considered a guarantee that the audio_files array represents tracks of a single album"""
-        album_data = LocalAlbumData(album_folder_path=parent_directory)
+        album_data = LocalAlbumData(album_folder_path=parent_directory, shares_album_folder=shares_album_folder)
 
         # mapping tracks and discs
         for track in audio_files:
-            disc_number, track_number = track.audio_manager.getDiscNumber(), track.audio_manager.getTrackNumber()
+            disc_number, track_number = track.tags.disc_number, track.tags.track_number
 
             if not track_number:
                 logger.info(f"track number not present in {track.file_name}, adding to unclean tracks")
@@ -125,64 +192,66 @@ class Scanner:
 
         return album_data
 
-    def _does_audio_files_belong_to_one_album_only(self, audio_files: list[LocalTrackData]) -> bool:
-        if not audio_files:
+    def _iter_albums_in_library(self, root_dir: str) -> Iterator[LocalAlbumData]:
+        tree = LibraryTree(root_dir)
+        self.last_walk_stats = tree.stats
+        yield from self._iter_albums_recursively(root_dir, tree)
+        logger.info(tree.stats.pprint())
+        if self.scan_index:
+            self.scan_index.prune(root_dir, tree.file_stats.keys())
+            logger.info(f"scan index: {self.scan_index.hits} unchanged files, {self.scan_index.misses} files read")
+        if self.scan_errors:
+            logger.info(f"could not read {len(self.scan_errors)} files")
+
+    def _iter_albums_recursively(self, folder_path: str, tree: LibraryTree) -> Iterator[LocalAlbumData]:
+        max_depth = self.walker.walk_bounded(folder_path, tree, constants.MAX_FOLDER_DEPTH_OF_ALBUM)
+        if max_depth == -1:  # no audio files anywhere inside, no need to go deeper
+            return
+        if max_depth <= constants.MAX_FOLDER_DEPTH_OF_ALBUM:
+            found_albums = self.scan_albums_in_folder(folder_path, tree)
+            if found_albums:
+                yield from found_albums
+                return
+
+        for sub_folder_path in tree.get_sub_folders(folder_path):
+            yield from self._iter_albums_recursively(sub_folder_path, tree)
+
+    def _iter_in_background(self, albums: Iterator[LocalAlbumData], queue_size: int) -> Iterator[LocalAlbumData]:
+        """runs albums in a separate thread, feeding a bounded queue which is consumed here"""
+        album_queue: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=queue_size)
+        stop_scanning = threading.Event()
+
+        def put(item: tuple[str, Any]) -> bool:
+            while not stop_scanning.is_set():
+                try:
+                    album_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
             return False
 
-        def has_identical_items_list_of_list(arr: list[list[str]]) -> bool:
-            common_items = set(arr[0])
-            for item in arr:
-                common_items.intersection_update(item)
-                if len(common_items) == 0:
-                    return False
-            return True
-
-        def has_identical_items_list_of_string(arr: list[str]) -> bool:
-            return len(set(arr)) == len(arr)
-
-        if has_identical_items_list_of_list([track.audio_manager.getCustomTag(custom_tags.VGMDB_LINK) for track in audio_files]):
-            return True
-        if has_identical_items_list_of_list([track.audio_manager.getAlbum() for track in audio_files]):
-            return True
-        if has_identical_items_list_of_list([track.audio_manager.getCatalog() for track in audio_files]):
-            return True
-        if has_identical_items_list_of_list([track.audio_manager.getBarcode() for track in audio_files]):
-            return True
-        dates = [track.audio_manager.getDate() for track in audio_files]
-        if None not in dates:
-            cleaned_dates = [date for date in dates if date is not None]
-            if all(is_date_in_YYYY_MM_DD(cleanDate(date)) for date in cleaned_dates) and has_identical_items_list_of_string(cleaned_dates):
-                return True
-        return False
-
-    def _scan_albums_recursively(self, folder_path: str, max_depths: dict[str, int]) -> list[LocalAlbumData]:
-        max_depth = max_depths[folder_path]
-        if max_depth != -1 and max_depth <= constants.MAX_FOLDER_DEPTH_OF_ALBUM:  # audio files exist somewhere inside the folder
-            found_album = self.scan_album_in_folder_if_exists(folder_path)
-            if found_album:
-                return [found_album]
-
-        found_albums: list[LocalAlbumData] = []
-        for entry in os.listdir(folder_path):
-            entry_path = os.path.join(folder_path, entry)
-            if os.path.isdir(entry_path):
-                inner_albums = self._scan_albums_recursively(entry_path, max_depths)
-                found_albums.extend(inner_albums)
-        return found_albums
-
-    def _precalculate_max_depths_with_audio_files(self, folder_path: str, max_depths: dict[str, int]):
-        """returns: whether the folder contains any audio file"""
-        max_depth = -1
-        for entry in os.listdir(folder_path):
-            entry_path = os.path.join(folder_path, entry)
-            if os.path.isdir(entry_path):
-                self._precalculate_max_depths_with_audio_files(entry_path, max_depths)
-                if max_depths[entry_path] != -1:  # there is an audio file inside entry_path
-                    max_depth = max(max_depth, 1 + max_depths[entry_path])
-            elif os.path.isfile(entry_path) and isFileFormatSupported(entry_path):
-                max_depth = max(max_depth, 1)
-
-        max_depths[folder_path] = max_depth
+        def scan():
+            try:
+                for album in albums:
+                    if not put(("album", album)):
+                        return
+                put(("done", None))
+            except Exception as e:
+                put(("error", e))
+
+        scan_thread = threading.Thread(target=scan, name="background-scanner", daemon=True)
+        scan_thread.start()
+        try:
+            while True:
+                kind, item = album_queue.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise item
+                yield item
+        finally:
+            stop_scanning.set()  # consumer stopped early or finished, let the scanning thread exit
+            scan_thread.join()
 
     def _convert_path_to_absolute(self, path: str) -> str:
         if os.path.isabs(path):
@@ -196,3 +265,5 @@ if __name__ == "__main__":
     albums = scanner.scan_albums_recursively(test_music_dir)
     for album in albums:
         print(album.pprint())
+    if scanner.last_walk_stats:
+        print(scanner.last_walk_stats.pprint())
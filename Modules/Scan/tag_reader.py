@@ -0,0 +1,57 @@
+import concurrent.futures
+import multiprocessing
+from typing import Optional
+from unigen import AudioFactory, UnsupportedFileFormatError
+
+from Modules.Scan.constants import SCAN_POOL_TYPES
+from Modules.Scan.fast_tag_reader import read_track_tags_fast
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Scan.models.scan_error import ScanError
+
+
+def read_track_tags(file_path: str) -> tuple[Optional[LocalTrackTags], Optional[ScanError]]:
+    """
+    reads the tags needed by the scanner from a file, never raises
+    returns (tags, None) on success, (None, error) if the file could not be read and (None, None) if the format is not supported
+    the header only fast path is tried first, falling back to a full parse through unigen for files it does not handle
+    kept at module level so that it can be pickled for process pools
+    """
+    tags = read_track_tags_fast(file_path)
+    if tags is not None:
+        return tags, None
+    try:
+        return LocalTrackTags.from_audio_manager(AudioFactory.buildAudioManager(file_path)), None
+    except UnsupportedFileFormatError:
+        return None, None
+    except Exception as e:
+        return None, ScanError(file_path=file_path, error_type=type(e).__name__, message=str(e))
+
+
+class TagReaderPool:
+    """fans out tag reading of many files over a pool of workers, results are returned in the same order as the input"""
+
+    def __init__(self, workers: int = 1, pool_type: SCAN_POOL_TYPES = "thread"):
+        self.workers = max(1, workers)
+        self.pool_type = pool_type
+        self._executor: Optional[concurrent.futures.Executor] = None
+
+    def read(self, file_paths: list[str]) -> list[tuple[Optional[LocalTrackTags], Optional[ScanError]]]:
+        if self.workers == 1 or len(file_paths) <= 1:
+            return [read_track_tags(file_path) for file_path in file_paths]
+        chunk_size = max(1, len(file_paths) // (self.workers * 4)) if self.pool_type == "process" else 1  # amortize pickling cost for processes
+        return list(self._get_executor().map(read_track_tags, file_paths, chunksize=chunk_size))
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    # private functions
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if not self._executor:
+            if self.pool_type == "process":
+                # spawned rather than forked, forking a process which already runs threads (like the background scan) can deadlock
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        return self._executor
@@ -0,0 +1,171 @@
+import os
+import time
+from typing import NamedTuple, Optional
+from pydantic import BaseModel
+from unigen import isFileFormatSupported
+
+from Modules.Utils.general_utils import get_default_logger
+
+logger = get_default_logger(__name__, "info")
+
+
+class FileStat(NamedTuple):
+    """the parts of a stat result used to decide whether a file changed since it was last scanned"""
+
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+class WalkStats(BaseModel):
+    """counters collected while walking a library, used to keep an eye on the metadata cost of scanning"""
+
+    directories_scanned: int = 0
+    files_seen: int = 0
+    audio_files_found: int = 0
+    syscalls: int = 0  # directory reads + stat fallbacks issued by the walker
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_seen / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def syscalls_per_file(self) -> float:
+        return self.syscalls / self.files_seen if self.files_seen else 0.0
+
+    def pprint(self) -> str:
+        return (
+            f"walked {self.directories_scanned} folders and {self.files_seen} files ({self.audio_files_found} audio) in {self.elapsed_seconds:.2f}s, "
+            f"{self.files_per_second:.0f} files/sec, {self.syscalls_per_file:.3f} syscalls/file"
+        )
+
+
+class LibraryTree:
+    """
+    result of traversing a directory tree, holds everything the scanner needs:
+        * max_depths: folder -> depth of the deepest audio file inside it (-1 if there are none), only for completely walked folders
+        * entries: folder -> supported audio files and sub folders directly inside it, in directory order
+        * file_stats: audio file -> FileStat (only if the walker was asked to collect them)
+    every folder is read from the disk at most once, no matter how many times it is walked
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.max_depths: dict[str, int] = {}
+        self.entries: dict[str, list[str]] = {}
+        self.folders: set[str] = set()
+        self.file_stats: dict[str, FileStat] = {}
+        self.stats = WalkStats()
+
+    def is_folder(self, path: str) -> bool:
+        return path in self.folders
+
+    def get_sub_folders(self, folder_path: str) -> list[str]:
+        return [entry for entry in self.entries.get(folder_path, []) if self.is_folder(entry)]
+
+    def get_audio_files(self, folder_path: str, max_depth: int = -1, current_depth: int = 1) -> list[tuple[str, int]]:
+        """get (file_path, depth_in_folder) of all supported audio files inside a completely walked folder, without touching the disk"""
+        if max_depth > 0 and current_depth > max_depth:
+            return []
+        audio_files: list[tuple[str, int]] = []
+        for entry in self.entries.get(folder_path, []):
+            if self.is_folder(entry):
+                if self.max_depths.get(entry, -1) != -1:
+                    audio_files.extend(self.get_audio_files(entry, max_depth, current_depth + 1))
+            else:
+                audio_files.append((entry, current_depth))
+        return audio_files
+
+
+class LibraryWalker:
+    """walks a directory tree using os.scandir, reusing the file type information returned by the directory read"""
+
+    def __init__(self, collect_file_stats: bool = False):
+        self.collect_file_stats = collect_file_stats
+
+    def walk(self, root_dir: str) -> LibraryTree:
+        """walk the entire tree in a single pass"""
+        tree = LibraryTree(root_dir)
+        self._get_max_depth(root_dir, tree, None)
+        return tree
+
+    def walk_bounded(self, folder_path: str, tree: LibraryTree, limit: int) -> int:
+        """
+        returns the exact depth of the deepest audio file inside folder_path if it is at most limit (-1 if there are none),
+        otherwise returns some depth greater than limit as soon as it is found, leaving the rest of the folder unread for now
+        """
+        return self._get_max_depth(folder_path, tree, limit)
+
+    # private functions
+    def _get_max_depth(self, folder_path: str, tree: LibraryTree, limit: Optional[int]) -> int:
+        if folder_path in tree.max_depths:
+            return tree.max_depths[folder_path]
+        max_depth = -1
+        for entry in self._list_folder(folder_path, tree):
+            if tree.is_folder(entry):
+                inner_max_depth = self._get_max_depth(entry, tree, limit - 1 if limit is not None else None)
+                if inner_max_depth != -1:  # there is an audio file inside entry
+                    max_depth = max(max_depth, 1 + inner_max_depth)
+            else:
+                max_depth = max(max_depth, 1)
+            if limit is not None and max_depth > limit:
+                return max_depth  # not walked completely, hence not memoized
+        tree.max_depths[folder_path] = max_depth
+        return max_depth
+
+    def _list_folder(self, folder_path: str, tree: LibraryTree) -> list[str]:
+        if folder_path in tree.entries:
+            return tree.entries[folder_path]
+        start_time = time.perf_counter()
+        entries: list[str] = []
+        tree.stats.directories_scanned += 1
+        tree.stats.syscalls += 1
+        try:
+            with os.scandir(folder_path) as iterator:
+                dir_entries = list(iterator)
+        except OSError as e:
+            logger.error(f"unable to read the folder at {folder_path}, error:\n{e}")
+            dir_entries = []
+
+        for entry in dir_entries:
+            if self._is_dir(entry, tree):
+                tree.folders.add(entry.path)
+                entries.append(entry.path)
+            else:
+                tree.stats.files_seen += 1
+                if isFileFormatSupported(entry.name) and self._is_file(entry, tree):
+                    tree.stats.audio_files_found += 1
+                    entries.append(entry.path)
+                    if self.collect_file_stats:
+                        self._collect_file_stat(entry, tree)
+
+        tree.folders.add(folder_path)
+        tree.entries[folder_path] = entries
+        tree.stats.elapsed_seconds += time.perf_counter() - start_time
+        return entries
+
+    def _is_dir(self, entry: os.DirEntry[str], tree: LibraryTree) -> bool:
+        # DirEntry only needs a stat call for symlinks or when the filesystem does not report the entry type
+        if entry.is_symlink():
+            tree.stats.syscalls += 1
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
+
+    def _is_file(self, entry: os.DirEntry[str], tree: LibraryTree) -> bool:
+        if entry.is_symlink():
+            tree.stats.syscalls += 1
+        try:
+            return entry.is_file()
+        except OSError:
+            return False
+
+    def _collect_file_stat(self, entry: os.DirEntry[str], tree: LibraryTree):
+        tree.stats.syscalls += 1
+        try:
+            stat = entry.stat()
+            tree.file_stats[entry.path] = FileStat(stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        except OSError as e:
+            logger.error(f"unable to stat the file at {entry.path}, error:\n{e}")
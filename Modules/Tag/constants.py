@@ -0,0 +1,5 @@
+TAG_PADDING_MIN_BYTES = 256 * 1024  # enough to swap an embedded cover for a somewhat larger one without rewriting the file
+TAG_PADDING_MAX_BYTES = 2 * 1024 * 1024
+TAG_PADDING_AUDIO_RATIO = 0.01  # padding reserved relative to the size of the audio following the tags, within the bounds above
+
+PICTURE_MEMORY_COVER_COPIES = 3  # a cover being embedded is held as the shared buffer, the front cover read back to compare it and the serialized tag while saving
@@ -8,3 +8,4 @@ ARRANGER = "arranger"
 COMPOSER = "composer"
 VGMDB_LINK = "VGMDB Link"
 VGMDB_ID = "VGMDB Album ID"
+YEAR = "year"
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class AlbumTagPayload(BaseModel):
+    """the album level tags shared by every track of an album, computed once per album and applied to each of its tracks"""
+
+    model_config = ConfigDict(frozen=True)
+    album_names: tuple[str, ...] = ()
+    comment: tuple[str, ...] = ()
+    cover_data: bytes | None = None
+    date: str | None = None
+    catalog: tuple[str, ...] = ()
+    barcode: tuple[str, ...] = ()
+    custom_tags: tuple[tuple[str, tuple[str, ...]], ...] = ()  # (key, values) in the order they are applied
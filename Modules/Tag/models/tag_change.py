@@ -0,0 +1,21 @@
+from typing import Any
+from pydantic import BaseModel, Field
+from unigen import IAudioManager
+
+from Modules.Scan.audio_manager_pool import MUTATING_METHOD_PREFIXES
+
+
+class TagChange(BaseModel):
+    """a single call to a setter (or deleter) of IAudioManager, recorded so that it can be replayed on the file later"""
+
+    field: str  # like "catalog" or the key of a custom tag, shown to the user
+    method: str  # like "setCatalog"
+    args: list[Any] = []
+    data: bytes | None = Field(default=None, exclude=True)  # binary first argument (like a cover), kept out of json
+    data_sidecar: str | None = None  # name of the file holding data when the change is stored in a plan
+
+    def apply(self, audio_manager: IAudioManager):
+        if not self.method.startswith(MUTATING_METHOD_PREFIXES) or not callable(getattr(IAudioManager, self.method, None)):
+            raise ValueError(f"{self.method} is not a setter of IAudioManager")
+        args = [self.data, *self.args] if self.data is not None else self.args
+        getattr(audio_manager, self.method)(*args)
@@ -0,0 +1,64 @@
+from pydantic import BaseModel
+
+from Modules.Tag.models.tag_change import TagChange
+
+
+class FileTagResult(BaseModel):
+    file_path: str
+    changed_fields: list[str] = []  # tags whose desired value differed from the one already in the file
+    changed_bytes: int = 0  # size of the new values of the changed tags, the metadata delta
+    changes: list[TagChange] = []  # the calls made on the audio manager, replayable when the file is tagged from a plan
+    saved: bool = False
+    in_place: bool = False  # only the metadata was written, the audio was not moved
+    bytes_written: int = 0  # the metadata if saved in place, otherwise (most of) the whole file
+    error: str | None = None  # why saving the file failed
+    audio_intact: bool | None = None  # False if the audio data changed while saving, None if it was not verified
+
+    @property
+    def write_amplification(self) -> float | None:
+        """bytes written for every byte of tags which changed"""
+        return self.bytes_written / self.changed_bytes if self.saved and self.changed_bytes else None
+
+
+class AlbumTagResult(BaseModel):
+    file_tag_results: list[FileTagResult] = []
+
+    @property
+    def files_rewritten(self) -> int:
+        return sum(1 for result in self.file_tag_results if result.saved)
+
+    @property
+    def files_skipped(self) -> int:
+        """files which already had every desired tag and were not saved"""
+        return sum(1 for result in self.file_tag_results if not result.changed_fields)
+
+    @property
+    def failed_file_tag_results(self) -> list[FileTagResult]:
+        return [result for result in self.file_tag_results if result.error]
+
+    @property
+    def corrupted_file_tag_results(self) -> list[FileTagResult]:
+        """files whose audio data changed while saving"""
+        return [result for result in self.file_tag_results if result.audio_intact is False]
+
+    @property
+    def files_saved_in_place(self) -> int:
+        return sum(1 for result in self.file_tag_results if result.saved and result.in_place)
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(result.bytes_written for result in self.file_tag_results)
+
+    @property
+    def write_amplification(self) -> float | None:
+        """bytes written for every byte of tags which changed, far more if the audio had to be moved"""
+        changed_bytes = sum(result.changed_bytes for result in self.file_tag_results if result.saved)
+        return self.bytes_written / changed_bytes if changed_bytes else None
+
+    def summary(self) -> str:
+        summary = f"rewrote {self.files_rewritten} files ({self.files_saved_in_place} in place, {self.bytes_written / (1024 * 1024):.1f} MB written"
+        summary += f", write amplification {self.write_amplification:.1f}x)" if self.write_amplification else ")"
+        summary += f", skipped {self.files_skipped} unchanged files"
+        failed, corrupted = self.failed_file_tag_results, self.corrupted_file_tag_results
+        summary = f"{summary}, failed to save {len(failed)} files" if failed else summary
+        return f"{summary}, the audio of {len(corrupted)} files changed while saving" if corrupted else summary
@@ -0,0 +1,60 @@
+import io
+from typing import Optional
+from mutagen import PaddingInfo
+from pydantic import BaseModel
+from unigen import IAudioManager
+
+from Modules.Tag import constants
+
+"""
+saving tags without rewriting the audio
+a file can only be saved in place when its new tags fit into the space (tags and padding) the old ones occupied, otherwise every
+byte of audio following the tags is moved. so existing padding is always kept, and when a file does have to be rewritten a generous
+amount of padding is reserved so that tagging it again later happens in place
+"""
+
+
+class PaddedSaveStats(BaseModel):
+    in_place: bool  # the tags fit into the existing padding, the audio was not moved
+    bytes_written: int  # everything written to the file while saving, the metadata if saved in place, most of the file otherwise
+    padding_bytes: int  # padding left after saving
+
+
+class _CountingFileIO(io.FileIO):
+    """counts the bytes actually written to the file"""
+
+    bytes_written = 0
+
+    def write(self, data) -> int:  # type: ignore
+        written = super().write(data)
+        self.bytes_written += written or 0
+        return written  # type: ignore
+
+
+def get_padding(info: PaddingInfo) -> int:
+    if info.padding >= 0:
+        return info.padding  # shrinking the padding would move the audio as well
+    reserved = int(info.size * constants.TAG_PADDING_AUDIO_RATIO)
+    return min(max(reserved, constants.TAG_PADDING_MIN_BYTES), constants.TAG_PADDING_MAX_BYTES)
+
+
+def save_with_padding(audio_manager: IAudioManager) -> Optional[PaddedSaveStats]:
+    """saves the tags of an open (not pooled) audio manager, returns None if the format does not support choosing the padding"""
+    audio = getattr(audio_manager, "audio", None)
+    if audio is None or not getattr(audio, "filename", None):
+        audio_manager.save()
+        return None
+    padding_infos: list[tuple[PaddingInfo, int]] = []
+
+    def padding_callback(info: PaddingInfo) -> int:
+        padding = get_padding(info)
+        padding_infos.append((info, padding))
+        return padding
+
+    raw_file = _CountingFileIO(audio.filename, "r+")
+    with io.BufferedRandom(raw_file) as file:
+        audio.save(file, padding=padding_callback)
+    if not padding_infos:  # the format does not use padding (like wav files)
+        return None
+    info, padding = padding_infos[-1]
+    return PaddedSaveStats(in_place=info.padding >= 0, bytes_written=raw_file.bytes_written, padding_bytes=padding)
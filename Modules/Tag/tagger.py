@@ -1,122 +1,292 @@
-from typing import Any
+import os
+import concurrent.futures
+from typing import Any, Callable, Optional, cast
+from unigen.types.picture import PICTURE_NAME_TO_NUMBER
 
 from Imports.config import Config
-from Modules.Tag import custom_tags
-from Modules.Scan.models.local_album_data import LocalAlbumData
+from Modules.Tag import constants, custom_tags
+from Modules.Tag.models.album_tag_payload import AlbumTagPayload
+from Modules.Tag.models.tag_change import TagChange
+from Modules.Tag.models.tag_result import AlbumTagResult, FileTagResult
+from Modules.Tag.padded_save import PaddedSaveStats, save_with_padding
+from Modules.Scan import constants as scan_constants
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool, run_on_audio_manager
+from Modules.Scan.models.local_album_data import LocalAlbumData, LocalTrackData
 from Modules.VGMDB.models.vgmdb_album_data import ArrangerOrComposerOrLyricistOrPerformer, Names, VgmdbAlbumData
 from Modules.Utils.general_utils import get_default_logger, printAndMoveBack
+from Modules.Utils.io_governor import get_io_governor
+from Modules.Utils.memory_budget import MemoryBudget
+from Modules.Verify.audio_verifier import get_audio_verifier
 
 logger = get_default_logger(__name__, "info")
 
 
 class Tagger:
-    """Tagger class, the audio files in vgmdb object must be linked to their local counterparts before this class is called"""
+    """
+    Tagger class, the audio files in vgmdb object must be linked to their local counterparts before this class is called
+    a tag is only set when its desired value differs from the one already in the file, and only files with changes are saved
+    """
 
-    def __init__(self, local_album_data: LocalAlbumData, vgmdb_album_data: VgmdbAlbumData, config: Config):
+    def __init__(
+        self,
+        local_album_data: LocalAlbumData,
+        vgmdb_album_data: VgmdbAlbumData,
+        config: Config,
+        on_file_saved: Optional[Callable[[str], None]] = None,
+        saved_files: Optional[set[str]] = None,
+    ):
         self.local_album_data, self.vgmdb_album_data = local_album_data, vgmdb_album_data
         self.config = config
-        self.matched_local_tracks = [track.local_track for _, disc in self.vgmdb_album_data.discs.items() for _, track in disc.tracks.items() if track.local_track]
-        self.unmatched_local_tracks = self.vgmdb_album_data.unmatched_local_tracks
+        self.on_file_saved = on_file_saved  # called with the path of every saved file, from the thread which saved it
+        self.saved_files = saved_files or set()  # saved by an interrupted run, these files are neither tagged nor saved again
+        self.matched_local_tracks = [track.local_track for _, disc in self.vgmdb_album_data.discs.items() for _, track in disc.tracks.items() if track.local_track and track.local_track.file_path not in self.saved_files]
+        self.unmatched_local_tracks = [local_track for local_track in self.vgmdb_album_data.unmatched_local_tracks if local_track.file_path not in self.saved_files]
+        self.file_tag_results = {track.file_path: FileTagResult(file_path=track.file_path) for track in self.matched_local_tracks + self.unmatched_local_tracks}
+        self.picture_memory = MemoryBudget(config.picture_memory_mb * 1024 * 1024)
+        self.defer_pictures = False
+        self.deferred_cover_data: Optional[bytes] = None  # shared by every file, never copied per track
+        self.deferred_covers: dict[str, int] = {}  # files whose cover is set while saving, with the memory reserved for doing so
+        self.audio_hashes_before: dict[str, concurrent.futures.Future[Optional[str]]] = {}  # with config.verify_audio
+        self.audio_hashes_after: dict[str, concurrent.futures.Future[Optional[str]]] = {}
 
-    def tag_files(self):
-        if not self.config.album_data_only:
-            logger.info("tagging track data")
-            self._tag_track_specific_data()
+    def tag_files(self) -> AlbumTagResult:
+        self.plan_files(defer_pictures=self.config.stream_pictures)
+        return self.save_files()
+
+    def plan_files(self, defer_pictures: bool = False) -> AlbumTagResult:
+        """
+        sets the tags on the (pooled) audio managers without saving them, the changes made are recorded in the result of every file
+        with defer_pictures, the front cover is only compared and set by save_files, a file at a time within config.picture_memory_mb
+        if tagging fails halfway, the tags set so far are dropped
+        """
+        self.deferred_covers.clear()
+        self.defer_pictures = defer_pictures
+        try:
+            if not self.config.album_data_only:
+                logger.info("tagging track data")
+                self._tag_track_specific_data()
+                printAndMoveBack("")
+                logger.info("finished")
+
+            logger.info("tagging album data")
+            self._tag_album_specific_data()
             printAndMoveBack("")
             logger.info("finished")
+        except Exception:
+            for file_path in self.file_tag_results:
+                get_audio_manager_pool().discard(file_path, save=False)
+            raise
+        return AlbumTagResult(file_tag_results=list(self.file_tag_results.values()))
 
-        logger.info("tagging album data")
-        self._tag_album_specific_data()
-        printAndMoveBack("")
-        logger.info("finished")
-
+    def save_files(self) -> AlbumTagResult:
+        """saves the files changed by plan_files"""
         logger.info("saving files")
         self._save_local_files()
         printAndMoveBack("")
         logger.info("finished")
+        return AlbumTagResult(file_tag_results=list(self.file_tag_results.values()))
 
     # Private Functions
     def _save_local_files(self):
-        for local_track in self.matched_local_tracks + self.unmatched_local_tracks:
-            printAndMoveBack(local_track.file_name)
+        """
+        saves up to config.save_workers files at once, progress is still shown in album order
+        with config.verify_audio, the audio data of every file is hashed (in a process pool, ahead of the saves) before and after it is saved
+        files are never marked for saving in the pool, modified files stay open until their save worker gets to them, so that the pool
+        can not save one before its audio was hashed, nor without the padding and the accounting of _save_local_file
+        """
+        local_tracks = [track for track in self.matched_local_tracks + self.unmatched_local_tracks if self.file_tag_results[track.file_path].changed_fields or track.file_path in self.deferred_covers]
+        verifier = get_audio_verifier() if self.config.verify_audio else None
+        self.audio_hashes_before = {track.file_path: verifier.submit(track.file_path) for track in local_tracks} if verifier else {}
+        self.audio_hashes_after = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.config.save_workers)) as executor:
+            futures = [executor.submit(self._save_local_file, local_track) for local_track in local_tracks]
+            for local_track, future in zip(local_tracks, futures):
+                future.result()
+                printAndMoveBack(local_track.file_name)
+        if verifier:
+            for file_path, hash_after in self.audio_hashes_after.items():
+                self.file_tag_results[file_path].audio_intact = verifier.compare(file_path, self.audio_hashes_before[file_path], hash_after)
+
+    def _save_local_file(self, local_track: LocalTrackData):
+        """errors are collected in the result of the file, so that one bad file does not stop the rest of the album from being saved"""
+        result = self.file_tag_results[local_track.file_path]
+        if local_track.file_path in self.audio_hashes_before:
+            concurrent.futures.wait([self.audio_hashes_before[local_track.file_path]])  # the audio has to be hashed before the file changes
+        try:
+            if local_track.file_path not in self.deferred_covers:
+                stats = self._save_audio_manager(local_track)
+            else:
+                with self.picture_memory.reserve(self.deferred_covers[local_track.file_path]):
+                    self._set_front_cover(local_track, cast(bytes, self.deferred_cover_data))
+                    stats = self._save_audio_manager(local_track) if result.changed_fields else None
+                    get_audio_manager_pool().discard(local_track.file_path)  # its pictures leave memory along with it
+                if not result.changed_fields:
+                    return
+        except Exception as e:
+            result.error = f"{type(e).__name__} -> {e}"
+            logger.error(f"unable to save {local_track.file_path}, error: {result.error}")
+            return
+        result.saved = True
+        if local_track.file_path in self.audio_hashes_before:
+            self.audio_hashes_after[local_track.file_path] = get_audio_verifier().submit(local_track.file_path)
+        if stats:
+            result.in_place, result.bytes_written = stats.in_place, stats.bytes_written
+        else:
+            result.bytes_written = os.path.getsize(local_track.file_path)  # assume the whole file was rewritten
+        get_io_governor().throttle(result.bytes_written)
+        if self.on_file_saved:
+            self.on_file_saved(local_track.file_path)
+
+    def _save_audio_manager(self, local_track: LocalTrackData) -> Optional[PaddedSaveStats]:
+        if not self.config.reserve_padding:
             local_track.audio_manager.save()
+            return None
+        return run_on_audio_manager(local_track.audio_manager, save_with_padding, saves=True)
+
+    def _get_picture_memory_estimate(self, local_track: LocalTrackData, cover_data: bytes) -> int:
+        """the pictures already embedded in the file (as estimated by the pool when it was opened) and the copies of the cover made while setting it"""
+        open_size = get_audio_manager_pool().get_size(local_track.file_path)
+        return (open_size or scan_constants.AUDIO_MANAGER_BASE_SIZE_ESTIMATE) + len(cover_data) * constants.PICTURE_MEMORY_COVER_COPIES
+
+    def _set_tag(self, local_track: LocalTrackData, field: str, current_value: Any, value: Any, method: str, *args: Any):
+        """calls method with args only if the file does not have this value already, so that unchanged files are never marked as modified"""
+        if current_value == value:
+            return
+        self._apply_changes(local_track, field, value, TagChange(field=field, method=method, args=list(args)))
+
+    def _set_custom_tag(self, local_track: LocalTrackData, key: str, value: list[str]):
+        self._set_tag(local_track, key, local_track.audio_manager.getCustomTag(key), value, "setCustomTag", key, value)
+
+    def _set_front_cover(self, local_track: LocalTrackData, cover_data: bytes):
+        audio_manager = local_track.audio_manager
+        front_covers = [picture.data for picture in audio_manager.getAllPictures() if picture.picture_type == PICTURE_NAME_TO_NUMBER["Cover (front)"]]
+        if front_covers == [cover_data] or (front_covers and not self.config.album_cover_overwrite):
+            return
+        delete_change = TagChange(field="cover", method="deletePictureOfType", args=["Cover (front)"])
+        set_change = TagChange(field="cover", method="setPictureOfType", args=["Cover (front)"], data=cover_data)
+        self._apply_changes(local_track, "cover", cover_data, delete_change, set_change)
+
+    def _apply_changes(self, local_track: LocalTrackData, field: str, value: Any, *changes: TagChange):
+        for change in changes:
+            change.apply(local_track.audio_manager)
+            local_track.tags.update(change.method, change.args)  # later stages read the tags from here
+        result = self.file_tag_results[local_track.file_path]
+        result.changes.extend(changes)
+        result.changed_fields.append(field)
+        result.changed_bytes += self._get_value_size(value)
+
+    def _get_value_size(self, value: Any) -> int:
+        if isinstance(value, bytes):
+            return len(value)
+        if isinstance(value, str):
+            return len(value.encode("utf-8"))
+        if isinstance(value, (list, tuple)):
+            return sum(self._get_value_size(item) for item in value)
+        return len(str(value))  # disc and track numbers
 
     def _tag_album_specific_data(self):
+        payload = self._get_album_tag_payload()
         for local_track in self.matched_local_tracks + self.unmatched_local_tracks:
             audio_manager = local_track.audio_manager
             printAndMoveBack(local_track.file_name)
-            if self.config.album_name:
-                album_names = self._get_flag_filtered_names(self.vgmdb_album_data.names)
-                audio_manager.setAlbum(album_names) if album_names else None
-
-            if self.config.vgmdb_link:
-                audio_manager.setComment([f"Find the tracklist at {self.vgmdb_album_data.vgmdb_link}"])
-                audio_manager.setCustomTag(custom_tags.VGMDB_LINK, [self.vgmdb_album_data.vgmdb_link])
-                audio_manager.setCustomTag(custom_tags.VGMDB_ID, [self.vgmdb_album_data.album_id])
-
-            if self.config.album_cover:
-                cover_data = self.vgmdb_album_data.get_album_cover_data()
-                if cover_data:
-                    if self.config.album_cover_overwrite:
-                        audio_manager.deletePictureOfType("Cover (front)")
-                    if not audio_manager.hasPictureOfType("Cover (front)"):
-                        audio_manager.setPictureOfType(cover_data, "Cover (front)")
-
-            if self.config.date and self.vgmdb_album_data.release_date:
-                audio_manager.setDate(self.vgmdb_album_data.release_date)
-
-            if self.config.catalog and self.vgmdb_album_data.catalog:
-                audio_manager.setCatalog([self.vgmdb_album_data.catalog])
-
-            if self.config.barcode and self.vgmdb_album_data.barcode:
-                audio_manager.setBarcode([self.vgmdb_album_data.barcode])
-
-            if self.config.organizations and self.vgmdb_album_data.organizations:
-                for org in self.vgmdb_album_data.organizations:
-                    org_name = org.names.get_highest_priority_name(self.config.language_order)
-                    audio_manager.setCustomTag(org.role, [org_name]) if org_name else None
-
-            if self.config.media_format:
-                audio_manager.setCustomTag("Media Format", [self.vgmdb_album_data.media_format])
-
-            def addMultiValues(tag: list[ArrangerOrComposerOrLyricistOrPerformer] | None, tagInFile: str, flag: bool = True):
-                if not tag or not flag:
-                    return
-                dude_names = self._remove_duplicates([name for name in [dude.names.get_highest_priority_name(self.config.language_order) for dude in tag] if name])
-                audio_manager.setCustomTag(tagInFile, dude_names) if dude_names else None
+            if payload.album_names:
+                album_names = list(payload.album_names)
+                self._set_tag(local_track, "album", audio_manager.getAlbum(), album_names, "setAlbum", album_names)
+            if payload.comment:
+                comment = list(payload.comment)
+                self._set_tag(local_track, "comment", audio_manager.getComment(), comment, "setComment", comment)
+            if payload.cover_data and self.defer_pictures:
+                self.deferred_cover_data = payload.cover_data
+                self.deferred_covers[local_track.file_path] = self._get_picture_memory_estimate(local_track, payload.cover_data)
+            elif payload.cover_data:
+                self._set_front_cover(local_track, payload.cover_data)
+            if payload.date:
+                self._set_tag(local_track, "date", audio_manager.getDate(), payload.date, "setDate", payload.date)
+            if payload.catalog:
+                catalog = list(payload.catalog)
+                self._set_tag(local_track, "catalog", audio_manager.getCatalog(), catalog, "setCatalog", catalog)
+            if payload.barcode:
+                barcode = list(payload.barcode)
+                self._set_tag(local_track, "barcode", audio_manager.getBarcode(), barcode, "setBarcode", barcode)
+            for key, values in payload.custom_tags:
+                self._set_custom_tag(local_track, key, list(values))
+
+    def _get_album_tag_payload(self) -> AlbumTagPayload:
+        """everything in here is the same for every track of the album, so it is computed only once"""
+        album_data, config = self.vgmdb_album_data, self.config
+        tags: dict[str, Any] = {}
+        custom_tag_values: list[tuple[str, tuple[str, ...]]] = []
+        if config.album_name:
+            tags["album_names"] = tuple(self._get_flag_filtered_names(album_data.names))
+
+        if config.vgmdb_link:
+            tags["comment"] = (f"Find the tracklist at {album_data.vgmdb_link}",)
+            custom_tag_values.append((custom_tags.VGMDB_LINK, (album_data.vgmdb_link,)))
+            custom_tag_values.append((custom_tags.VGMDB_ID, (album_data.album_id,)))
+
+        if config.album_cover:
+            tags["cover_data"] = album_data.get_album_cover_data()
+
+        if config.date and album_data.release_date:
+            tags["date"] = album_data.release_date
+
+        if config.catalog and album_data.catalog:
+            tags["catalog"] = (album_data.catalog,)
+
+        if config.barcode and album_data.barcode:
+            tags["barcode"] = (album_data.barcode,)
+
+        if config.organizations and album_data.organizations:
+            for org in album_data.organizations:
+                org_name = org.names.get_highest_priority_name(config.language_order)
+                custom_tag_values.append((org.role, (org_name,))) if org_name else None
+
+        if config.media_format:
+            custom_tag_values.append(("Media Format", (album_data.media_format,)))
+
+        def addMultiValues(tag: list[ArrangerOrComposerOrLyricistOrPerformer] | None, tagInFile: str, flag: bool = True):
+            if not tag or not flag:
+                return
+            dude_names = self._remove_duplicates([name for name in [dude.names.get_highest_priority_name(config.language_order) for dude in tag] if name])
+            custom_tag_values.append((tagInFile, tuple(dude_names))) if dude_names else None
 
-            is_single = self.vgmdb_album_data.total_tracks_in_album == 1
-            addMultiValues(self.vgmdb_album_data.lyricists, custom_tags.LYRICIST, is_single or self.config.lyricists)
-            addMultiValues(self.vgmdb_album_data.performers, custom_tags.PERFORMER, is_single or self.config.performers)
-            addMultiValues(self.vgmdb_album_data.arrangers, custom_tags.ARRANGER, is_single or self.config.arrangers)
-            addMultiValues(self.vgmdb_album_data.composers, custom_tags.COMPOSER, is_single or self.config.composers)
+        is_single = album_data.total_tracks_in_album == 1
+        addMultiValues(album_data.lyricists, custom_tags.LYRICIST, is_single or config.lyricists)
+        addMultiValues(album_data.performers, custom_tags.PERFORMER, is_single or config.performers)
+        addMultiValues(album_data.arrangers, custom_tags.ARRANGER, is_single or config.arrangers)
+        addMultiValues(album_data.composers, custom_tags.COMPOSER, is_single or config.composers)
+        return AlbumTagPayload(custom_tags=tuple(custom_tag_values), **tags)
 
     def _tag_track_specific_data(self):
         for disc_number, disc in self.vgmdb_album_data.discs.items():
             for track_number, track in disc.tracks.items():
-                if not track.local_track:
+                if not track.local_track or track.local_track.file_path in self.saved_files:
                     continue
-                printAndMoveBack(f"tagging {track.local_track.file_name}")
-                audio_manager = track.local_track.audio_manager
+                local_track = track.local_track
+                printAndMoveBack(f"tagging {local_track.file_name}")
+                audio_manager = local_track.audio_manager
 
                 if self.config.title:
                     titles = self._get_flag_filtered_names(track.names)
                     if self.config.keep_title:
-                        titles = [*audio_manager.getTitle(), *titles]
-                    audio_manager.setTitle(titles) if titles else None
+                        titles = self._remove_duplicates([*audio_manager.getTitle(), *titles])  # so that tagging again does not add the same titles again
+                    self._set_tag(local_track, "title", audio_manager.getTitle(), titles, "setTitle", titles) if titles else None
 
                 if self.config.disc_numbers:
-                    audio_manager.setDiscNumbers(disc_number, self.vgmdb_album_data.total_discs)
+                    disc_numbers = (disc_number, self.vgmdb_album_data.total_discs)
+                    self._set_tag(local_track, "disc number", (audio_manager.getDiscNumber(), audio_manager.getTotalDiscs()), disc_numbers, "setDiscNumbers", *disc_numbers)
 
                 if self.config.track_numbers:
-                    audio_manager.setTrackNumbers(track_number, disc.total_tracks)
+                    track_numbers = (track_number, disc.total_tracks)
+                    self._set_tag(local_track, "track number", (audio_manager.getTrackNumber(), audio_manager.getTotalTracks()), track_numbers, "setTrackNumbers", *track_numbers)
 
     def _get_flag_filtered_names(self, names: Names) -> list[str]:
         reordered_names = self._remove_duplicates(names.get_reordered_names(self.config.language_order))
         return reordered_names if self.config.all_lang else reordered_names[:1]
 
     def _remove_duplicates(self, arr: list[Any]) -> list[Any]:
-        return [x for i, x in enumerate(arr) if x not in arr[:i]]
+        """keeps the first occurrence of every value, in order"""
+        return list(dict.fromkeys(arr))
 
 
 if __name__ == "__main__":
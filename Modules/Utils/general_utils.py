@@ -161,7 +161,7 @@ def is_date_in_YYYY_MM_DD(date: str) -> bool:
     if not date:
         return False
     pattern = re.compile(r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[1-2][0-9]|3[0-1])$")
-    return bool(pattern.match(date[0]))
+    return bool(pattern.match(date))
 
 
 if __name__ == "__main__":
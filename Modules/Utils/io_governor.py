@@ -0,0 +1,112 @@
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Optional
+
+COPY_CHUNK_SIZE = 1024 * 1024  # a throttled copy writes (and is charged) a chunk at a time
+
+
+class TokenBucket:
+    """
+    allows rate units per second on average, with bursts of up to burst units
+    units are charged after they are used (the size of a save is only known once it is done), so the bucket can go into debt, which the next caller waits out
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst if burst else rate
+        self.clock, self.sleep = clock, sleep
+        self.tokens = self.burst
+        self.last_refill_time = clock()
+        self.lock = threading.Lock()
+
+    def consume(self, amount: float) -> float:
+        """takes amount from the bucket and waits until it is no longer in debt, returns the seconds waited"""
+        wait = self.reserve(amount)
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def reserve(self, amount: float) -> float:
+        """takes amount from the bucket without waiting, returns the seconds the caller has to wait (for callers which can not block, like coroutines)"""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill_time) * self.rate)
+            self.last_refill_time = now
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+
+class IOGovernor:
+    """
+    process wide bound on the disk writes of saves, renames and backups, in bytes and in operations per second (0 for no bound)
+    also measures the throughput actually achieved, so that a throttled run can be compared against an unthrottled one
+    """
+
+    def __init__(self, max_bytes_per_second: float = 0, max_operations_per_second: float = 0):
+        self.lock = threading.Lock()
+        self.configure(max_bytes_per_second, max_operations_per_second)
+        self.bytes_written, self.operations, self.throttled_seconds = 0, 0, 0.0
+        self.first_write_time: Optional[float] = None
+        self.last_write_time: Optional[float] = None
+
+    def configure(self, max_bytes_per_second: float, max_operations_per_second: float):
+        self.bytes_bucket = TokenBucket(max_bytes_per_second) if max_bytes_per_second > 0 else None
+        self.operations_bucket = TokenBucket(max_operations_per_second) if max_operations_per_second > 0 else None
+
+    def throttle(self, size: int, operations: int = 1):
+        """call after every write of size bytes, blocks while the writes so far are over the bounds"""
+        start = time.monotonic()
+        with self.lock:
+            if self.first_write_time is None:
+                self.first_write_time = start
+        throttled_seconds = 0.0
+        if self.operations_bucket and operations:
+            throttled_seconds += self.operations_bucket.consume(operations)
+        if self.bytes_bucket and size:
+            throttled_seconds += self.bytes_bucket.consume(size)
+        with self.lock:
+            self.bytes_written += size
+            self.operations += operations
+            self.throttled_seconds += throttled_seconds
+            self.last_write_time = time.monotonic()
+
+    def copy_file(self, source: str, destination: str) -> str:
+        """shutil.copy2 which is throttled a chunk at a time, usable as the copy_function of shutil.copytree"""
+        with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+            while chunk := source_file.read(COPY_CHUNK_SIZE):
+                destination_file.write(chunk)
+                self.throttle(len(chunk))
+        shutil.copystat(source, destination)
+        return destination
+
+    def rename(self, source: str, destination: str):
+        os.rename(source, destination)
+        self.throttle(0)
+
+    def get_throughput(self) -> float:
+        """bytes written per second between the first and the last write"""
+        with self.lock:
+            if self.first_write_time is None or self.last_write_time is None or self.last_write_time <= self.first_write_time:
+                return 0
+            return self.bytes_written / (self.last_write_time - self.first_write_time)
+
+    def summary(self) -> str:
+        summary = f"wrote {self.bytes_written / (1024 * 1024):.1f} MB in {self.operations} writes at {self.get_throughput() / (1024 * 1024):.1f} MB/s"
+        if self.throttled_seconds:
+            summary += f", writers were held back for {self.throttled_seconds:.1f} seconds in total"  # summed over concurrent writers
+        return summary
+
+
+_io_governor: Optional[IOGovernor] = None
+_io_governor_lock = threading.Lock()
+
+
+def get_io_governor() -> IOGovernor:
+    """maintain a single governor throughout the process, so that every write path shares the same bounds"""
+    global _io_governor
+    with _io_governor_lock:
+        if not _io_governor:
+            _io_governor = IOGovernor()
+        return _io_governor
@@ -0,0 +1,28 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class MemoryBudget:
+    """
+    bounds the memory used by concurrent operations, each one reserves its estimated size and waits until that fits under max_bytes
+    an operation larger than max_bytes is still run, but only once nothing else holds a reservation
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.reserved_bytes, self.peak_reserved_bytes = 0, 0
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[None]:
+        with self.condition:
+            self.condition.wait_for(lambda: self.reserved_bytes == 0 or self.reserved_bytes + size <= self.max_bytes)
+            self.reserved_bytes += size
+            self.peak_reserved_bytes = max(self.peak_reserved_bytes, self.reserved_bytes)
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.reserved_bytes -= size
+                self.condition.notify_all()
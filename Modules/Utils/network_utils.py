@@ -3,6 +3,8 @@ import requests
 from urllib.parse import urlparse
 import urllib.request
 
+from Modules.Utils.rate_limiter import get_rate_limiter
+
 
 def get_raw_data_from_url(url: str) -> bytes:
     """
@@ -13,8 +15,9 @@ def get_raw_data_from_url(url: str) -> bytes:
     Returns:
         bytes: raw data received from the url
     """
-    response = requests.get(url)
-    return response.content
+    with get_rate_limiter().limit(url):
+        response = requests.get(url)
+        return response.content
 
 
 def download_file(url: str, output_dir: str, name: str | None = None) -> str:
@@ -49,7 +52,8 @@ def download_file(url: str, output_dir: str, name: str | None = None) -> str:
     if os.path.exists(filePath):
         raise FileExistsError(f"file already exists: {fileName}")  # logging fileName in error instead of filePath to reduce clutter in Console
 
-    urllib.request.urlretrieve(url, filePath)
+    with get_rate_limiter().limit(url):
+        urllib.request.urlretrieve(url, filePath)
     return filePath
 
 
@@ -0,0 +1,130 @@
+import asyncio
+import ipaddress
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+from Modules.Utils.io_governor import TokenBucket
+
+
+class HostStats(BaseModel):
+    requests: int = 0
+    wait_seconds: float = 0  # spent waiting for the rate limit
+    transfer_seconds: float = 0  # spent sending the request and receiving the response
+    first_request_time: Optional[float] = None
+    last_request_time: Optional[float] = None
+
+    @property
+    def requests_per_second(self) -> float:
+        if self.first_request_time is None or self.last_request_time is None or self.last_request_time <= self.first_request_time:
+            return 0
+        return self.requests / (self.last_request_time - self.first_request_time)
+
+
+class RateLimiter:
+    """
+    process wide bound on outbound requests, every host gets its own token bucket of max_requests_per_second with bursts of up to burst requests (0 for no bound)
+    loopback hosts (a vgmdb.info server or mirror running locally) are never bound, only measured
+    also measures the time requests spent waiting for the bound against the time spent transferring, per host, to tell whether the bound or the server is the bottleneck
+    """
+
+    def __init__(self, max_requests_per_second: float = 0, burst: float = 0, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.clock, self.sleep = clock, sleep
+        self.lock = threading.Lock()
+        self.buckets: dict[str, TokenBucket] = {}
+        self.stats: dict[str, HostStats] = {}
+        self.configure(max_requests_per_second, burst)
+
+    def configure(self, max_requests_per_second: float, burst: float = 0):
+        with self.lock:
+            self.max_requests_per_second, self.burst = max_requests_per_second, burst
+            self.buckets = {}
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        """wrap a request to url, blocks until the host of url allows another request"""
+        host = _get_host(url)
+        wait = self._reserve(host)
+        if wait:
+            self.sleep(wait)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._record(host, wait, self.clock() - start)
+
+    @asynccontextmanager
+    async def limit_async(self, url: str) -> AsyncIterator[None]:
+        """limit for coroutines, which wait without blocking the event loop"""
+        host = _get_host(url)
+        wait = self._reserve(host)
+        if wait:
+            await asyncio.sleep(wait)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._record(host, wait, self.clock() - start)
+
+    def get_stats(self) -> dict[str, HostStats]:
+        with self.lock:
+            return {host: stats.model_copy() for host, stats in self.stats.items()}
+
+    def summary(self) -> list[str]:
+        """a line per host"""
+        return [
+            f"{host}: {stats.requests} requests at {stats.requests_per_second:.1f}/s, waited {stats.wait_seconds:.1f} seconds for the rate limit and {stats.transfer_seconds:.1f} seconds for transfers (summed over concurrent requests)"
+            for host, stats in sorted(self.get_stats().items())
+        ]
+
+    # private functions
+    def _reserve(self, host: str) -> float:
+        with self.lock:
+            if self.max_requests_per_second <= 0 or _is_loopback(host):
+                return 0
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.max_requests_per_second, burst=self.burst, clock=self.clock, sleep=self.sleep)
+            bucket = self.buckets[host]
+        return bucket.reserve(1)
+
+    def _record(self, host: str, wait: float, transfer_seconds: float):
+        now = self.clock()
+        with self.lock:
+            stats = self.stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.wait_seconds += wait
+            stats.transfer_seconds += transfer_seconds
+            if stats.first_request_time is None:
+                stats.first_request_time = now - transfer_seconds
+            stats.last_request_time = now
+
+
+def _get_host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _is_loopback(host: str) -> bool:
+    hostname = urlsplit(f"//{host}").hostname or ""
+    if hostname == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(hostname).is_loopback
+    except ValueError:
+        return False
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """maintain a single limiter throughout the process, so that every request to a host shares its bucket"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if not _rate_limiter:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+from urllib.parse import urljoin
+
+import requests
+
+from Modules.Print.utils import get_rich_console
+from Modules.VGMDB import constants
+from Modules.VGMDB.api.http_cache import HttpCache, normalize_url
+from Modules.VGMDB.api.transport import HedgedTransport
+from Modules.VGMDB.models.search import SearchAlbum
+from Modules.VGMDB.models.vgmdb_album_data import VgmdbAlbumData
+
+console = get_rich_console()
+T = TypeVar("T")
+
+
+class VgmdbRequestException(requests.RequestException):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class AsyncVgmdbClient:
+    """
+    vgmdb api client for asyncio, with up to max_concurrent_requests requests in flight over kept alive connections
+    concurrent requests for the same url share a single request, and concurrent calls for the same album (or the same cleaned search term) share the album (or results) built from it
+    albums (with their covers) and search results are kept in memory up to max_cache_bytes, least recently used ones are dropped beyond it
+    requests go to base_url, and to fallback_base_urls when it fails or is slow (see HedgedTransport)
+    must be used from a single event loop
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        http_cache: Optional[HttpCache] = None,
+        max_concurrent_requests: int = constants.MAX_CONCURRENT_REQUESTS,
+        fallback_base_urls: Optional[list[str]] = None,
+        hedge: bool = True,
+        max_cache_bytes: int = constants.MEMORY_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.vgmdb_info_base_url = base_url
+        self.http_cache = http_cache
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.max_cache_bytes = max_cache_bytes
+        self.album_cache: OrderedDict[str, VgmdbAlbumData] = OrderedDict()
+        self.search_cache: OrderedDict[str, list[SearchAlbum]] = OrderedDict()
+        self.requests_sent, self.requests_coalesced = 0, 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        self._in_flight: dict[str, asyncio.Future[dict[str, Any] | Exception]] = {}
+        self._albums_in_flight: dict[str, asyncio.Future[VgmdbAlbumData]] = {}
+        self._searches_in_flight: dict[str, asyncio.Future[list[SearchAlbum]]] = {}
+        # a hedge is a second connection for the same request
+        self.transport = HedgedTransport([base_url, *(fallback_base_urls or [])], max_connections=2 * self.max_concurrent_requests, hedge=hedge)
+
+    async def get_request(self, url: str, ttl_seconds: float = 0) -> dict[str, Any] | Exception:
+        """
+        responses are served from http_cache for ttl_seconds (0 to always fetch), stale responses are revalidated with the server when it supports it
+        a stale response is still returned if the server can not be reached
+        """
+        cache_key = normalize_url(self.transport.get_path(url), "")
+        return await self._single_flight(self._in_flight, cache_key, lambda: self._get_request(url, cache_key, ttl_seconds))
+
+    async def get_album_details(self, album_id: str) -> VgmdbAlbumData:
+        if album_id in self.album_cache:
+            self.album_cache.move_to_end(album_id)
+            return self.album_cache[album_id]
+        return await self._single_flight(self._albums_in_flight, album_id, lambda: self._get_album_details(album_id))
+
+    async def search_album(self, search_term: str | None) -> list[SearchAlbum]:
+        if not search_term:
+            search_term = ""
+        cleaned_search_term = self._clean_search_term(search_term)
+        if cleaned_search_term in self.search_cache:
+            self.search_cache.move_to_end(cleaned_search_term)
+            return self.search_cache[cleaned_search_term]
+        return await self._single_flight(self._searches_in_flight, cleaned_search_term, lambda: self._search_album(cleaned_search_term))
+
+    async def close(self):
+        await self.transport.close()
+
+    def get_cached_bytes(self) -> int:
+        """estimated memory held by the albums and search results kept in memory, covers downloaded since an album was cached included"""
+        albums_bytes = sum(constants.ALBUM_DETAILS_SIZE_ESTIMATE + len(album.album_cover_cache or b"") for album in self.album_cache.values())
+        return albums_bytes + sum(constants.SEARCH_RESULT_SIZE_ESTIMATE * max(1, len(search_albums)) for search_albums in self.search_cache.values())
+
+    # private functions
+    async def _single_flight(self, in_flight: dict[str, asyncio.Future[T]], key: str, start: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """concurrent calls with the same key share a single run of start"""
+        future = in_flight.get(key)
+        if future:
+            self.requests_coalesced += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(start())
+        in_flight[key] = future
+        future.add_done_callback(lambda _: in_flight.pop(key, None))
+        return await asyncio.shield(future)  # a cancelled caller does not cancel the run shared with others
+
+    async def _get_album_details(self, album_id: str) -> VgmdbAlbumData:
+        url = urljoin(self.vgmdb_info_base_url, f"album/{album_id}")
+        vgmdb_album_data = await self.get_request(url, ttl_seconds=constants.ALBUM_CACHE_TTL_SECONDS)
+        if isinstance(vgmdb_album_data, Exception):
+            raise VgmdbRequestException(f"could not retrieve album details from vgmdb for albumID: {album_id}")
+
+        album = self.album_cache.get(album_id)  # kept if cached in the meantime, its cover may be downloaded already
+        if not album:
+            album = self.album_cache[album_id] = VgmdbAlbumData(**vgmdb_album_data, album_id=album_id)
+        self._evict_cached()
+        return album
+
+    async def _search_album(self, cleaned_search_term: str) -> list[SearchAlbum]:
+        url = urljoin(self.vgmdb_info_base_url, f"search?q={cleaned_search_term}")
+        search_result = await self.get_request(url, ttl_seconds=constants.SEARCH_CACHE_TTL_SECONDS)
+        if isinstance(search_result, Exception):
+            raise VgmdbRequestException(f"could not search for {cleaned_search_term} from vgmdb")
+        search_albums = self.search_cache[cleaned_search_term] = [SearchAlbum.model_validate(result) for result in search_result["results"]["albums"]]
+        self._evict_cached()
+        return search_albums
+
+    def _evict_cached(self):
+        """albums go first as they hold the covers, the most recently cached album and search result are always kept"""
+        while len(self.album_cache) > 1 and self.get_cached_bytes() > self.max_cache_bytes:
+            self.album_cache.popitem(last=False)
+        while len(self.search_cache) > 1 and self.get_cached_bytes() > self.max_cache_bytes:
+            self.search_cache.popitem(last=False)
+
+    async def _get_request(self, url: str, cache_key: str, ttl_seconds: float) -> dict[str, Any] | Exception:
+        backoff_secs = 1
+        found_exception = Exception("empty exception")
+        headers = dict(constants.REQUEST_HEADERS)
+        cached_response, fresh = self.http_cache.get(cache_key, ttl_seconds) if self.http_cache and ttl_seconds else (None, False)
+        if cached_response and fresh:
+            return cached_response.data
+        if cached_response and cached_response.etag:
+            headers["If-None-Match"] = cached_response.etag
+        if cached_response and cached_response.last_modified:
+            headers["If-Modified-Since"] = cached_response.last_modified
+        path = self.transport.get_path(url)
+        for _ in range(constants.APICALLRETRIES):
+            try:
+                async with self._semaphore:
+                    self.requests_sent += 1
+                    response = await self.transport.get(path, headers)
+                if response.status_code == 304 and self.http_cache and cached_response:
+                    self.http_cache.refresh(cache_key)
+                    return cached_response.data
+                if response.status_code >= 200 and response.status_code <= 299:
+                    data = response.json()
+                    if self.http_cache and ttl_seconds:
+                        self.http_cache.put(cache_key, data, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+                    return data
+                found_exception = VgmdbRequestException(f"{url} answered with {response.status_code}")
+                break  # the transport already tried every server, other answers (like a 404) do not change on retrying
+            except Exception as e:
+                console.log(f"[red]error in getting response, retrying after {backoff_secs} seconds")
+                console.log(f"[red]error: {e}")
+                found_exception = e
+                await asyncio.sleep(backoff_secs)
+                backoff_secs *= 2
+        if cached_response:
+            console.log(f"[yellow]could not reach {url}, using the response cached on {time.strftime('%Y-%m-%d', time.localtime(cached_response.stored_at))}")
+            return cached_response.data
+        return found_exception
+
+    def _clean_search_term(self, name: str) -> str:
+        def isJapanese(ch: str) -> bool:
+            return ord(ch) >= 0x4E00 and ord(ch) <= 0x9FFF
+
+        def isChinese(ch: str) -> bool:
+            return ord(ch) >= 0x3400 and ord(ch) <= 0x4DFF
+
+        ans = ""
+        for ch in name:
+            if ch.isalnum() or ch == " " or isJapanese(ch) or isChinese(ch):
+                ans += ch
+            else:
+                ans += " "
+        return ans
@@ -1,9 +1,9 @@
+import asyncio
+import concurrent.futures
 import textwrap
+import threading
 import traceback
-import requests
-import time
-from typing import Any
-from urllib.parse import urljoin
+from typing import Any, Coroutine, Iterable, Optional, TypeVar
 
 # REMOVE
 import os
@@ -12,24 +12,42 @@ import sys
 sys.path.append(os.getcwd())
 # REMOVE
 
-from Modules.VGMDB.constants import APICALLRETRIES, USE_LOCAL_SERVER, VGMDB_INFO_BASE_URL
+from Modules.VGMDB.api.async_client import AsyncVgmdbClient, VgmdbRequestException
+from Modules.VGMDB.api.http_cache import HttpCache
+from Modules.VGMDB.constants import MAX_CONCURRENT_REQUESTS, MEMORY_CACHE_MAX_MB, USE_LOCAL_SERVER, VGMDB_INFO_BASE_URL
 from Modules.Print.utils import get_panel, get_rich_console
 from Modules.VGMDB.models.vgmdb_album_data import VgmdbAlbumData
 from Modules.VGMDB.models.search import SearchAlbum
 
 
 console = get_rich_console()
-
-
-class VgmdbRequestException(requests.RequestException):
-    def __init__(self, message: str):
-        super().__init__(message)
+T = TypeVar("T")
 
 
 class VgmdbClient:
-    def __init__(self) -> None:
-        self.vgmdb_info_base_url = VGMDB_INFO_BASE_URL
-        if USE_LOCAL_SERVER:
+    """
+    blocking facade over AsyncVgmdbClient, whose event loop runs in a background thread
+    calls block until their response arrives, while get_many_album_details and submit let several requests run at once
+    """
+
+    def __init__(
+        self,
+        http_cache: Optional[HttpCache] = None,
+        base_url: Optional[str] = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        fallback_base_urls: Optional[list[str]] = None,
+        hedge: bool = True,
+        max_cache_bytes: int = MEMORY_CACHE_MAX_MB * 1024 * 1024,
+    ) -> None:
+        """
+        responses are kept in http_cache between runs if given, base_url skips starting the local server
+        requests fall back to fallback_base_urls, and to vgmdb.info when the local server is used
+        albums and search results are kept in memory up to max_cache_bytes
+        """
+        self.vgmdb_info_base_url = base_url if base_url else VGMDB_INFO_BASE_URL
+        self.fallback_base_urls = list(fallback_base_urls or [])
+        self.http_cache = http_cache
+        if USE_LOCAL_SERVER and not base_url:
             try:
                 from Modules.VGMDB.api.vgmdb_info import run_vgmdb_info_server
 
@@ -38,6 +56,7 @@ class VgmdbClient:
                 baseAddress = run_vgmdb_info_server()
 
                 self.vgmdb_info_base_url = baseAddress
+                self.fallback_base_urls.insert(0, VGMDB_INFO_BASE_URL)
             except Exception as e:
                 console.print(
                     get_panel(
@@ -63,71 +82,54 @@ class VgmdbClient:
                         ).strip()
                     )
                 )
-        console.print(get_panel(f"[bold yellow]Using [blue]{self.vgmdb_info_base_url}[/] for VGMDB API"))
-
-        self.album_cache: dict[str, VgmdbAlbumData] = {}
-        self.search_cache: dict[str, list[SearchAlbum]] = {}
-
-    def get_request(self, url: str) -> dict[str, Any] | Exception:
-        backoff_secs = 1
-        found_exception = Exception("empty exception")
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-        }
-        for _ in range(APICALLRETRIES):
-            try:
-                response = requests.get(url, headers=headers)
-                if response.status_code >= 200 and response.status_code <= 299:
-                    return response.json()
-            except Exception as e:
-                console.log(f"[red]error in getting response, retrying after {backoff_secs} seconds")
-                console.log(f"[red]error: {e}")
-                found_exception = e
-                time.sleep(backoff_secs)
-                backoff_secs *= 2
-        return found_exception
+        fallback_message = f", falling back to [blue]{', '.join(self.fallback_base_urls)}[/]" if self.fallback_base_urls else ""
+        console.print(get_panel(f"[bold yellow]Using [blue]{self.vgmdb_info_base_url}[/] for VGMDB API{fallback_message}"))
+
+        self.async_client = AsyncVgmdbClient(
+            self.vgmdb_info_base_url,
+            http_cache=http_cache,
+            max_concurrent_requests=max_concurrent_requests,
+            fallback_base_urls=self.fallback_base_urls,
+            hedge=hedge,
+            max_cache_bytes=max_cache_bytes,
+        )
+        self.album_cache = self.async_client.album_cache
+        self.search_cache = self.async_client.search_cache
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, name="vgmdb-client", daemon=True)
+        self.loop_thread.start()
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """runs a coroutine of async_client on the event loop of the client, from any thread"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def get_request(self, url: str, ttl_seconds: float = 0) -> dict[str, Any] | Exception:
+        return self.submit(self.async_client.get_request(url, ttl_seconds)).result()
 
     def get_album_details(self, album_id: str) -> VgmdbAlbumData:
-        if album_id in self.album_cache:
-            return self.album_cache[album_id]
-
-        url = urljoin(self.vgmdb_info_base_url, f"album/{album_id}")
-        vgmdb_album_data = self.get_request(url)
-        if isinstance(vgmdb_album_data, Exception):
-            raise VgmdbRequestException(f"could not retrieve album details from vgmdb for albumID: {album_id}")
-
-        self.album_cache[album_id] = VgmdbAlbumData(**vgmdb_album_data, album_id=album_id)
-        return self.album_cache[album_id]
+        return self.submit(self.async_client.get_album_details(album_id)).result()
 
     def search_album(self, search_term: str | None) -> list[SearchAlbum]:
-        if not search_term:
-            search_term = ""
-        cleaned_search_term = self._clean_search_term(search_term)
-        if cleaned_search_term in self.search_cache:
-            return self.search_cache[cleaned_search_term]
-
-        url = urljoin(self.vgmdb_info_base_url, f"search?q={cleaned_search_term}")
-        search_result = self.get_request(url)
-        if isinstance(search_result, Exception):
-            raise VgmdbRequestException(f"could not search for {cleaned_search_term} from vgmdb")
-        self.search_cache[cleaned_search_term] = [SearchAlbum.model_validate(result) for result in search_result["results"]["albums"]]
-        return self.search_cache[cleaned_search_term]
-
-    def _clean_search_term(self, name: str) -> str:
-        def isJapanese(ch: str) -> bool:
-            return ord(ch) >= 0x4E00 and ord(ch) <= 0x9FFF
-
-        def isChinese(ch: str) -> bool:
-            return ord(ch) >= 0x3400 and ord(ch) <= 0x4DFF
-
-        ans = ""
-        for ch in name:
-            if ch.isalnum() or ch == " " or isJapanese(ch) or isChinese(ch):
-                ans += ch
-            else:
-                ans += " "
-        return ans
+        return self.submit(self.async_client.search_album(search_term)).result()
+
+    def get_many_album_details(self, album_ids: Iterable[str]) -> list[VgmdbAlbumData | Exception]:
+        """fetches the albums concurrently (up to max_concurrent_requests at once), in the order of album_ids"""
+
+        async def get_all():
+            return await asyncio.gather(*(self.async_client.get_album_details(album_id) for album_id in album_ids), return_exceptions=True)
+
+        return self.submit(get_all()).result()
+
+    def close(self):
+        """closes the connections and the event loop, the client can not be used afterwards"""
+        if self.loop.is_closed():
+            return
+        try:
+            self.submit(self.async_client.close()).result()
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join()
+            self.loop.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from pydantic import BaseModel
+
+from Imports.constants import CACHE_DIR
+from Modules.Utils.general_utils import get_default_logger
+from Modules.VGMDB import constants
+
+logger = get_default_logger(__name__, "info")
+
+
+class CachedResponse(BaseModel):
+    data: dict[str, Any]
+    stored_at: float  # when the response was fetched or last revalidated
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl_seconds: float, now: float) -> bool:
+        return now - self.stored_at < ttl_seconds
+
+
+class HttpCache:
+    """
+    on-disk cache of vgmdb api responses shared between runs, keyed on the normalized url
+    entries older than the ttl of their endpoint are revalidated (or fetched again) by the client, the least recently used entries are evicted beyond max_bytes
+    """
+
+    def __init__(self, cache_file_path: Optional[str] = None, max_bytes: int = constants.HTTP_CACHE_MAX_MB * 1024 * 1024, clock: Callable[[], float] = time.time):
+        self.cache_file_path = cache_file_path if cache_file_path else os.path.join(CACHE_DIR, constants.HTTP_CACHE_FILE_NAME)
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file_path)), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.cache_file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != constants.HTTP_CACHE_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS responses")
+            self.connection.execute(f"PRAGMA user_version = {constants.HTTP_CACHE_VERSION}")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self.connection.commit()
+        self.hits, self.revalidations, self.misses = 0, 0, 0
+
+    def get(self, key: str, ttl_seconds: float) -> tuple[Optional[CachedResponse], bool]:
+        """returns the cached response (if any) and whether it is still fresh, stale responses are kept for revalidation"""
+        now = self.clock()
+        with self.lock:
+            row = self.connection.execute("SELECT body, stored_at, etag, last_modified FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self.connection.commit()  # cheap with WAL, and leaves the database free for other runs
+        if not row:
+            self.misses += 1
+            return None, False
+        cached_response = CachedResponse(data=json.loads(row[0]), stored_at=row[1], etag=row[2], last_modified=row[3])
+        fresh = cached_response.is_fresh(ttl_seconds, now)
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return cached_response, fresh
+
+    def put(self, key: str, data: dict[str, Any], etag: Optional[str] = None, last_modified: Optional[str] = None):
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        now = self.clock()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, stored_at, accessed_at, etag, last_modified) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, len(body.encode()), now, now, etag, last_modified),
+            )
+            self._evict()
+            self.connection.commit()
+
+    def refresh(self, key: str):
+        """the server confirmed (with a 304) that the cached response is still current"""
+        self.revalidations += 1
+        with self.lock:
+            self.connection.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (self.clock(), key))
+            self.connection.commit()
+
+    def get_size(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+    # private functions
+    def _evict(self):
+        """removes the least recently used responses until the cache fits in max_bytes"""
+        excess = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        evicted: list[tuple[str]] = []
+        for key, size in self.connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        self.connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug(f"evicted {len(evicted)} responses from the http cache")
+
+
+def normalize_url(url: str, base_url: str) -> str:
+    """
+    the cache key of url: relative to base_url (so that the local server and vgmdb.info share responses), with sorted query parameters and collapsed whitespace
+    'https://vgmdb.info/search?q=Rewrite  OST' -> 'search?q=Rewrite+OST'
+    """
+    if url.startswith(base_url):
+        url = url[len(base_url) :]
+    parts = urlsplit(url)
+    path = parts.path.strip("/") if not parts.netloc else f"{parts.netloc.lower()}/{parts.path.strip('/')}"
+    query = sorted((name, " ".join(value.split())) for name, value in parse_qsl(parts.query, keep_blank_values=True))
+    return f"{path}?{urlencode(query)}" if query else path
@@ -0,0 +1,92 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Optional
+
+from Modules.Utils.general_utils import get_default_logger
+from Modules.VGMDB import constants
+from Modules.VGMDB.api.client import VgmdbClient
+
+logger = get_default_logger(__name__, "info")
+
+
+class Prefetcher:
+    """
+    fetches the search results, album details and cover of the albums coming up next, while the user is busy with the current album
+    everything lands in the caches of the client (and the cover in the album), where the usual calls of the cli find it, or join it while it is still in flight
+    prefetched albums hold at most max_bytes until they are released, albums beyond it only get their search results prefetched
+    albums are told apart by album_key, which must differ for albums sharing a folder
+    the client keeps its caches within the same max_bytes, so released albums are dropped from memory again as the next ones come in
+    """
+
+    def __init__(self, vgmdb_client: VgmdbClient, max_bytes: int):
+        self.vgmdb_client = vgmdb_client
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.prefetches: dict[str, concurrent.futures.Future[None]] = {}
+        self.held_bytes: dict[str, int] = {}  # per album, until it is released
+        self.albums_prefetched, self.albums_skipped = 0, 0
+
+    def prefetch(self, album_key: str, search_term: Optional[str], album_id: Optional[str] = None, year: Optional[str] = None):
+        """
+        finds the album id (album_id if known, otherwise the only result of searching for search_term released in year) and fetches that album with its cover
+        returns immediately, the work runs on the event loop of the client
+        """
+        with self.lock:
+            if album_key in self.prefetches:
+                return
+            self.prefetches[album_key] = self.vgmdb_client.submit(self._prefetch(album_key, search_term, album_id, year))
+
+    def release(self, album_key: str):
+        """the album is being worked on, whatever it prefetched stops counting against max_bytes (a prefetch still running is left to finish, the cli joins it)"""
+        with self.lock:
+            self.prefetches.pop(album_key, None)
+            self.held_bytes.pop(album_key, None)
+
+    def cancel(self, album_key: str):
+        with self.lock:
+            prefetch = self.prefetches.pop(album_key, None)
+            self.held_bytes.pop(album_key, None)
+        if prefetch:
+            prefetch.cancel()
+
+    def close(self):
+        """cancels every prefetch still running"""
+        for album_key in list(self.prefetches):
+            self.cancel(album_key)
+
+    def get_held_bytes(self) -> int:
+        with self.lock:
+            return sum(self.held_bytes.values())
+
+    # private functions
+    async def _prefetch(self, album_key: str, search_term: Optional[str], album_id: Optional[str], year: Optional[str]):
+        async_client = self.vgmdb_client.async_client
+        try:
+            if not album_id and search_term:
+                search_results = [result for result in await async_client.search_album(search_term) if not year or result.release_year == year]
+                album_id = search_results[0].album_id if len(search_results) == 1 else None
+            if not album_id or not self._hold(album_key, constants.PREFETCH_ALBUM_SIZE_ESTIMATE):
+                self.albums_skipped += 1
+                return
+            vgmdb_album_data = await async_client.get_album_details(album_id)
+            album_cover_data = await asyncio.to_thread(vgmdb_album_data.get_album_cover_data)  # joins the download started along with the album
+            self._hold(album_key, len(album_cover_data or b""), replace=True)
+            self.albums_prefetched += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"unable to prefetch {album_key}, error: {type(e).__name__} -> {e}")
+
+    def _hold(self, album_key: str, size: int, replace: bool = False) -> bool:
+        """accounts size bytes to the album while it is not released, returns False if that does not fit in max_bytes"""
+        with self.lock:
+            if album_key not in self.prefetches:
+                return True  # released already, the album is being worked on
+            if replace:
+                self.held_bytes[album_key] = size
+                return True
+            if sum(self.held_bytes.values()) + size > self.max_bytes:
+                return False
+            self.held_bytes[album_key] = size
+            return True
@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urljoin
+
+import httpx
+
+from Modules.Utils.rate_limiter import get_rate_limiter
+from Modules.VGMDB import constants
+
+
+class VgmdbServerException(Exception):
+    """the server failed the request (an error, a 5xx or a 429), another server or a later retry may not"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class LatencyHistogram:
+    """counts of latencies in buckets bounded by bounds (in seconds), the last bucket takes everything beyond them"""
+
+    def __init__(self, bounds: list[float] = constants.LATENCY_HISTOGRAM_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+
+    def percentile(self, fraction: float) -> float:
+        """upper bound of the bucket holding the fraction (0 to 1) of the latencies, 0 when nothing was recorded"""
+        if not self.total:
+            return 0
+        target = max(1, fraction * self.total)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+
+class CircuitBreaker:
+    """
+    skips a server after failure_threshold consecutive failures
+    once reset_seconds passed, a single request is let through to try it again: a success closes the breaker, a failure opens it for another reset_seconds
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half open"
+
+    def __init__(self, failure_threshold: int = constants.CIRCUIT_BREAKER_FAILURE_THRESHOLD, reset_seconds: float = constants.CIRCUIT_BREAKER_RESET_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold, self.reset_seconds, self.clock = failure_threshold, reset_seconds, clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN  # this caller makes the trial request
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state, self.consecutive_failures = self.CLOSED, 0
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state, self.opened_at = self.OPEN, self.clock()
+
+    def abandon_trial(self):
+        """the trial request was cancelled before it told anything about the server, another one is let through after reset_seconds"""
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.state, self.opened_at = self.OPEN, self.clock()
+
+
+class Endpoint:
+    def __init__(self, base_url: str, circuit_breaker: CircuitBreaker):
+        self.base_url = base_url
+        self.circuit_breaker = circuit_breaker
+        self.latency_histogram = LatencyHistogram()
+        self.requests, self.failures, self.hedges_won = 0, 0, 0
+
+
+class HedgedTransport:
+    """
+    sends requests to the first server in base_urls whose circuit breaker allows it
+    when it fails the request goes to the next server at once, and when it is slower than hedge_percentile of its own latencies the request is also sent to the next server, the first response wins
+    must be used from a single event loop
+    """
+
+    def __init__(
+        self,
+        base_urls: list[str],
+        max_connections: int = constants.MAX_CONCURRENT_REQUESTS,
+        hedge: bool = True,
+        hedge_percentile: float = constants.HEDGE_LATENCY_PERCENTILE,
+        default_hedge_delay: float = constants.HEDGE_DEFAULT_DELAY_SECONDS,
+        failure_threshold: int = constants.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = constants.CIRCUIT_BREAKER_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoints = [Endpoint(base_url, CircuitBreaker(failure_threshold, reset_seconds, clock)) for base_url in dict.fromkeys(base_urls)]
+        self.max_connections = max(1, max_connections)
+        self.hedge, self.hedge_percentile, self.default_hedge_delay = hedge, hedge_percentile, default_hedge_delay
+        self.clock = clock
+        self.hedges_sent = 0
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def get_path(self, url: str) -> str:
+        """url relative to the server it was built for, so that any server can answer it"""
+        for endpoint in self.endpoints:
+            if url.startswith(endpoint.base_url):
+                return url[len(endpoint.base_url) :]
+        return url
+
+    async def get(self, path: str, headers: dict[str, str]) -> httpx.Response:
+        """raises VgmdbServerException when every allowed server failed, or when every circuit breaker is open"""
+        remaining = list(self.endpoints)
+        pending: dict[asyncio.Task[httpx.Response], Endpoint] = {}
+        hedged_by: list[Endpoint] = []
+        found_exception: Exception = VgmdbServerException(f"every vgmdb api server failed recently, not requesting {path}")
+
+        def send_to_next() -> Optional[Endpoint]:
+            while remaining:
+                endpoint = remaining.pop(0)
+                if endpoint.circuit_breaker.allow():  # only asked right before sending, as it lets a single trial request through
+                    pending[asyncio.ensure_future(self._send(endpoint, path, headers))] = endpoint
+                    return endpoint
+            return None
+
+        send_to_next()
+        try:
+            while pending:
+                hedge_delay = self._get_hedge_delay(next(iter(pending.values()))) if self.hedge and remaining else None
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge = send_to_next()
+                    if hedge:
+                        self.hedges_sent += 1
+                        hedged_by.append(hedge)
+                    continue
+                for task in done:
+                    endpoint = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        found_exception = e
+                        continue
+                    if endpoint in hedged_by:
+                        endpoint.hedges_won += 1
+                    return response
+                if not pending:
+                    send_to_next()  # every request sent so far failed
+            raise found_exception
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def summary(self) -> list[str]:
+        """a line per server"""
+        lines = []
+        for endpoint in self.endpoints:
+            histogram = endpoint.latency_histogram
+            latencies = ", ".join(f"p{int(fraction * 100)} {histogram.percentile(fraction) * 1000:.0f} ms" for fraction in (0.5, 0.9, 0.99))
+            lines.append(
+                f"{endpoint.base_url}: {endpoint.requests} requests ({latencies}), {endpoint.failures} failures, {endpoint.hedges_won} won as a hedge, circuit {endpoint.circuit_breaker.state}"
+            )
+        return lines
+
+    async def close(self):
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    # private functions
+    async def _send(self, endpoint: Endpoint, path: str, headers: dict[str, str]) -> httpx.Response:
+        url = urljoin(endpoint.base_url, path)
+        endpoint.requests += 1
+        start = self.clock()
+        try:
+            async with get_rate_limiter().limit_async(url):
+                response = await self._get_http_client().get(url, headers=headers)
+        except asyncio.CancelledError:  # another server answered first
+            endpoint.circuit_breaker.abandon_trial()
+            raise
+        except Exception as e:
+            self._failed(endpoint)
+            raise VgmdbServerException(f"could not get {url}: {e!r}") from e
+        if response.status_code >= 500 or response.status_code == 429:
+            self._failed(endpoint)
+            raise VgmdbServerException(f"{url} answered with {response.status_code}")
+        endpoint.latency_histogram.record(self.clock() - start)
+        endpoint.circuit_breaker.record_success()
+        return response
+
+    def _failed(self, endpoint: Endpoint):
+        endpoint.failures += 1
+        endpoint.circuit_breaker.record_failure()
+
+    def _get_hedge_delay(self, endpoint: Endpoint) -> float:
+        if endpoint.latency_histogram.total < constants.HEDGE_MIN_SAMPLES:
+            return self.default_hedge_delay
+        return max(constants.HEDGE_MIN_DELAY_SECONDS, endpoint.latency_histogram.percentile(self.hedge_percentile))
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if not self._http_client:
+            limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            self._http_client = httpx.AsyncClient(limits=limits, timeout=constants.REQUEST_TIMEOUT_SECONDS, follow_redirects=True)
+        return self._http_client
@@ -13,3 +13,29 @@ VGMDB_INFO_LOCAL_RUN_TYPE: LOCAL_DOCKER_RUN_TYPES = "docker-compose"  # recommen
 VGMDB_INFO_DOCKER_COMPOSER_BASE_URL = "http://localhost:5020/"  # The docker compose version is fixed to run on 5020 port
 
 VGMDB_OFFICIAL_BASE_URL = "https://vgmdb.net"
+
+HTTP_CACHE_FILE_NAME = "vgmdb_responses.sqlite"  # inside CACHE_DIR
+HTTP_CACHE_VERSION = 1  # bump when the stored responses change shape, every response is fetched again
+HTTP_CACHE_MAX_MB = 128
+ALBUM_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # released albums rarely change on vgmdb
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60  # new albums show up in searches
+
+MAX_CONCURRENT_REQUESTS = 8  # requests in flight at once, over as many kept alive connections
+REQUEST_TIMEOUT_SECONDS = 30
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+}
+
+PREFETCH_ALBUM_SIZE_ESTIMATE = 512 * 1024  # memory held by a prefetched album (details and cover) until its cover is downloaded
+MEMORY_CACHE_MAX_MB = 64  # albums (with their covers) and search results kept in memory by the client, least recently used ones are dropped beyond it
+ALBUM_DETAILS_SIZE_ESTIMATE = 64 * 1024  # memory held by the details of an album, apart from its cover
+SEARCH_RESULT_SIZE_ESTIMATE = 1024  # per album found by a search
+
+HEDGE_LATENCY_PERCENTILE = 0.9  # a request is sent to the next server too once the first one takes longer than this percentile of its latencies
+HEDGE_MIN_SAMPLES = 5  # latencies of a server needed before its percentile is trusted
+HEDGE_DEFAULT_DELAY_SECONDS = 2.0  # until then
+HEDGE_MIN_DELAY_SECONDS = 0.05
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures after which a server is skipped
+CIRCUIT_BREAKER_RESET_SECONDS = 30  # after which a single request tries the server again
+LATENCY_HISTOGRAM_BOUNDS = [0.01 * 2**index for index in range(14)]  # upper bounds (in seconds) of the buckets, 10 ms to 82 s
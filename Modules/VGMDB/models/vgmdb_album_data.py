@@ -1,7 +1,7 @@
 import os
 import threading
 from typing import Any, get_args
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator
 
 from Imports.constants import LANGUAGES
 from Modules.Print.constants import LINE_SEPARATOR, SUB_LINE_SEPARATOR
@@ -79,6 +79,7 @@ class Cover(BaseModel):
 
 
 class VgmdbTrackData(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)  # LocalTrackData is a plain slotted class
     names: Names
     track_length: str | None = None
     local_track: LocalTrackData | None = None  # custom data to be used during tagging
@@ -118,6 +119,7 @@ class ReleasePrice(BaseModel):
 
 
 class VgmdbAlbumData(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)  # LocalAlbumData and LocalTrackData are plain slotted classes
     # data received from vgmdb.info
     link: str
     name: str
@@ -157,6 +159,7 @@ class VgmdbAlbumData(BaseModel):
     local_album_data: LocalAlbumData | None = None
     unmatched_local_tracks: list[LocalTrackData] = []
     album_cover_cache: bytes | None = None
+    _album_cover_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     @property
     def total_discs(self):
@@ -169,7 +172,7 @@ class VgmdbAlbumData(BaseModel):
     def model_post_init(self, _) -> None:
         """
         Fetching the album cover data post init using a side thread to reduce runtime later
-        We don't have to use mutex for locking the function because the fetched value is always the same
+        Other callers (the tagger, the prefetcher) wait for this download instead of downloading the cover again
         """
         thread = threading.Thread(target=self.get_album_cover_data)
         thread.start()
@@ -222,10 +225,11 @@ class VgmdbAlbumData(BaseModel):
     def get_album_cover_data(self) -> bytes | None:
         if not self.picture_full:
             return None
-        if self.album_cover_cache:
+        with self._album_cover_lock:
+            if self.album_cover_cache:
+                return self.album_cover_cache
+            self.album_cover_cache = compress_image_limit_max_width(get_raw_data_from_url(self.picture_full))
             return self.album_cover_cache
-        self.album_cover_cache = compress_image_limit_max_width(get_raw_data_from_url(self.picture_full))
-        return self.album_cover_cache
 
     def download_scans(self, output_dir: str, no_auth: bool = False):
         if no_auth:
@@ -3,22 +3,36 @@ import shutil
 import traceback
 import questionary
 import concurrent.futures
-from typing import Any, Callable
+from collections import deque
+from typing import Any, Callable, Iterator
 
 from Imports.config import Config
 from Imports.constants import THREAD_EXECUTOR_NUM_THREADS
-from unigen import IAudioManager
+from Modules.Journal.journal import Journal, get_album_key
+from Modules.Journal.models.journal_entry import AlbumJournalState
+from Modules.Journal.constants import JOURNAL_STAGES
 from Modules.Organize.organizer import Organizer
 from Modules.Organize.models.organize_result import FolderOrganizeResult
+from Modules.Plan.models.album_plan import AlbumPlan, FileTagPlan
+from Modules.Plan.plan_applier import PlanApplier
+from Modules.Plan.plan_file import PlanWriter, read_plan
 from Modules.Print import table
 from Modules.Print.utils import get_panel, get_rich_console, print_separator
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
 from Modules.Scan.scanner import Scanner
+from Modules.Scan.scan_index import ScanIndex
+from Modules.Scan.scan_snapshot import ScanSnapshotWriter, read_scan_snapshot
 from Modules.Scan.models.local_album_data import LocalAlbumData
-from Modules.Tag import custom_tags
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Tag.models.tag_result import FileTagResult
 from Modules.Tag.tagger import Tagger
 from Modules.Translate.translator import Translator
 from Modules.Utils.general_utils import get_default_logger, ifNot, to_sentence_case, extractYearFromDate
+from Modules.Utils.io_governor import get_io_governor
+from Modules.Utils.rate_limiter import get_rate_limiter
 from Modules.VGMDB.api.client import VgmdbClient
+from Modules.VGMDB.api.http_cache import HttpCache
+from Modules.VGMDB.api.prefetcher import Prefetcher
 from Modules.VGMDB.models.vgmdb_album_data import Names, VgmdbAlbumData
 from Modules.VGMDB.user_interface import constants
 from Modules.VGMDB.constants import VGMDB_OFFICIAL_BASE_URL
@@ -29,47 +43,106 @@ logger = get_default_logger(__name__, "info")
 class CLI:
     def __init__(self, config: Config):
         self.root_config = config
-        self.scanner = Scanner()
+        get_audio_manager_pool().configure(config.max_open_files, config.max_open_files_mb * 1024 * 1024)
+        get_io_governor().configure(config.max_write_mb_per_second * 1024 * 1024, config.max_write_operations_per_second)
+        get_rate_limiter().configure(config.max_requests_per_second, config.request_burst)
+        self.scanner = Scanner(scan_index=ScanIndex() if config.scan_index else None, scan_workers=config.scan_workers, scan_pool_type=config.scan_pool_type)
         self.translator = Translator()
-        if config.tag:
-            self.vgmdb_client = VgmdbClient()
+        if config.tag and not config.apply_plan:
+            http_cache = HttpCache(max_bytes=config.http_cache_mb * 1024 * 1024) if config.http_cache else None
+            self.vgmdb_client = VgmdbClient(
+                http_cache=http_cache,
+                max_concurrent_requests=config.max_concurrent_requests,
+                fallback_base_urls=config.fallback_api_urls,
+                hedge=config.hedge_requests,
+                max_cache_bytes=config.prefetch_memory_mb * 1024 * 1024,
+            )
+        prefetch = config.tag and not config.apply_plan and not config.scan_only and config.prefetch_albums > 0
+        self.prefetcher = Prefetcher(self.vgmdb_client, max_bytes=config.prefetch_memory_mb * 1024 * 1024) if prefetch else None
+        self.plan_writer = PlanWriter(config.plan) if config.plan and not config.apply_plan else None
+        self.album_plan: AlbumPlan | None = None  # the album being planned
+        if self.plan_writer:
+            get_audio_manager_pool().evict_modified = False  # planned tags stay in memory (for organizing) until the album is planned
+        # plan runs write nothing, so they have nothing to journal
+        self.journal = Journal(config.root_dir, resume=config.resume) if config.journal and not config.scan_only and not config.apply_plan and not config.plan else None
+        self.album_state: AlbumJournalState | None = None  # what the previous run got done for the album being worked on, when resuming
         self.console = get_rich_console()
         self.colors = {"red": "#f3aba8", "green": "#d3f5b3"}
         self.no_change = ""
         self.not_available = "(Not Available)"
 
     def run(self):
-        albums = self._scan_for_proper_albums(self.root_config.root_dir, self.root_config.recur)
-        self.console.log(f"Found {len(albums)} Albums")
-        print_separator()
-        for album in albums:
-            self.console.print(f"[bright_magenta bold]Operating on {album.album_folder_name}")
-            if self.root_config.backup:
-                self.console.print(get_panel(f"[bold green]Backing Up"))
-                self._backup_local_album(album)
+        try:
+            if self.root_config.apply_plan:
+                self._apply_plan()
+                return
+            albums = self._scan_for_proper_albums(self.root_config.root_dir, self.root_config.recur)
             print_separator()
-            try:
-                local_album_config = self.root_config.model_copy()
-                local_album_config.root_dir = album.album_folder_path
-                self.operate(album, local_album_config)
-                print_separator()
-                self.console.log(f"[green]Successfully Finished All Oprations on {album.album_folder_name}")
-                print_separator()
-            except Exception as e:
-                print_separator()
-                self.console.log(f"[bright_red bold]Error Occurred: {type(e).__name__} -> {e}, skipping {album.album_folder_path}")
-                traceback_info = traceback.format_exc()
-                logger.debug(traceback_info)
+            if self.root_config.scan_only:
+                self._save_scan(albums)
+                return
+            total_albums = 0
+            for album in self._look_ahead(albums):
+                total_albums += 1
+                if self.prefetcher:
+                    self.prefetcher.release(self._get_album_key(album))
+                self.album_state = self._get_previous_album_state(album)
+                if self.album_state and self.album_state.done:
+                    self.console.print(f"[bright_magenta]Skipping {album.album_folder_name}, it was finished by the previous run")
+                    continue
+                self.console.print(f"[bright_magenta bold]Operating on {album.album_folder_name}")
+                if self.root_config.backup:
+                    self.console.print(get_panel(f"[bold green]Backing Up"))
+                    self._backup_local_album(album)
                 print_separator()
-
-    def operate(self, local_album_data: LocalAlbumData, config: Config) -> None:
-        """Operate on the album (tag, download scans, organize,...)"""
+                try:
+                    local_album_config = self.root_config.model_copy()
+                    local_album_config.root_dir = album.album_folder_path
+                    if album.shares_album_folder:
+                        local_album_config.rename_folder = False
+                    self.album_plan = AlbumPlan(album_folder_path=album.album_folder_path) if self.plan_writer else None
+                    completed = self.operate(album, local_album_config)
+                    print_separator()
+                    if completed:
+                        self.console.log(f"[green]Successfully Finished All Oprations on {album.album_folder_name}")
+                        self._record(album, "done")
+                    else:
+                        self.console.log(f"[yellow]Not Every Operation Finished on {album.album_folder_name}, it is picked up again by --resume")
+                    print_separator()
+                except Exception as e:
+                    print_separator()
+                    self.console.log(f"[bright_red bold]Error Occurred: {type(e).__name__} -> {e}, skipping {album.album_folder_path}")
+                    traceback_info = traceback.format_exc()
+                    logger.debug(traceback_info)
+                    print_separator()
+                finally:
+                    self._finish_album_plan(album)
+                    if self.journal:
+                        self.journal.sync()
+            self.scanner.close()
+            if self.journal:
+                self.journal.close()
+            if self.plan_writer:
+                self.plan_writer.close()
+                self.console.log(f"[green]Planned {self.plan_writer.albums_written} Albums, apply the plan with --apply_plan {self.plan_writer.plan_path}")
+            self._show_scan_errors()
+            self._show_write_summary()
+            self._show_network_summary()
+            self.console.log(f"Found {total_albums} Albums")
+        finally:
+            self._close_vgmdb_connections()
+
+    def operate(self, local_album_data: LocalAlbumData, config: Config) -> bool:
+        """Operate on the album (tag, download scans, organize,...), returns whether every enabled operation finished"""
+        completed = True
         if config.tag:
             try:
                 tagged_properly = self.tag(local_album_data, config)
                 if not tagged_properly:
+                    completed = False
                     config.yes = False
             except Exception as e:
+                completed = False
                 config.yes = False
                 print_separator()
                 self.console.log(f"[bright_red bold]Error While Tagging: {type(e).__name__} -> {e}, not Tagging {local_album_data.album_folder_name}")
@@ -80,34 +153,52 @@ class CLI:
             try:
                 organized_properly = self.organize(local_album_data, config)
                 if not organized_properly:
+                    completed = False
                     config.yes = False
             except Exception as e:
+                completed = False
                 config.yes = False
                 print_separator()
                 self.console.log(f"[bright_red bold]Error While Organizing: {type(e).__name__} -> {e}, not Organizing {local_album_data.album_folder_name}")
                 print_separator()
+        return completed
 
     def tag(self, local_album_data: LocalAlbumData, config: Config) -> bool:
         self.console.print(get_panel("[bold green]Tagging Metadata"))
-        self.console.log(f"Fetching Album ID")
-        album_id = self._get_album_id(local_album_data, config)
+        album_state = self.album_state
+        if album_state and "saved" in album_state.stages:
+            self.console.log("[green]Already tagged by the previous run")
+            return True
+        if album_state and album_state.album_id:
+            self.console.log(f"Using Album ID From The Previous Run")
+            album_id = album_state.album_id
+        else:
+            self.console.log(f"Fetching Album ID")
+            album_id = self._get_album_id(local_album_data, config)
         if not album_id:
             raise Exception(f"Could Not Find Album ID For Folder: {local_album_data.album_folder_path}")
 
         self.console.log(f"Fetching Album Data With Album ID: {album_id}")
         vgmdb_album_data = self.vgmdb_client.get_album_details(album_id)
+        self._record(local_album_data, "fetched", album_id=album_id)
 
         logger.debug("linking local album data with vgmdb album data")
         vgmdb_album_data.link_local_album_data(local_album_data)
 
-        logger.debug("showing match and getting confirmation")
-        instruction = self._confirm_before_proceeding_to_tag(vgmdb_album_data, config)
+        if album_state and "confirmed" in album_state.stages:
+            logger.debug("confirmed in the previous run")
+            instruction = constants.choices.yes
+        else:
+            logger.debug("showing match and getting confirmation")
+            instruction = self._confirm_before_proceeding_to_tag(vgmdb_album_data, config)
         if instruction == constants.choices.no:
             logger.debug("tagging cancelled by user")
             return False
         if instruction == constants.choices.go_back:
             config.year_search = ""
+            self.album_state = None  # search again instead of using the album id of the previous run
             return self.tag(local_album_data, config)
+        self._record(local_album_data, "confirmed")
 
         if config.scans_download:
             print_separator()
@@ -115,14 +206,41 @@ class CLI:
             vgmdb_album_data.download_scans(local_album_data.album_folder_path, no_auth=self.root_config.no_auth)
             print_separator()
 
+        saved_files = {track.file_path for track in local_album_data.get_all_tracks() if album_state and album_state.is_file_saved(track.file_path)}
+        if saved_files:
+            self.console.log(f"Skipping {len(saved_files)} Files Saved By The Previous Run")
+        on_file_saved: Callable[[str], None] = lambda file_path: self._record(local_album_data, "saved", file_path=file_path)
+        tagger = Tagger(local_album_data, vgmdb_album_data, config, on_file_saved=on_file_saved, saved_files=saved_files)
+        if self.album_plan:
+            self.console.print("[bold green]Planning Tags")
+            tag_result = tagger.plan_files()
+            self.album_plan.vgmdb_link = vgmdb_album_data.vgmdb_link
+            self.album_plan.file_tag_plans = [self._get_file_tag_plan(result) for result in tag_result.file_tag_results if result.changes]
+            self.console.log(f"[green]Planned changes to {len(self.album_plan.file_tag_plans)} files, skipped {tag_result.files_skipped} unchanged files")
+            print_separator()
+            return True
+
         self.console.print("[bold green]Tagging Album")
-        Tagger(local_album_data, vgmdb_album_data, config).tag_files()
+        tagger.plan_files(defer_pictures=config.stream_pictures)
+        self._record(local_album_data, "tagged")
+        tag_result = tagger.save_files()
+        self.console.log(f"[green]Tagging finished, {tag_result.summary()}")
+        for failed_result in tag_result.failed_file_tag_results:
+            self.console.log(f"[red]Could not save {failed_result.file_path}: {failed_result.error}")
+        for corrupted_result in tag_result.corrupted_file_tag_results:
+            self.console.log(f"[bright_red bold]The audio of {corrupted_result.file_path} changed while saving, restore it from a backup")
         print_separator()
+        if tag_result.failed_file_tag_results or tag_result.corrupted_file_tag_results:
+            return False
+        self._record(local_album_data, "saved")
         return True
 
     def organize(self, local_album_data: LocalAlbumData, config: Config) -> bool:
         print_separator()
         self.console.print(get_panel("[bold green]Organizing"))
+        if self.album_state and "renamed" in self.album_state.stages:
+            self.console.log("[green]Already organized by the previous run")
+            return True
         organizer = Organizer(local_album_data, config)
         folder_organize_result = organizer.organize()
         instruction = self._confirm_before_proceeding_to_organize(folder_organize_result, config)
@@ -131,7 +249,16 @@ class CLI:
             return False
         elif instruction == constants.choices.edit_configs:
             return self.organize(local_album_data, config)
+        if self.album_plan:
+            self.album_plan.folder_organize_result = folder_organize_result
+            self.album_plan.rename_files, self.album_plan.rename_folder = config.rename_files, config.rename_folder
+            return True
         organizer.commit_changes(folder_organize_result)
+        folder_renamed = folder_organize_result.new_path != folder_organize_result.old_path and os.path.isdir(folder_organize_result.new_path)
+        new_path = folder_organize_result.new_path if folder_renamed else None
+        if local_album_data.shares_album_folder and config.rename_files:  # found under the new names of its files when resuming
+            new_path = self._get_album_key(local_album_data, [result.new_path or result.old_path for result in folder_organize_result.file_organize_results])
+        self._record(local_album_data, "renamed", new_path=new_path)
         return True
 
     # Private Functions
@@ -281,8 +408,8 @@ class CLI:
         for local_track in vgmdb_album_data.unmatched_local_tracks:
             table_data.append(
                 (
-                    ifNot(local_track.audio_manager.getDiscNumber(), constants.NULL_INT),
-                    ifNot(local_track.audio_manager.getTrackNumber(), constants.NULL_INT),
+                    ifNot(local_track.tags.disc_number, constants.NULL_INT),
+                    ifNot(local_track.tags.track_number, constants.NULL_INT),
                     "",
                     local_track.file_name,
                 )
@@ -305,8 +432,8 @@ class CLI:
         return is_perfect_match
 
     def _get_album_id(self, local_album_data: LocalAlbumData, config: Config) -> str | None:
-        audio_manager = local_album_data.get_one_sample_track().audio_manager
-        vgmdb_id = audio_manager.getCustomTag(custom_tags.VGMDB_ID)
+        tags = local_album_data.get_one_sample_track().tags
+        vgmdb_id = tags.vgmdb_id
         if vgmdb_id and vgmdb_id[0].isdigit():
             self.console.log("Found Album ID in Embedded Tag")
             use_embedded_id = questionary.confirm(f"Use Embedded Album ID ({VGMDB_OFFICIAL_BASE_URL}/album/{vgmdb_id[0]})?").skip_if(config.yes, default=constants.choices.yes.value).ask()
@@ -316,7 +443,7 @@ class CLI:
         # get search term
         search_reason = "provided search term"
         if not config.search:
-            config.search, search_reason = self._extract_search_term_from_audio_file(audio_manager)
+            config.search, search_reason = self._extract_search_term_from_tags(tags)
         if not config.search:
             config.search, search_reason = local_album_data.album_folder_name, "folder name"
         if not config.search:
@@ -325,7 +452,7 @@ class CLI:
 
         # get year for filtering search results
         if config.year_search is None:
-            config.year_search = extractYearFromDate(audio_manager.getDate())
+            config.year_search = extractYearFromDate(tags.date)
 
         # keep searching for album using interaction with the user
         album_id: str | None = None
@@ -398,22 +525,152 @@ class CLI:
                 config.year_search = ""
         return album_id
 
-    def _scan_for_proper_albums(self, root_dir: str, recur: bool) -> list[LocalAlbumData]:
-        if recur:
-            local_albums = self.scanner.scan_albums_recursively(root_dir)
+    def _scan_for_proper_albums(self, root_dir: str, recur: bool) -> Iterator[LocalAlbumData]:
+        """albums are yielded as soon as they are found, so that work can start before the scan finishes"""
+        if self.root_config.scan_snapshot and not self.root_config.scan_only:
+            self.console.log(f"Loading albums from scan snapshot {self.root_config.scan_snapshot}")
+            yield from read_scan_snapshot(self.root_config.scan_snapshot, root_dir)
+        elif recur:
+            yield from self.scanner.iter_albums_recursively(root_dir, queue_size=self.root_config.scan_queue_size)
         else:
-            local_album = self.scanner.scan_album_in_folder_if_exists(root_dir)
-            local_albums = [local_album] if local_album else []
-        return local_albums
-
-    def _extract_search_term_from_audio_file(self, audio_manager: IAudioManager) -> tuple[str | None, str | None]:
-        tag_functions: list[tuple[Callable[[], list[str]], str]] = [
-            (audio_manager.getCatalog, "catalog number"),
-            (audio_manager.getBarcode, "barcode"),
-            (audio_manager.getAlbum, "album name"),
+            yield from self.scanner.scan_albums_in_folder(root_dir)
+
+    def _look_ahead(self, albums: Iterator[LocalAlbumData]) -> Iterator[LocalAlbumData]:
+        """yields the albums once the next config.prefetch_albums albums are scanned, which are prefetched while the user works on the current album"""
+        if not self.prefetcher:
+            yield from albums
+            return
+        upcoming_albums: deque[LocalAlbumData] = deque()
+        for album in albums:
+            upcoming_albums.append(album)
+            self._prefetch(album)
+            if len(upcoming_albums) > self.root_config.prefetch_albums:
+                yield upcoming_albums.popleft()
+        while upcoming_albums:
+            yield upcoming_albums.popleft()
+
+    def _prefetch(self, local_album_data: LocalAlbumData):
+        """the same album id, search term and year which tagging the album starts with, unless it needs nothing from vgmdb"""
+        if not self.prefetcher:
+            return
+        album_state = self._get_previous_album_state(local_album_data)
+        if album_state and (album_state.done or "saved" in album_state.stages):
+            return
+        try:
+            tags = local_album_data.get_one_sample_track().tags
+        except IndexError:
+            return
+        album_id = album_state.album_id if album_state else None
+        if not album_id and tags.vgmdb_id and tags.vgmdb_id[0].isdigit():
+            album_id = tags.vgmdb_id[0]
+        search_term = self.root_config.search or self._extract_search_term_from_tags(tags)[0] or local_album_data.album_folder_name
+        year = self.root_config.year_search if self.root_config.year_search is not None else extractYearFromDate(tags.date)
+        self.prefetcher.prefetch(self._get_album_key(local_album_data), search_term, album_id=album_id, year=year)
+
+    def _record(self, local_album_data: LocalAlbumData, stage: JOURNAL_STAGES, file_path: str | None = None, album_id: str | None = None, new_path: str | None = None):
+        if self.journal:
+            self.journal.record(self._get_album_key(local_album_data), stage, file_path=file_path, album_id=album_id, new_path=new_path)
+
+    def _get_previous_album_state(self, local_album_data: LocalAlbumData) -> AlbumJournalState | None:
+        """what the previous run got done for the album, only when resuming"""
+        if not self.journal or not self.root_config.resume:
+            return None
+        return self.journal.get_album_state(self._get_album_key(local_album_data))
+
+    def _get_album_key(self, local_album_data: LocalAlbumData, file_paths: list[str] | None = None) -> str:
+        """identifies the album in the journal and the prefetcher, albums sharing a folder are told apart by their files"""
+        if not local_album_data.shares_album_folder:
+            return get_album_key(local_album_data.album_folder_path)
+        return get_album_key(local_album_data.album_folder_path, file_paths or [track.file_path for track in local_album_data.get_all_tracks()])
+
+    def _get_file_tag_plan(self, tag_result: FileTagResult) -> FileTagPlan:
+        stat = os.stat(tag_result.file_path)
+        return FileTagPlan(file_path=tag_result.file_path, size=stat.st_size, modification_time=stat.st_mtime_ns, changes=tag_result.changes)
+
+    def _finish_album_plan(self, local_album_data: LocalAlbumData):
+        """writes the plan of the album and forgets the planned tags, they are only written to the files when the plan is applied"""
+        if not self.plan_writer or not self.album_plan:
+            return
+        for track in local_album_data.get_all_tracks():
+            get_audio_manager_pool().discard(track.file_path, save=False)
+        if not self.album_plan.is_empty:
+            self.plan_writer.write(self.album_plan)
+            self.console.log(f"[green]Added {local_album_data.album_folder_name} to the plan")
+        self.album_plan = None
+
+    def _apply_plan(self):
+        """apply mode, tags and renames the planned albums under root_dir without fetching anything"""
+        plan_path, root_dir = str(self.root_config.apply_plan), os.path.abspath(self.root_config.root_dir)
+        self.console.log(f"Applying plan {plan_path} to the albums in {root_dir}")
+        album_plans = (album_plan for album_plan in read_plan(plan_path) if os.path.commonpath([root_dir, os.path.abspath(album_plan.album_folder_path)]) == root_dir)
+        total_albums = 0
+        for album_plan, tag_result in PlanApplier(self.root_config).apply(album_plans):
+            total_albums += 1
+            self.console.log(f"[green]Applied the plan of {album_plan.album_folder_path}, {tag_result.summary()}")
+            for failed_result in tag_result.failed_file_tag_results:
+                self.console.log(f"[red]Could not tag {failed_result.file_path}: {failed_result.error}")
+            for corrupted_result in tag_result.corrupted_file_tag_results:
+                self.console.log(f"[bright_red bold]The audio of {corrupted_result.file_path} changed while saving, restore it from a backup")
+        self._show_write_summary()
+        self.console.log(f"Applied the plan of {total_albums} Albums")
+
+    def _save_scan(self, albums: Iterator[LocalAlbumData]):
+        """scan only mode, lists the found albums and writes them to the scan snapshot if one is given"""
+        snapshot_path = self.root_config.scan_snapshot
+        writer = ScanSnapshotWriter(snapshot_path, self.root_config.root_dir) if snapshot_path else None
+        total_albums = 0
+        try:
+            for album in albums:
+                total_albums += 1
+                self.console.print(f"[bright_magenta]Found {album.album_folder_path} [white]({album.total_tracks_in_album} tracks)")
+                if writer:
+                    writer.write(album)
+        except BaseException:
+            if writer:
+                writer.close(discard=True)
+            raise
+        finally:
+            self.scanner.close()
+        if writer:
+            writer.close()
+            self.console.log(f"[green]Saved the scan to {snapshot_path}")
+        self._show_scan_errors()
+        self.console.log(f"Found {total_albums} Albums")
+
+    def _show_scan_errors(self):
+        if not self.scanner.scan_errors:
+            return
+        self.console.log(f"[bright_red bold]Could not read {len(self.scanner.scan_errors)} files while scanning:")
+        for error in self.scanner.scan_errors:
+            self.console.log(f"[red]{error.pprint()}")
+
+    def _show_write_summary(self):
+        io_governor = get_io_governor()
+        if io_governor.operations:
+            self.console.log(f"Disk writes: {io_governor.summary()}")
+
+    def _close_vgmdb_connections(self):
+        if self.prefetcher:
+            self.prefetcher.close()
+        vgmdb_client: VgmdbClient | None = getattr(self, "vgmdb_client", None)
+        if vgmdb_client:
+            vgmdb_client.close()
+
+    def _show_network_summary(self):
+        for host_summary in get_rate_limiter().summary():
+            self.console.log(f"Requests to {host_summary}")
+        vgmdb_client: VgmdbClient | None = getattr(self, "vgmdb_client", None)
+        if vgmdb_client and len(vgmdb_client.async_client.transport.endpoints) > 1:
+            for endpoint_summary in vgmdb_client.async_client.transport.summary():
+                self.console.log(f"VGMDB API server {endpoint_summary}")
+
+    def _extract_search_term_from_tags(self, tags: LocalTrackTags) -> tuple[str | None, str | None]:
+        tag_values: list[tuple[list[str], str]] = [
+            (tags.catalog, "catalog number"),
+            (tags.barcode, "barcode"),
+            (tags.album, "album name"),
         ]
-        for func, tag in tag_functions:
-            value = func()
+        for value, tag in tag_values:
             if value:
                 return value[0], tag
         return None, None
@@ -427,7 +684,7 @@ class CLI:
             if not os.path.exists(backup_folder):
                 os.makedirs(backup_folder)
 
-            shutil.copytree(album_folder, backup_album_folder, dirs_exist_ok=False)
+            shutil.copytree(album_folder, backup_album_folder, dirs_exist_ok=False, copy_function=get_io_governor().copy_file)
             self.console.print(f"[green]Successfully Backed up {album_folder} to {backup_album_folder}")
         except FileExistsError as e:
             self.console.log(f"[yellow]Backup Couldn't Be completed because folder already exists (most likely already backed up before)")
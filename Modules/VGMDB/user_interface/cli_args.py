@@ -6,6 +6,7 @@ from rich import get_console
 
 from Imports.config import Config, get_config
 from Modules.Organize.template import TemplateResolver, TemplateValidationException
+from Modules.Scan.constants import SCAN_POOL_TYPES
 
 
 class CLIArgs(Tap):
@@ -20,8 +21,36 @@ class CLIArgs(Tap):
     backup: bool = False  # Backup the albums before modifying
     backup_folder: str = "~/Music/Backups"  # folder to backup the albums to before modification
     no_auth: bool = False  # Do not authenticate for downloading Scans
+    max_concurrent_requests: int = 8  # Maximum number of requests to VGMDB in flight at once
+    max_requests_per_second: float = 4  # Maximum requests per second to each VGMDB host (API, covers, scans), 0 for no limit, local servers are not limited
+    request_burst: int = 8  # Requests a host may get at once before --max_requests_per_second applies
+    fallback_api_urls: list[str] = []  # More vgmdb.info compatible API servers, tried in order when the ones before them fail or are slow
+    no_hedge: bool = False  # Do not send a request to the next API server too when the first one is slower than usual
+    prefetch_albums: int = 2  # Search for and fetch the next albums while working on the current one (0 to turn off)
+    prefetch_memory_mb: int = 64  # Maximum memory (in MB) held by albums fetched from VGMDB (prefetched ones included) and their covers
+    no_http_cache: bool = False  # Do not keep VGMDB responses on disk, download albums and searches again every run
+    http_cache_mb: int = 128  # Maximum size (in MB) of VGMDB responses kept on disk
+    no_scan_index: bool = False  # Do not use the on-disk scan index, read tags of every file again
+    scan_workers: int = 1  # Number of workers reading tags concurrently while scanning, use more for network storage
+    scan_pool_type: SCAN_POOL_TYPES = "thread"  # Use threads (latency bound storage) or processes (cpu bound parsing) for reading tags
+    scan_queue_size: int = 0  # Keep scanning in the background, up to this many albums ahead of the album being worked on
+    max_open_files: int = 256  # Maximum number of audio files kept open at once
+    max_open_files_mb: int = 512  # Maximum estimated memory (in MB) used by audio files kept open at once
+    scan_only: bool = False  # Only scan for albums without tagging or organizing, the scan is saved to --scan_snapshot if given
+    scan_snapshot: str | None = None  # Scan snapshot file (.jsonl or .jsonl.gz), written with --scan_only, otherwise albums are loaded from it (relative to root_dir) instead of scanning
+    plan: str | None = None  # Search, confirm and fetch everything as usual, but write the tag changes and renames to this plan file (JSON-lines) instead of modifying the files
+    apply_plan: str | None = None  # Apply the tag changes and renames of a plan written with --plan to the albums under root_dir, without fetching anything
+    resume: bool = False  # Continue the previous run on root_dir, skipping the albums it finished and finishing the ones it left half done
+    no_journal: bool = False  # Do not keep a journal of the run, which --resume needs
 
     no_tag: bool = False  # Do not tag the files
+    save_workers: int = 4  # Number of files saved concurrently after tagging, use more for fast disk arrays and network storage
+    max_write_mb_per_second: float = 0  # Throttle the disk writes of saving, renaming and backing up to this many MB per second (0 for no limit)
+    max_write_operations_per_second: float = 0  # Throttle the number of disk writes (saved files, renames and copied MBs) per second (0 for no limit)
+    stream_pictures: bool = False  # Embed the cover while saving each file instead of keeping the files of an album open with their pictures, for albums with large embedded scans
+    picture_memory_mb: int = 256  # Maximum memory (in MB) taken by pictures of files being saved with --stream_pictures
+    no_verify: bool = False  # Do not check that the audio of saved files is unchanged
+    no_padding: bool = False  # Save files with the default padding of mutagen instead of reserving padding for tagging again in place
     no_rename: bool = False  # Do not rename or move anything
     no_modify: bool = False  # Do not tag or rename, for searching and testing
 
@@ -72,11 +101,23 @@ def get_config_from_args() -> Config:
 
     # if args["translate"]:
     #     config.keep_title = True # Choosing not to do this anymore
+    if args["no_hedge"]:
+        config.hedge_requests = False
+    if args["no_http_cache"]:
+        config.http_cache = False
+    if args["no_scan_index"]:
+        config.scan_index = False
+    if args["no_journal"]:
+        config.journal = False
     if args["no_modify"]:
         config.tag = False
         config.rename = False
     if args["no_tag"]:
         config.tag = False
+    if args["no_verify"]:
+        config.verify_audio = False
+    if args["no_padding"]:
+        config.reserve_padding = False
     if args["no_rename"]:
         config.rename = False
     if args["no_input"]:
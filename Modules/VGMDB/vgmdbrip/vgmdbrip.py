@@ -17,6 +17,7 @@ from Imports.constants import THREAD_EXECUTOR_NUM_THREADS
 from Modules.Print.utils import get_rich_console
 from Modules.Utils.general_utils import getSha256
 from Modules.Utils.network_utils import download_file
+from Modules.Utils.rate_limiter import get_rate_limiter
 
 session = requests.Session()
 
@@ -26,7 +27,9 @@ def Soup(data: Any):
 
 
 def is_logged_in(current_session: Any) -> bool:
-    x = current_session.get("https://vgmdb.net/forums/private.php")
+    url = "https://vgmdb.net/forums/private.php"
+    with get_rate_limiter().limit(url):
+        x = current_session.get(url)
     soup = Soup(x.content)
     login_element = soup.find("a", href="#", string="Login")
     return login_element is None
@@ -46,19 +49,20 @@ def login(config: str):
             username = input("VGMdb username:\t")
             password = getpass.getpass("VGMdb password:\t")
             base_url = "https://vgmdb.net/forums/"
-            x = session.post(
-                base_url + "login.php?do=login",
-                {
-                    "vb_login_username": username,
-                    "vb_login_password": password,
-                    "vb_login_md5password": hashlib.md5(password.encode()).hexdigest(),
-                    "vb_login_md5password_utf": hashlib.md5(password.encode()).hexdigest(),
-                    "cookieuser": 1,
-                    "do": "login",
-                    "s": "",
-                    "securitytoken": "guest",
-                },
-            )
+            with get_rate_limiter().limit(base_url):
+                x = session.post(
+                    base_url + "login.php?do=login",
+                    {
+                        "vb_login_username": username,
+                        "vb_login_password": password,
+                        "vb_login_md5password": hashlib.md5(password.encode()).hexdigest(),
+                        "vb_login_md5password_utf": hashlib.md5(password.encode()).hexdigest(),
+                        "cookieuser": 1,
+                        "do": "login",
+                        "s": "",
+                        "securitytoken": "guest",
+                    },
+                )
             table = Soup(x.content).find("table", class_="tborder", width="70%")
             panel = table.find("div", class_="panel")  # type: ignore
             message = panel.text.strip()  # type: ignore
@@ -94,7 +98,9 @@ def downloadScans(outputDir: str, albumID: str):
     config = os.path.join(scriptdir, "vgmdbrip.pkl")
     login(config)
     with console.status("[bold magenta]Authenticating and Fetching Scans") as status:
-        soup = Soup(session.get("https://vgmdb.net/album/" + albumID).content)
+        album_url = "https://vgmdb.net/album/" + albumID
+        with get_rate_limiter().limit(album_url):
+            soup = Soup(session.get(album_url).content)
         gallery = soup.find("div", attrs={"class": "covertab", "id": "cover_gallery"})
 
         if not isinstance(gallery, Tag):
@@ -0,0 +1,160 @@
+"""
+hash of the audio data of a file, leaving out everything tagging may rewrite (tags, pictures, padding, page numbering), so that it is the same before and after tagging
+only the regions holding audio are read (and hashed while being read), never the metadata in between
+"""
+import hashlib
+import os
+import struct
+from typing import BinaryIO, Callable, Optional
+
+from Modules.Verify import constants
+
+
+def hash_audio_data(file_path: str) -> Optional[str]:
+    """returns the hex digest of the audio data of the file, None if its format is not handled (or the file is not laid out as expected)"""
+    _, extension = os.path.splitext(file_path)
+    hasher = AUDIO_HASHERS.get(extension.lower())
+    if not hasher:
+        return None
+    audio_hash = hashlib.new(constants.AUDIO_HASH_ALGORITHM)
+    with open(file_path, "rb") as file:
+        if not hasher(file, audio_hash):
+            return None
+    return audio_hash.hexdigest()
+
+
+# private functions
+def _hash_flac(file: BinaryIO, audio_hash: "hashlib._Hash") -> bool:
+    """the STREAMINFO block (which holds the MD5 of the decoded audio) and the audio frames after the last metadata block"""
+    _skip_id3v2(file)
+    if file.read(4) != b"fLaC":
+        return False
+    while True:
+        header = file.read(4)
+        if len(header) != 4:
+            return False
+        is_last_block, block_type, block_length = header[0] & 0x80, header[0] & 0x7F, int.from_bytes(header[1:4], "big")
+        if block_type == 0:  # STREAMINFO
+            audio_hash.update(file.read(block_length))
+        else:
+            file.seek(block_length, os.SEEK_CUR)
+        if is_last_block:
+            break
+    _hash_range(file, file.tell(), os.fstat(file.fileno()).st_size, audio_hash)
+    return True
+
+
+def _hash_mp3(file: BinaryIO, audio_hash: "hashlib._Hash") -> bool:
+    """everything between the ID3v2 tag at the start and the ID3v1 tag at the end"""
+    _skip_id3v2(file)
+    start, end = file.tell(), os.fstat(file.fileno()).st_size
+    if end - start >= 128:
+        file.seek(end - 128)
+        if file.read(3) == b"TAG":
+            end -= 128
+    _hash_range(file, start, end, audio_hash)
+    return True
+
+
+def _hash_mp4(file: BinaryIO, audio_hash: "hashlib._Hash") -> bool:
+    """the payload of every top level mdat atom, the tags are in moov (whose chunk offsets change when the tags grow)"""
+    position, end = 0, os.fstat(file.fileno()).st_size
+    found_mdat = False
+    while position + 8 <= end:
+        file.seek(position)
+        size, name = struct.unpack(">I4s", file.read(8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", file.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size or position + size > end:
+            return False
+        if name == b"mdat":
+            _hash_range(file, position + header_size, position + size, audio_hash)
+            found_mdat = True
+        position += size
+    return found_mdat
+
+
+def _hash_ogg(file: BinaryIO, audio_hash: "hashlib._Hash") -> bool:
+    """
+    the bodies of the pages after the header packets (the comment header holds the tags), which start on a fresh page as required by vorbis and opus
+    page headers are left out, pages after the tags are renumbered (and their checksum updated) when the tags take up a different number of pages
+    """
+    header_packets: Optional[int] = None
+    completed_packets = 0
+    while True:
+        page_header = file.read(27)
+        if not page_header:
+            return header_packets is not None and completed_packets >= header_packets
+        if len(page_header) != 27 or page_header[:4] != b"OggS":
+            return False
+        lacing_values = file.read(page_header[26])
+        body_size = sum(lacing_values)
+        if header_packets is None:
+            first_packet = file.read(body_size)
+            header_packets = next((packets for start, packets in constants.OGG_HEADER_PACKETS.items() if first_packet.startswith(start)), None)
+            if header_packets is None:
+                return False
+            completed_packets = sum(1 for value in lacing_values if value < 255)
+        elif completed_packets < header_packets:
+            completed_packets += sum(1 for value in lacing_values if value < 255)
+            file.seek(body_size, os.SEEK_CUR)
+        else:
+            audio_hash.update(file.read(body_size))  # pages hold at most 64 KB
+
+
+def _hash_wav(file: BinaryIO, audio_hash: "hashlib._Hash") -> bool:
+    """the fmt and data chunks, tags are stored in other (id3 or LIST) chunks"""
+    riff_header = file.read(12)
+    if len(riff_header) != 12 or riff_header[:4] != b"RIFF" or riff_header[8:] != b"WAVE":
+        return False
+    position, end = 12, os.fstat(file.fileno()).st_size
+    found_data = False
+    while position + 8 <= end:
+        file.seek(position)
+        name, size = struct.unpack("<4sI", file.read(8))
+        if name in (b"fmt ", b"data"):
+            _hash_range(file, position + 8, min(position + 8 + size, end), audio_hash)
+            found_data = found_data or name == b"data"
+        position += 8 + size + (size & 1)  # chunks are padded to an even size
+    return found_data
+
+
+def _skip_id3v2(file: BinaryIO):
+    """moves past an ID3v2 tag at the current position, if there is one"""
+    start = file.tell()
+    header = file.read(10)
+    if len(header) == 10 and header[:3] == b"ID3":
+        size = (header[6] & 0x7F) << 21 | (header[7] & 0x7F) << 14 | (header[8] & 0x7F) << 7 | (header[9] & 0x7F)
+        footer_size = 10 if header[5] & 0x10 else 0
+        file.seek(start + 10 + size + footer_size)
+    else:
+        file.seek(start)
+
+
+def _hash_range(file: BinaryIO, start: int, end: int, audio_hash: "hashlib._Hash"):
+    """streams the bytes between start and end into audio_hash, reusing a single buffer"""
+    file.seek(start)
+    buffer = bytearray(constants.AUDIO_HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    remaining = end - start
+    while remaining > 0:
+        read = file.readinto(view[: min(remaining, len(buffer))])  # type: ignore
+        if not read:
+            break
+        audio_hash.update(view[:read])
+        remaining -= read
+
+
+AUDIO_HASHERS: dict[str, Callable[[BinaryIO, "hashlib._Hash"], bool]] = {
+    ".flac": _hash_flac,
+    ".mp3": _hash_mp3,
+    ".m4a": _hash_mp4,
+    ".mp4": _hash_mp4,
+    ".ogg": _hash_ogg,
+    ".opus": _hash_ogg,
+    ".wav": _hash_wav,
+}
@@ -0,0 +1,65 @@
+import concurrent.futures
+import multiprocessing
+import threading
+from typing import Optional
+
+from Modules.Utils.general_utils import get_default_logger
+from Modules.Verify.audio_hash import hash_audio_data
+
+logger = get_default_logger(__name__, "info")
+
+
+class AudioVerifier:
+    """
+    checks that saving a file left its audio untouched, by hashing the audio data (see audio_hash) before and after the save
+    hashing runs in a process pool using every core, so that verifying keeps up with saving
+    the workers are spawned rather than forked, as the process already runs threads (scanning, the vgmdb client, prefetching) by the time files are saved
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str) -> concurrent.futures.Future[Optional[str]]:
+        """starts hashing the audio data of file_path in the background"""
+        with self._lock:
+            if not self._executor:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor.submit(hash_audio_data, file_path)
+
+    def compare(self, file_path: str, hash_before: concurrent.futures.Future[Optional[str]], hash_after: concurrent.futures.Future[Optional[str]]) -> Optional[bool]:
+        """
+        True if the audio data is the same, False if it changed (or can not be read anymore), None if it could not be hashed before saving
+        """
+        try:
+            before = hash_before.result()
+        except Exception as e:
+            logger.debug(f"unable to hash the audio of {file_path} before saving, error: {e}")
+            return None
+        if before is None:
+            return None
+        try:
+            return hash_after.result() == before
+        except Exception as e:
+            logger.error(f"unable to hash the audio of {file_path} after saving, error: {e}")
+            return False
+
+    def close(self):
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_audio_verifier: Optional[AudioVerifier] = None
+_audio_verifier_lock = threading.Lock()
+
+
+def get_audio_verifier() -> AudioVerifier:
+    """maintain a single verifier (and process pool) throughout the process"""
+    global _audio_verifier
+    with _audio_verifier_lock:
+        if not _audio_verifier:
+            _audio_verifier = AudioVerifier()
+        return _audio_verifier
@@ -0,0 +1,4 @@
+AUDIO_HASH_ALGORITHM = "sha1"  # the fastest of hashlib on cpus with sha extensions, this guards against accidents, not attacks
+AUDIO_HASH_CHUNK_SIZE = 1024 * 1024  # audio data is hashed while being read, a chunk at a time
+
+OGG_HEADER_PACKETS = {b"\x01vorbis": 3, b"OpusHead": 2}  # the header packets of a stream, identified by the start of its first packet
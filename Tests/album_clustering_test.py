@@ -0,0 +1,50 @@
+import unittest
+from typing import Any
+
+from Modules.Scan.album_clustering import are_clusters_side_by_side, cluster_tracks, get_album_keys
+from Modules.Scan.models.local_album_data import LocalTrackData
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+
+
+def make_track(name: str, depth: int = 1, **tags: Any) -> LocalTrackData:
+    return LocalTrackData(file_path=f"/music/{name}", depth_in_parent_folder=depth, tags=LocalTrackTags(**tags))
+
+
+class TestAlbumClustering(unittest.TestCase):
+    def test_only_full_dates_are_keys(self):
+        self.assertEqual(get_album_keys(LocalTrackTags(date="2014-05-13")), [("date", "2014-05-13")])
+        self.assertEqual(get_album_keys(LocalTrackTags(date="2014-05")), [])
+
+    def test_single_album(self):
+        tracks = [make_track(f"{i}.flac", album=["Album"], catalog=["CAT-001"]) for i in range(5)]
+        clusters = cluster_tracks(tracks)
+        self.assertEqual(clusters, [tracks])
+
+    def test_mixed_folder_is_split(self):
+        first = [make_track(f"a{i}.flac", album=["First"]) for i in range(3)]
+        second = [make_track(f"b{i}.flac", catalog=["CAT-002"]) for i in range(3)]
+        clusters = cluster_tracks([first[0], second[0], first[1], second[1], first[2], second[2]])
+        self.assertEqual(clusters, [first, second])
+        self.assertTrue(are_clusters_side_by_side(clusters))  # type: ignore
+
+    def test_keys_are_merged_transitively(self):
+        tracks = [
+            make_track("1.flac", album=["Disc 1 Name"], catalog=["CAT-003"]),
+            make_track("2.flac", album=["Disc 2 Name"], catalog=["CAT-004"]),
+            make_track("3.flac", barcode=["4988"], catalog=["CAT-003"]),
+            make_track("4.flac", barcode=["4988"], album=["Disc 2 Name"]),
+        ]
+        self.assertEqual(cluster_tracks(tracks), [tracks])
+
+    def test_files_without_keys_reject_the_folder(self):
+        tracks = [make_track("1.flac", album=["Album"]), make_track("2.flac")]
+        self.assertIsNone(cluster_tracks(tracks))
+        self.assertIsNone(cluster_tracks([]))
+
+    def test_albums_in_sub_folders_are_not_side_by_side(self):
+        clusters = [[make_track("A/1.flac", depth=2, album=["A"])], [make_track("B/1.flac", depth=2, album=["B"])]]
+        self.assertFalse(are_clusters_side_by_side(clusters))
+
+
+if __name__ == "__main__":
+    unittest.main()
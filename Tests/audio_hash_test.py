@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Modules.Verify.audio_hash import hash_audio_data
+from Modules.Verify.audio_verifier import AudioVerifier
+from Tests.test_utils import create_minimal_flac_file, getRandomCoverImageData, get_test_file_path
+
+EXTENSIONS = ["flac", "mp3", "m4a", "ogg", "opus"]
+
+
+class TestAudioHash(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _copy_sample(self, extension: str) -> str:
+        file_path = os.path.join(self.temp_dir.name, f"sample.{extension}")
+        if extension == "flac":
+            create_minimal_flac_file(file_path)
+            with open(file_path, "ab") as file:
+                file.write(os.urandom(64 * 1024))  # stands in for the audio frames
+        else:
+            shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+        return file_path
+
+    def test_tagging_keeps_the_hash(self):
+        for extension in EXTENSIONS:
+            with self.subTest(extension=extension):
+                file_path = self._copy_sample(extension)
+                hash_before = hash_audio_data(file_path)
+                self.assertIsNotNone(hash_before)
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                audio_manager.setAlbum(["Xenoblade Original Soundtrack"])
+                audio_manager.setTitle(["A title long enough to move the audio around" * 10])
+                audio_manager.setPictureOfType(getRandomCoverImageData(), "Cover (front)")
+                audio_manager.save()
+                self.assertEqual(hash_audio_data(file_path), hash_before)
+
+    def test_changed_audio_changes_the_hash(self):
+        for extension in EXTENSIONS:
+            with self.subTest(extension=extension):
+                file_path = self._copy_sample(extension)
+                hash_before = hash_audio_data(file_path)
+                with open(file_path, "r+b") as file:
+                    file.seek(-1, os.SEEK_END)
+                    if extension == "m4a":  # the last atom of the sample is not mdat
+                        file.seek(os.path.getsize(file_path) // 2)
+                    last_byte = file.read(1)
+                    file.seek(-1, os.SEEK_CUR)
+                    file.write(bytes([last_byte[0] ^ 0xFF]))
+                self.assertNotEqual(hash_audio_data(file_path), hash_before)
+
+    def test_unknown_formats_are_not_hashed(self):
+        file_path = os.path.join(self.temp_dir.name, "cover.jpg")
+        with open(file_path, "wb") as file:
+            file.write(getRandomCoverImageData())
+        self.assertIsNone(hash_audio_data(file_path))
+        truncated_file_path = os.path.join(self.temp_dir.name, "truncated.flac")
+        with open(truncated_file_path, "wb") as file:
+            file.write(b"fLaC")
+        self.assertIsNone(hash_audio_data(truncated_file_path))
+
+    def test_verifier(self):
+        file_path = self._copy_sample("flac")
+        verifier = AudioVerifier(max_workers=2)
+        try:
+            hash_before = verifier.submit(file_path)
+            self.assertTrue(verifier.compare(file_path, hash_before, verifier.submit(file_path)))
+            with open(file_path, "ab") as file:
+                file.write(b"\x00")
+            self.assertFalse(verifier.compare(file_path, hash_before, verifier.submit(file_path)))
+            os.remove(file_path)
+            self.assertFalse(verifier.compare(file_path, hash_before, verifier.submit(file_path)))  # unreadable after saving
+            self.assertIsNone(verifier.compare(file_path, verifier.submit(file_path), verifier.submit(file_path)))  # nothing to compare against
+        finally:
+            verifier.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
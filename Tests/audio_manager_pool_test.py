@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Modules.Scan.audio_manager_pool import AudioManagerPool
+from Tests.test_utils import get_test_file_path
+
+
+class TestAudioManagerPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_paths: list[str] = []
+        for i, extension in enumerate(["mp3", "ogg", "opus", "m4a"]):
+            file_path = os.path.join(self.temp_dir.name, f"{i}.{extension}")
+            shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_open_files_are_bounded(self):
+        pool = AudioManagerPool(max_open_files=2, max_bytes=1024 * 1024 * 1024)
+        handles = [pool.get_handle(file_path) for file_path in self.file_paths]
+        for handle in handles:
+            handle.getAlbum()
+        self.assertEqual(len(pool.entries), 2)
+        self.assertEqual(list(pool.entries.keys()), self.file_paths[2:])
+        self.assertEqual((pool.opened, pool.evicted), (4, 2))
+
+    def test_byte_bound(self):
+        pool = AudioManagerPool(max_open_files=100, max_bytes=1)
+        for file_path in self.file_paths:
+            pool.get_handle(file_path).getAlbum()
+        self.assertLessEqual(len(pool.entries), 1)
+
+    def test_dirty_managers_are_saved_on_eviction(self):
+        pool = AudioManagerPool(max_open_files=1, max_bytes=1024 * 1024 * 1024)
+        first, second = pool.get_handle(self.file_paths[0]), pool.get_handle(self.file_paths[1])
+        first.setAlbum(["evicted album"])
+        self.assertTrue(pool.is_dirty(self.file_paths[0]))
+        pool.mark_for_saving(self.file_paths[0])
+        second.getAlbum()  # evicts the first file
+        self.assertNotIn(self.file_paths[0], pool.entries)
+        self.assertEqual(AudioFactory.buildAudioManager(self.file_paths[0]).getAlbum(), ["evicted album"])
+        self.assertEqual(first.getAlbum(), ["evicted album"])  # handles transparently reopen the file
+
+    def test_unmarked_changes_are_never_saved(self):
+        pool = AudioManagerPool(max_open_files=1, max_bytes=1024 * 1024 * 1024)
+        first, second = pool.get_handle(self.file_paths[0]), pool.get_handle(self.file_paths[1])
+        first.setAlbum(["half tagged album"])
+        second.getAlbum()
+        self.assertIn(self.file_paths[0], pool.entries)  # kept open instead of being saved on eviction
+        pool.discard(self.file_paths[0])
+        pool.flush()
+        self.assertNotEqual(AudioFactory.buildAudioManager(self.file_paths[0]).getAlbum(), ["half tagged album"])
+
+    def test_modified_managers_can_be_kept_open(self):
+        pool = AudioManagerPool(max_open_files=1, max_bytes=1024 * 1024 * 1024)
+        pool.evict_modified = False
+        first, second = pool.get_handle(self.file_paths[0]), pool.get_handle(self.file_paths[1])
+        first.setAlbum(["planned album"])
+        second.getAlbum()
+        self.assertEqual(list(pool.entries.keys()), self.file_paths[:2])  # only unmodified entries count towards eviction
+        pool.discard(self.file_paths[0], save=False)
+        self.assertNotEqual(AudioFactory.buildAudioManager(self.file_paths[0]).getAlbum(), ["planned album"])
+
+    def test_embedded_pictures_grow_the_estimate(self):
+        pool = AudioManagerPool(max_open_files=100, max_bytes=1024 * 1024 * 1024)
+        handle = pool.get_handle(self.file_paths[0])
+        handle.getAlbum()
+        size = pool.get_size(self.file_paths[0])
+        assert size
+        handle.setPictureOfType(bytes(1024 * 1024), "Cover (front)")
+        self.assertEqual(pool.get_size(self.file_paths[0]), size + 1024 * 1024)
+        self.assertEqual(pool.total_bytes, size + 1024 * 1024)
+        pool.mark_for_saving(self.file_paths[0])
+        pool.max_bytes = size + 1024
+        pool.get_handle(self.file_paths[1]).getAlbum()  # the picture pushed the pool over its bound
+        self.assertNotIn(self.file_paths[0], pool.entries)
+
+    def test_save_marks_clean(self):
+        pool = AudioManagerPool()
+        handle = pool.get_handle(self.file_paths[2])
+        handle.setAlbum(["saved album"])
+        handle.save()
+        self.assertFalse(pool.is_dirty(self.file_paths[2]))
+        self.assertEqual(AudioFactory.buildAudioManager(self.file_paths[2]).getAlbum(), ["saved album"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+benchmarks album clustering on synthetic flat folders, a single album of n tracks and a dump folder of n tracks spread over many albums
+the previous check (one key shared by every file, intersected key by key) is kept here for comparison, it can only accept or reject a folder
+usage: python -m Tests.benchmarks.album_clustering_benchmark [--tracks 10000] [--tracks_per_album 20]
+"""
+import argparse
+import datetime
+import random
+import time
+from typing import Any, Callable
+
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.album_clustering import cluster_tracks
+from Modules.Scan.models.local_album_data import LocalTrackData
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+
+
+def create_tracks(total_tracks: int, tracks_per_album: int) -> list[LocalTrackData]:
+    """every album is identified by a random subset of its keys on each file, so clusters only form through transitive merges"""
+    tracks: list[LocalTrackData] = []
+    for index in range(total_tracks):
+        album = index // tracks_per_album
+        tags = {
+            "album": [f"Album {album}"],
+            "catalog": [f"CAT-{album:05}"],
+            "barcode": [f"49{album:011}"],
+            "date": (datetime.date(2000, 1, 1) + datetime.timedelta(days=album)).isoformat(),
+        }
+        kept_keys = random.sample(list(tags), 2)
+        tracks.append(
+            LocalTrackData(
+                file_path=f"/music/dump/{index:06}.flac",
+                depth_in_parent_folder=1,
+                tags=LocalTrackTags(track_number=index % tracks_per_album + 1, **{key: tags[key] for key in kept_keys}),
+            )
+        )
+    random.shuffle(tracks)
+    return tracks
+
+
+def legacy_belongs_to_one_album(audio_files: list[LocalTrackData]) -> bool:
+    def has_identical_items(arr: list[list[str]]) -> bool:
+        common_items = set(arr[0])
+        for item in arr:
+            common_items.intersection_update(item)
+            if len(common_items) == 0:
+                return False
+        return True
+
+    tags = [track.tags for track in audio_files]
+    return any(
+        has_identical_items([getattr(track_tags, field) for track_tags in tags]) for field in ["vgmdb_link", "album", "catalog", "barcode"]
+    )
+
+
+def time_call(function: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark album clustering on synthetic flat folders")
+    parser.add_argument("--tracks", type=int, default=10000, help="number of files in each folder")
+    parser.add_argument("--tracks_per_album", type=int, default=20, help="album size in the dump folder")
+    args = parser.parse_args()
+    random.seed(0)
+
+    single_album = [
+        LocalTrackData(file_path=f"/music/album/{i:06}.flac", depth_in_parent_folder=1, tags=LocalTrackTags(album=["Album"], catalog=["CAT-1"]))
+        for i in range(args.tracks)
+    ]
+    dump_folder = create_tracks(args.tracks, args.tracks_per_album)
+    expected_albums = -(-args.tracks // args.tracks_per_album)
+
+    rows: list[tuple[Any, ...]] = []
+    accepted, seconds = time_call(lambda: legacy_belongs_to_one_album(single_album))
+    rows.append(("single album", "legacy check", "1" if accepted else "rejected", f"{seconds * 1000:.2f}"))
+    clusters, seconds = time_call(lambda: cluster_tracks(single_album))
+    rows.append(("single album", "clustering", len(clusters or []), f"{seconds * 1000:.2f}"))
+    accepted, seconds = time_call(lambda: legacy_belongs_to_one_album(dump_folder))
+    rows.append((f"dump of {expected_albums} albums", "legacy check", "1" if accepted else "rejected", f"{seconds * 1000:.2f}"))
+    clusters, seconds = time_call(lambda: cluster_tracks(dump_folder))
+    rows.append((f"dump of {expected_albums} albums", "clustering", len(clusters or []), f"{seconds * 1000:.2f}"))
+    if len(clusters or []) != expected_albums:
+        raise AssertionError(f"expected {expected_albums} albums, found {len(clusters or [])}")
+
+    columns = (
+        Column(header="Folder"),
+        Column(header="Method"),
+        Column(header="Albums Found", justify="right"),
+        Column(header="Time (ms)", justify="right", style="bold"),
+    )
+    tabulate(rows, columns=columns, title=f"{args.tracks} files per flat folder")
+
+
+if __name__ == "__main__":
+    main()
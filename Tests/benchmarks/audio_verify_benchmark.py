@@ -0,0 +1,117 @@
+"""
+throughput of hashing the audio data of an album serially against the process pool of the verifier, and the time verification adds to tagging
+usage: python -m Tests.benchmarks.audio_verify_benchmark [--tracks 40] [--track_mb 30] [--workers 1 2 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.scanner import Scanner
+from Modules.Tag.tagger import Tagger
+from Modules.Verify.audio_hash import hash_audio_data
+from Modules.Verify.audio_verifier import AudioVerifier
+from Modules.VGMDB.models.vgmdb_album_data import Names, VgmdbAlbumData, VgmdbDiscData, VgmdbTrackData
+from Tests.test_utils import create_minimal_flac_file
+
+
+def build_album(album_folder: str, total_tracks: int, track_mb: int) -> list[str]:
+    """flac files whose audio frames are track_mb MB of random bytes"""
+    file_paths = []
+    for track_number in range(1, total_tracks + 1):
+        file_path = os.path.join(album_folder, f"{track_number:02}.flac")
+        os.makedirs(album_folder, exist_ok=True)
+        create_minimal_flac_file(file_path)
+        audio_manager = AudioFactory.buildAudioManager(file_path)
+        audio_manager.setAlbum(["Album"])
+        audio_manager.setDiscNumbers(1, 1)
+        audio_manager.setTrackNumbers(track_number, total_tracks)
+        audio_manager.save()
+        with open(file_path, "ab") as file:
+            file.write(os.urandom(track_mb * 1024 * 1024))
+        file_paths.append(file_path)
+    return file_paths
+
+
+def get_vgmdb_album_data(total_tracks: int, catalog: str) -> VgmdbAlbumData:
+    return VgmdbAlbumData(
+        link="album/1",
+        name="Album",
+        names=Names(en="Album"),
+        discs={1: VgmdbDiscData(tracks={track_number: VgmdbTrackData(names=Names(en=f"Track {track_number}")) for track_number in range(1, total_tracks + 1)})},
+        media_format="CD",
+        notes="",
+        vgmdb_link="https://vgmdb.net/album/1",
+        release_date="2020-01-01",
+        catalog=catalog,
+        barcode=None,
+        picture_full=None,
+        picture_small=None,
+        picture_thumb=None,
+        arrangers=[],
+        composers=[],
+        lyricists=[],
+        performers=[],
+        album_id="1",
+    )
+
+
+def tag_album(album_folder: str, total_tracks: int, catalog: str, verify_audio: bool) -> float:
+    """tags (only the catalog changes, so every file is saved in place) and returns the time taken"""
+    local_album_data = Scanner().scan_album_in_folder_if_exists(album_folder)
+    assert local_album_data
+    vgmdb_album_data = get_vgmdb_album_data(total_tracks, catalog)
+    vgmdb_album_data.link_local_album_data(local_album_data)
+    tagger = Tagger(local_album_data, vgmdb_album_data, Config(root_dir=album_folder, album_cover=False, verify_audio=verify_audio))
+    start = time.perf_counter()
+    result = tagger.tag_files()
+    seconds = time.perf_counter() - start
+    assert not result.corrupted_file_tag_results
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark hashing the audio of saved files for verification")
+    parser.add_argument("--tracks", type=int, default=40)
+    parser.add_argument("--track_mb", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="process pool sizes to hash with")
+    args = parser.parse_args()
+
+    total_mb = args.tracks * args.track_mb
+    hash_rows: list[tuple[Any, ...]] = []
+    tag_rows: list[tuple[Any, ...]] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        album_folder = os.path.join(temp_dir, "Album")
+        file_paths = build_album(album_folder, args.tracks, args.track_mb)
+
+        start = time.perf_counter()
+        for file_path in file_paths:
+            hash_audio_data(file_path)
+        seconds = time.perf_counter() - start
+        hash_rows.append(("serial", f"{seconds:.2f}", f"{total_mb / seconds:.0f}"))
+        for workers in args.workers:
+            verifier = AudioVerifier(max_workers=workers)
+            verifier.submit(file_paths[0]).result()  # start the pool outside of the measurement
+            start = time.perf_counter()
+            for future in [verifier.submit(file_path) for file_path in file_paths]:
+                future.result()
+            seconds = time.perf_counter() - start
+            verifier.close()
+            hash_rows.append((f"process pool of {workers}", f"{seconds:.2f}", f"{total_mb / seconds:.0f}"))
+
+        for index, verify_audio in enumerate([False, True]):
+            seconds = tag_album(album_folder, args.tracks, f"CAT-{index}", verify_audio)
+            tag_rows.append(("verified" if verify_audio else "not verified", f"{seconds:.2f}"))
+
+    hash_columns = (Column(header="Hashing"), Column(header="Time (s)", justify="right"), Column(header="MB/s", justify="right", style="bold"))
+    tabulate(hash_rows, columns=hash_columns, title=f"hashing the audio of {args.tracks} files of {args.track_mb} MB on {os.cpu_count()} cores")
+    tag_columns = (Column(header="Tagging"), Column(header="Time (s)", justify="right", style="bold"))
+    tabulate(tag_rows, columns=tag_columns, title=f"tagging {args.tracks} files of {args.track_mb} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+latencies of album requests to a server which usually answers quickly but stalls on some requests, with a second server to fall back to, with and without hedging
+shows the median and tail latencies along with the requests sent to both servers
+usage: python -m Tests.benchmarks.hedged_requests_benchmark [--requests 200] [--latency_ms 50] [--stall_ms 1000] [--stall_every 20] [--fallback_latency_ms 80]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from Modules.Print.table import Column, tabulate
+from Modules.VGMDB.api.transport import HedgedTransport
+
+
+def start_server(latency_seconds: float, stall_seconds: float = 0, stall_every: int = 0) -> ThreadingHTTPServer:
+    counter = itertools.count(1)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            stalled = stall_every and next(counter) % stall_every == 0
+            time.sleep(stall_seconds if stalled else latency_seconds)
+            body = json.dumps({"link": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(base_urls: list[str], total_requests: int, hedge: bool) -> tuple[list[float], HedgedTransport]:
+    transport = HedgedTransport(base_urls, hedge=hedge)
+    latencies = []
+    for index in range(total_requests):
+        start = time.perf_counter()
+        (await transport.get(f"album/{index}", {})).json()
+        latencies.append(time.perf_counter() - start)
+    await transport.close()
+    return latencies, transport
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark hedged requests to the vgmdb api servers")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency_ms", type=int, default=50)
+    parser.add_argument("--stall_ms", type=int, default=1000)
+    parser.add_argument("--stall_every", type=int, default=20, help="every nth request to the first server stalls")
+    parser.add_argument("--fallback_latency_ms", type=int, default=80)
+    args = parser.parse_args()
+
+    rows: list[tuple[Any, ...]] = []
+    for mode, with_fallback, hedge in [("single server", False, False), ("fallback, no hedging", True, False), ("fallback, hedging", True, True)]:
+        servers = [start_server(args.latency_ms / 1000, args.stall_ms / 1000, args.stall_every), start_server(args.fallback_latency_ms / 1000)]
+        base_urls = [f"http://127.0.0.1:{server.server_address[1]}/" for server in servers][: 2 if with_fallback else 1]
+        latencies, transport = asyncio.run(run(base_urls, args.requests, hedge))
+        for server in servers:
+            server.shutdown()
+        percentiles = statistics.quantiles(latencies, n=100)
+        requests_sent = " / ".join(str(endpoint.requests) for endpoint in transport.endpoints)
+        rows.append((mode, f"{percentiles[49] * 1000:.0f}", f"{percentiles[89] * 1000:.0f}", f"{percentiles[98] * 1000:.0f}", f"{max(latencies) * 1000:.0f}", f"{sum(latencies):.1f}", requests_sent))
+
+    columns = (
+        Column(header="Mode"),
+        Column(header="p50 (ms)", justify="right"),
+        Column(header="p90 (ms)", justify="right"),
+        Column(header="p99 (ms)", justify="right", style="bold"),
+        Column(header="Max (ms)", justify="right"),
+        Column(header="Total (s)", justify="right"),
+        Column(header="Requests Sent", justify="right"),
+    )
+    title = f"{args.requests} requests one after another, {args.latency_ms} ms of latency stalling {args.stall_ms} ms every {args.stall_every} requests, {args.fallback_latency_ms} ms on the fallback"
+    tabulate(rows, columns=columns, title=title)
+
+
+if __name__ == "__main__":
+    main()
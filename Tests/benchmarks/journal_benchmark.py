@@ -0,0 +1,64 @@
+"""
+cost of journaling a run, recording the stages of every album and file with batched fsync against an fsync for every entry
+usage: python -m Tests.benchmarks.journal_benchmark [--albums 200] [--tracks_per_album 20] [--journal_folder /tmp]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any
+
+from Modules.Journal import constants
+from Modules.Journal.journal import Journal
+from Modules.Print.table import Column, tabulate
+
+
+def journal_run(journal_path: str, albums: int, tracks_per_album: int) -> tuple[float, int]:
+    """records what a run over the albums would record, returns the time taken and the number of fsync calls"""
+    start = time.perf_counter()
+    journal = Journal(os.path.dirname(journal_path), journal_path=journal_path)
+    for album_number in range(albums):
+        album = f"/music/Album {album_number}"
+        journal.record(album, "fetched", album_id=str(album_number))
+        journal.record(album, "confirmed")
+        journal.record(album, "tagged")
+        for track_number in range(tracks_per_album):
+            journal.record(album, "saved", file_path=f"{album}/{track_number:02}.flac")
+        journal.record(album, "saved")
+        for track_number in range(tracks_per_album):
+            journal.record(album, "renamed", file_path=f"{album}/{track_number:02}.flac", new_path=f"{album}/{track_number:02}. Title.flac")
+        journal.record(album, "renamed", new_path=f"/music/[2020.01.01] Album {album_number}")
+        journal.record(album, "done")
+        journal.sync()
+    journal.close()
+    return time.perf_counter() - start, journal.syncs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the cost of journaling a run")
+    parser.add_argument("--albums", type=int, default=200)
+    parser.add_argument("--tracks_per_album", type=int, default=20)
+    parser.add_argument("--journal_folder", type=str, default=None, help="use a folder on the disk the journal is kept on, defaults to the temporary folder")
+    args = parser.parse_args()
+    entries = args.albums * (args.tracks_per_album * 2 + 7)
+
+    rows: list[tuple[Any, ...]] = []
+    with tempfile.TemporaryDirectory(dir=args.journal_folder) as temp_dir:
+        batched_interval = constants.JOURNAL_FSYNC_INTERVAL_ENTRIES
+        for name, interval in [("fsync every entry", 1), (f"batched fsync ({batched_interval} entries)", batched_interval)]:
+            constants.JOURNAL_FSYNC_INTERVAL_ENTRIES = interval
+            seconds, syncs = journal_run(os.path.join(temp_dir, f"{interval}.jsonl"), args.albums, args.tracks_per_album)
+            rows.append((name, syncs, f"{seconds * 1000:.1f}", f"{seconds * 1e6 / entries:.1f}"))
+        constants.JOURNAL_FSYNC_INTERVAL_ENTRIES = batched_interval
+
+    columns = (
+        Column(header="Journal"),
+        Column(header="fsync calls", justify="right"),
+        Column(header="Total (ms)", justify="right"),
+        Column(header="Per Entry (µs)", justify="right", style="bold"),
+    )
+    tabulate(rows, columns=columns, title=f"journaling {args.albums} albums of {args.tracks_per_album} tracks ({entries} entries)")
+
+
+if __name__ == "__main__":
+    main()
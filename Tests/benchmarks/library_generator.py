@@ -0,0 +1,120 @@
+"""
+builds synthetic music libraries out of the Tests/testSamples seed files, for benchmarking the scanner at scale
+only a small set of template files is tagged (one per album slot, disc and track number), every file of the library is a hardlink
+(or a copy on write clone / plain copy) of a template, so generating tens of thousands of files takes seconds
+
+album slots give sibling albums distinct tags, albums which never share a folder may reuse a slot since the scanner only compares files inside a folder
+layouts:
+    * nested: Label/Album/[Disc n/]track, the usual way a library is organized
+    * deep: albums nested under 1-4 levels of series folders
+    * flat: dump folders holding the files of several albums side by side (split by album clustering)
+"""
+import fcntl
+import os
+import shutil
+from typing import Literal
+from pydantic import BaseModel
+from unigen import AudioFactory
+
+from Tests.test_utils import create_minimal_flac_file, getRandomCoverImageData, get_test_file_path
+
+LAYOUTS = Literal["nested", "deep", "flat"]
+LINK_MODES = Literal["hardlink", "copy"]
+
+FORMATS = ["flac", "mp3", "m4a", "ogg", "opus"]
+ALBUM_SLOTS = 24
+ALBUMS_PER_GROUP = 12  # albums per label / series / dump folder, must not exceed ALBUM_SLOTS
+MAX_DISCS = 4
+MAX_TRACKS_PER_DISC = 16
+FICLONE = 0x40049409  # linux ioctl for copy on write clones (btrfs, xfs)
+
+
+class GeneratedLibrary(BaseModel):
+    root_dir: str
+    layout: str
+    album_folders: list[str]  # folders holding exactly one album, empty for the flat layout
+    total_albums: int
+    total_files: int
+
+
+class LibraryGenerator:
+    def __init__(self, templates_dir: str, link_mode: LINK_MODES = "hardlink", with_covers: bool = False):
+        """templates are created inside templates_dir, which must be on the same file system as the libraries for hardlinks to work"""
+        self.templates_dir = templates_dir
+        self.link_mode = link_mode
+        self.with_covers = with_covers
+        self.templates: dict[tuple[int, int, int], str] = {}
+        self.extra_file_template = os.path.join(templates_dir, "extra_file")
+        os.makedirs(templates_dir, exist_ok=True)
+        with open(self.extra_file_template, "wb") as file:
+            file.write(b"\xff\xd8\xff\xe0 not really an image")
+
+    def generate(self, root_dir: str, layout: LAYOUTS, total_albums: int) -> GeneratedLibrary:
+        library = GeneratedLibrary(root_dir=root_dir, layout=layout, album_folders=[], total_albums=total_albums, total_files=0)
+        for album_index in range(total_albums):
+            group, position_in_group = divmod(album_index, ALBUMS_PER_GROUP)
+            slot = album_index % ALBUM_SLOTS
+            if layout == "flat":
+                album_folder = os.path.join(root_dir, f"Dump {group:04}")
+                self._create_album(library, album_folder, album_index, slot, file_prefix=f"{position_in_group:02} - ")
+                continue
+            if layout == "nested":
+                album_folder = os.path.join(root_dir, f"Label {group:04}", f"Album {album_index:05}")
+            else:
+                series_levels = [f"Series {group:04}"] + [f"Part {level}" for level in range(1, position_in_group % 4 + 1)]
+                album_folder = os.path.join(root_dir, *series_levels, f"Album {album_index:05}")
+            self._create_album(library, album_folder, album_index, slot)
+            library.album_folders.append(album_folder)
+        return library
+
+    # private functions
+    def _create_album(self, library: GeneratedLibrary, album_folder: str, album_index: int, slot: int, file_prefix: str = ""):
+        total_discs = 1 if album_index % 4 else 2 + album_index % 3
+        tracks_per_disc = 8 + album_index % 9
+        extension = FORMATS[slot % len(FORMATS)]
+        for disc_number in range(1, total_discs + 1):
+            disc_folder = os.path.join(album_folder, f"Disc {disc_number}") if total_discs > 1 else album_folder
+            os.makedirs(disc_folder, exist_ok=True)
+            for track_number in range(1, tracks_per_disc + 1):
+                file_name = f"{file_prefix}{track_number:02}. Track {track_number}.{extension}"
+                self._place(self._get_template(slot, disc_number, track_number), os.path.join(disc_folder, file_name))
+                library.total_files += 1
+        if not file_prefix:  # scans, logs and covers sit next to the audio files in album folders
+            self._place(self.extra_file_template, os.path.join(album_folder, "cover.jpg"))
+            if album_index % 3 == 0:
+                os.makedirs(os.path.join(album_folder, "Scans"), exist_ok=True)
+                for scan_number in range(1, 3):
+                    self._place(self.extra_file_template, os.path.join(album_folder, "Scans", f"{scan_number:02}.jpg"))
+
+    def _get_template(self, slot: int, disc_number: int, track_number: int) -> str:
+        key = (slot, disc_number, track_number)
+        if key in self.templates:
+            return self.templates[key]
+        extension = FORMATS[slot % len(FORMATS)]
+        template_path = os.path.join(self.templates_dir, f"{slot:02}-{disc_number}-{track_number:02}.{extension}")
+        if extension == "flac":
+            create_minimal_flac_file(template_path)
+        else:
+            shutil.copyfile(get_test_file_path(extension, use_modified_folder=False), template_path)
+        audio_manager = AudioFactory.buildAudioManager(template_path)
+        audio_manager.setAlbum([f"Synthetic Album {slot:02}"])
+        audio_manager.setCatalog([f"SYN-{slot:04}"])
+        audio_manager.setDate(f"2020-01-{slot % 28 + 1:02}")
+        audio_manager.setDiscNumbers(disc_number, MAX_DISCS)
+        audio_manager.setTrackNumbers(track_number, MAX_TRACKS_PER_DISC)
+        audio_manager.setTitle([f"Track {track_number}"])
+        if self.with_covers:
+            audio_manager.setPictureOfType(getRandomCoverImageData(), "Cover (front)")
+        audio_manager.save()
+        self.templates[key] = template_path
+        return template_path
+
+    def _place(self, template_path: str, file_path: str):
+        if self.link_mode == "hardlink":
+            os.link(template_path, file_path)
+            return
+        try:
+            with open(template_path, "rb") as source, open(file_path, "wb") as destination:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+        except OSError:
+            shutil.copyfile(template_path, file_path)  # the file system does not support clones
@@ -0,0 +1,81 @@
+"""
+time taken by Organizer.organize on a large album, reading the tag snapshot taken while scanning against querying the audio manager of every file again
+(which is what the organizer used to do), the files hold an embedded scan so that opening one costs what it does in a real library
+usage: python -m Tests.benchmarks.organizer_benchmark [--tracks 1000] [--scan_kb 256]
+"""
+import argparse
+import os
+import tempfile
+import time
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Organize.organizer import Organizer
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
+from Modules.Scan.models.local_album_data import LocalAlbumData
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Scan.scanner import Scanner
+from Tests.test_utils import create_minimal_flac_file
+
+
+def build_album(album_folder: str, total_tracks: int, scan_kb: int):
+    tracks_per_disc = 50
+    total_discs = -(-total_tracks // tracks_per_disc)
+    for index in range(total_tracks):
+        disc_number, track_number = index // tracks_per_disc + 1, index % tracks_per_disc + 1
+        file_path = os.path.join(album_folder, f"Disc {disc_number}", f"{track_number:02}.flac")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        create_minimal_flac_file(file_path)
+        audio_manager = AudioFactory.buildAudioManager(file_path)
+        audio_manager.setTitle([f"Track {disc_number}-{track_number}"])
+        audio_manager.setAlbum(["Large Album"])
+        audio_manager.setDiscNumbers(disc_number, total_discs)
+        audio_manager.setTrackNumbers(track_number, tracks_per_disc)
+        audio_manager.setDate("2020-01-01")
+        audio_manager.setCatalog(["LARGE-0001"])
+        audio_manager.setPictureOfType(b"\xff\xd8" + os.urandom(scan_kb * 1024), "Leaflet page")
+        audio_manager.save()
+
+
+def organize(local_album_data: LocalAlbumData, config: Config, query_audio_managers: bool) -> tuple[float, int]:
+    """returns the seconds taken and the number of files opened"""
+    pool = get_audio_manager_pool()
+    for file_path in list(pool.entries):
+        pool.discard(file_path)
+    opened = pool.opened
+    start = time.perf_counter()
+    if query_audio_managers:
+        for track in local_album_data.get_all_tracks():
+            track.tags = LocalTrackTags.from_audio_manager(track.audio_manager)
+    Organizer(local_album_data, config).organize()
+    return time.perf_counter() - start, pool.opened - opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark organizing a large album from the tag snapshot")
+    parser.add_argument("--tracks", type=int, default=1000)
+    parser.add_argument("--scan_kb", type=int, default=256, help="size of the scan embedded in every file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        album_folder = os.path.join(temp_dir, "Large Album")
+        build_album(album_folder, args.tracks, args.scan_kb)
+        local_album_data = Scanner().scan_album_in_folder_if_exists(album_folder)
+        assert local_album_data
+        config = Config(root_dir=album_folder)
+        rows = []
+        for name, query_audio_managers in [("querying audio managers", True), ("tag snapshot", False)]:
+            seconds, opened = organize(local_album_data, config, query_audio_managers)
+            rows.append((name, f"{seconds * 1000:.0f}", opened))
+
+    columns = (
+        Column(header="Tags Read From"),
+        Column(header="Time (ms)", justify="right", style="bold"),
+        Column(header="Files Opened", justify="right"),
+    )
+    tabulate(rows, columns=columns, title=f"organizing an album of {args.tracks} files holding a {args.scan_kb} KB scan each")
+
+
+if __name__ == "__main__":
+    main()
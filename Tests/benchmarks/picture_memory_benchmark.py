@@ -0,0 +1,130 @@
+"""
+peak memory (RSS) of tagging a box set whose files already hold large embedded scans, with the cover embedded while the files of
+the album are kept open (the default) against streaming the pictures per file within a memory ceiling
+every mode runs in a fresh process on a fresh copy of the album, so that the peak RSS of the process is the peak of that mode alone
+usage: python -m Tests.benchmarks.picture_memory_benchmark [--tracks 40] [--scans 2] [--scan_mb 3] [--cover_mb 1] [--ceilings 16 64]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from typing import Any
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
+from Modules.Scan.scanner import Scanner
+from Modules.Tag.tagger import Tagger
+from Modules.VGMDB.models.vgmdb_album_data import Names, VgmdbAlbumData, VgmdbDiscData, VgmdbTrackData
+from Tests.test_utils import create_minimal_flac_file
+
+SCAN_TYPES = ["Cover (back)", "Leaflet page", "Other"]
+
+
+def build_album(album_folder: str, total_tracks: int, total_scans: int, scan_mb: int):
+    """flac files holding a different front cover and total_scans other embedded pictures each"""
+    tracks_per_disc = 20
+    for index in range(total_tracks):
+        disc_number, track_number = index // tracks_per_disc + 1, index % tracks_per_disc + 1
+        file_path = os.path.join(album_folder, f"Disc {disc_number}", f"{track_number:02}.flac")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        create_minimal_flac_file(file_path)
+        audio_manager = AudioFactory.buildAudioManager(file_path)
+        audio_manager.setAlbum(["Box Set"])
+        audio_manager.setDiscNumbers(disc_number, -(-total_tracks // tracks_per_disc))
+        audio_manager.setTrackNumbers(track_number, tracks_per_disc)
+        audio_manager.setPictureOfType(b"\xff\xd8old cover", "Cover (front)")
+        for scan_number in range(total_scans):
+            audio_manager.setPictureOfType(b"\xff\xd8" + os.urandom(scan_mb * 1024 * 1024), SCAN_TYPES[scan_number % len(SCAN_TYPES)])
+        audio_manager.save()
+
+
+def get_vgmdb_album_data(cover_mb: int, total_tracks: int) -> VgmdbAlbumData:
+    tracks_per_disc = 20
+    discs: dict[int, VgmdbDiscData] = {}
+    for index in range(total_tracks):
+        disc_number, track_number = index // tracks_per_disc + 1, index % tracks_per_disc + 1
+        discs.setdefault(disc_number, VgmdbDiscData(tracks={})).tracks[track_number] = VgmdbTrackData(names=Names(en=f"Track {track_number}"))
+    return VgmdbAlbumData(
+        link="album/1",
+        name="Box Set",
+        names=Names(en="Box Set"),
+        discs=discs,
+        media_format="CD",
+        notes="",
+        vgmdb_link="https://vgmdb.net/album/1",
+        release_date="2020-01-01",
+        catalog="BOX-0001",
+        barcode=None,
+        picture_full="https://media.vgm.io/albums/box.jpg",
+        picture_small=None,
+        picture_thumb=None,
+        arrangers=[],
+        composers=[],
+        lyricists=[],
+        performers=[],
+        album_id="1",
+        album_cover_cache=b"\xff\xd8" + os.urandom(cover_mb * 1024 * 1024),  # never downloaded
+    )
+
+
+def get_rss_mb() -> float:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def tag_album(album_folder: str, cover_mb: int, total_tracks: int, config: dict[str, Any]) -> tuple[float, float, float]:
+    """runs in its own process, returns the peak RSS while tagging, the RSS before tagging (both in MB) and the time taken"""
+    local_album_data = Scanner().scan_album_in_folder_if_exists(album_folder)
+    assert local_album_data
+    vgmdb_album_data = get_vgmdb_album_data(cover_mb, total_tracks)
+    vgmdb_album_data.link_local_album_data(local_album_data)
+    tagger = Tagger(local_album_data, vgmdb_album_data, Config(root_dir=album_folder, **config))
+    get_audio_manager_pool().configure(max_open_files=256, max_bytes=1024 * 1024 * 1024 * 1024)  # only the number of files bounds the pool
+    rss_before = get_rss_mb()
+    start = time.perf_counter()
+    tagger.tag_files()
+    seconds = time.perf_counter() - start
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, rss_before, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the peak memory of embedding covers into files with large embedded scans")
+    parser.add_argument("--tracks", type=int, default=40)
+    parser.add_argument("--scans", type=int, default=2, help="pictures already embedded in every file apart from the front cover")
+    parser.add_argument("--scan_mb", type=int, default=3)
+    parser.add_argument("--cover_mb", type=int, default=1)
+    parser.add_argument("--ceilings", type=int, nargs="+", default=[16, 64], help="picture memory ceilings (in MB) to stream pictures with")
+    args = parser.parse_args()
+
+    modes: list[tuple[str, dict[str, Any]]] = [("files kept open", {})]
+    modes += [(f"stream pictures, {ceiling} MB ceiling", {"stream_pictures": True, "picture_memory_mb": ceiling}) for ceiling in args.ceilings]
+    rows: list[tuple[Any, ...]] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_folder = os.path.join(temp_dir, "template")
+        build_album(template_folder, args.tracks, args.scans, args.scan_mb)
+        context = multiprocessing.get_context("spawn")
+        for name, config in modes:
+            album_folder = os.path.join(temp_dir, "Box Set")
+            shutil.rmtree(album_folder, ignore_errors=True)
+            shutil.copytree(template_folder, album_folder)
+            with context.Pool(1) as pool:
+                peak_rss, rss_before, seconds = pool.apply(tag_album, (album_folder, args.cover_mb, args.tracks, config))
+            rows.append((name, f"{peak_rss:.0f}", f"{peak_rss - rss_before:.0f}", f"{seconds:.2f}"))
+
+    columns = (
+        Column(header="Mode"),
+        Column(header="Peak RSS (MB)", justify="right"),
+        Column(header="Growth While Tagging (MB)", justify="right", style="bold"),
+        Column(header="Time (s)", justify="right"),
+    )
+    title = f"tagging {args.tracks} files holding {args.scans} scans of {args.scan_mb} MB each, with a {args.cover_mb} MB cover"
+    tabulate(rows, columns=columns, title=title)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+time spent waiting for the search results, album details and cover of every album of an interactive run, with and without prefetching the next albums
+the user is simulated by sleeping for a fixed time per album, the server answers after a fixed latency
+usage: python -m Tests.benchmarks.prefetch_benchmark [--albums 10] [--latency_ms 300] [--think_ms 1000] [--lookahead 1 2]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from Modules.Print.table import Column, tabulate
+from Modules.VGMDB.api.client import VgmdbClient
+from Modules.VGMDB.api.prefetcher import Prefetcher
+from Tests.test_utils import getRandomCoverImageData
+
+LATENCY_SECONDS = 0.3
+COVER_DATA = getRandomCoverImageData()
+
+
+class LatencyHandler(BaseHTTPRequestHandler):
+    """searching for 'album <id>' finds only that album"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(LATENCY_SECONDS)
+        path = urlsplit(self.path)
+        if path.path == "/cover.jpg":
+            self._send(COVER_DATA)
+            return
+        if path.path == "/search":
+            album_id = parse_qs(path.query)["q"][0].split()[-1]
+            data: dict[str, Any] = {"results": {"albums": [{"catalog": f"CAT-{album_id}", "link": f"album/{album_id}", "release_date": "2020-01-01", "titles": {"en": f"Album {album_id}"}}]}}
+        else:
+            album_id = path.path.split("/")[-1]
+            data = {
+                "link": f"album/{album_id}",
+                "name": f"Album {album_id}",
+                "names": {"en": f"Album {album_id}"},
+                "discs": [],
+                "media_format": "CD",
+                "notes": "",
+                "vgmdb_link": f"https://vgmdb.net/album/{album_id}",
+                "picture_full": f"http://{self.headers['Host']}/cover.jpg?album={album_id}",
+                "picture_small": None,
+                "picture_thumb": None,
+                "arrangers": [],
+                "composers": [],
+                "lyricists": [],
+                "performers": [],
+            }
+        self._send(json.dumps(data).encode())
+
+    def _send(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object):
+        pass
+
+
+def run(base_url: str, total_albums: int, think_seconds: float, lookahead: int) -> tuple[float, float]:
+    """works through the albums like the cli does, returns the total and the worst wait (in seconds) after the user answered"""
+    client = VgmdbClient(base_url=base_url)
+    prefetcher: Optional[Prefetcher] = Prefetcher(client, max_bytes=64 * 1024 * 1024) if lookahead else None
+    album_ids = [str(album_id) for album_id in range(total_albums)]
+    total_wait, worst_wait = 0.0, 0.0
+    for index, album_id in enumerate(album_ids):
+        if prefetcher:
+            for upcoming_album_id in album_ids[index + 1 : index + 1 + lookahead]:
+                prefetcher.prefetch(upcoming_album_id, f"album {upcoming_album_id}")
+            prefetcher.release(album_id)
+        start = time.perf_counter()
+        search_result = client.search_album(f"album {album_id}")
+        vgmdb_album_data = client.get_album_details(search_result[0].album_id)
+        vgmdb_album_data.get_album_cover_data()
+        wait = time.perf_counter() - start
+        total_wait, worst_wait = total_wait + wait, max(worst_wait, wait)
+        time.sleep(think_seconds)  # reading the match table
+    if prefetcher:
+        prefetcher.close()
+    client.close()
+    return total_wait, worst_wait
+
+
+def main():
+    global LATENCY_SECONDS
+    parser = argparse.ArgumentParser(description="benchmark prefetching the next albums of an interactive run")
+    parser.add_argument("--albums", type=int, default=10)
+    parser.add_argument("--latency_ms", type=int, default=300)
+    parser.add_argument("--think_ms", type=int, default=1000)
+    parser.add_argument("--lookahead", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+    LATENCY_SECONDS = args.latency_ms / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LatencyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    rows: list[tuple[Any, ...]] = []
+    for lookahead in [0] + args.lookahead:
+        total_wait, worst_wait = run(base_url, args.albums, args.think_ms / 1000, lookahead)
+        rows.append((f"{lookahead} albums ahead" if lookahead else "no prefetch", f"{total_wait:.2f}", f"{total_wait / args.albums * 1000:.0f}", f"{worst_wait * 1000:.0f}"))
+    server.shutdown()
+
+    columns = (
+        Column(header="Mode"),
+        Column(header="Total Wait (s)", justify="right"),
+        Column(header="Wait per Album (ms)", justify="right", style="bold"),
+        Column(header="Worst Wait (ms)", justify="right"),
+    )
+    tabulate(rows, columns=columns, title=f"{args.albums} albums, {args.latency_ms} ms of latency, {args.think_ms} ms spent on every album")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+downloads files with as many threads as the scans downloader uses, from a local server answering after a fixed latency, under several request rate limits
+shows the rate achieved and the time spent waiting for the limit against the time spent transferring
+usage: python -m Tests.benchmarks.rate_limiter_benchmark [--files 40] [--latency_ms 200] [--limits 0 4 8 16]
+"""
+import argparse
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from Imports.constants import THREAD_EXECUTOR_NUM_THREADS
+from Modules.Print.table import Column, tabulate
+from Modules.Utils.network_utils import download_file
+from Modules.Utils.rate_limiter import HostStats, get_rate_limiter
+
+LATENCY_SECONDS = 0.2
+FILE_DATA = os.urandom(64 * 1024)
+
+
+class LatencyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY_SECONDS)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(FILE_DATA)))
+        self.end_headers()
+        self.wfile.write(FILE_DATA)
+
+    def log_message(self, format: str, *args: object):
+        pass
+
+
+def main():
+    global LATENCY_SECONDS
+    parser = argparse.ArgumentParser(description="benchmark the request rate limiter")
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--latency_ms", type=int, default=200)
+    parser.add_argument("--limits", type=float, nargs="+", default=[0, 4, 8, 16], help="requests per second, 0 for no limit")
+    args = parser.parse_args()
+    LATENCY_SECONDS = args.latency_ms / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LatencyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_address[1]}"
+    rate_limiter = get_rate_limiter()
+    rows: list[tuple[Any, ...]] = []
+    for limit in args.limits:
+        rate_limiter.configure(limit, burst=THREAD_EXECUTOR_NUM_THREADS)
+        before = rate_limiter.get_stats().get(host, HostStats())
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_EXECUTOR_NUM_THREADS) as executor:
+                for future in [executor.submit(download_file, f"http://{host}/scan_{index}.jpg", output_dir) for index in range(args.files)]:
+                    future.result()
+            seconds = time.perf_counter() - start
+        after = rate_limiter.get_stats()[host]
+        wait_seconds, transfer_seconds = after.wait_seconds - before.wait_seconds, after.transfer_seconds - before.transfer_seconds
+        rows.append((f"{limit:g}/s" if limit else "no limit", f"{seconds:.2f}", f"{args.files / seconds:.1f}", f"{wait_seconds:.1f}", f"{transfer_seconds:.1f}"))
+    server.shutdown()
+
+    columns = (
+        Column(header="Limit"),
+        Column(header="Time (s)", justify="right"),
+        Column(header="Requests/s", justify="right", style="bold"),
+        Column(header="Waiting for Limit (s)", justify="right"),
+        Column(header="Transferring (s)", justify="right"),
+    )
+    tabulate(rows, columns=columns, title=f"downloading {args.files} files with {THREAD_EXECUTOR_NUM_THREADS} threads, {args.latency_ms} ms of latency, bursts of {THREAD_EXECUTOR_NUM_THREADS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+scanner throughput benchmark on synthetic libraries (see library_generator)
+every scenario runs in a fresh process so that its peak RSS is measured on its own, the results are compared against a stored baseline
+and regressions beyond the tolerance are flagged (exit code 1), so that slower scans show up in review
+scenarios:
+    * recursive-<layout>: Scanner.scan_albums_recursively on the whole library
+    * per-album-nested: Scanner.scan_album_in_folder_if_exists on every album folder of the nested library
+usage:
+    python -m Tests.benchmarks.scanner_benchmark [--albums 2000] [--link_mode hardlink] [--scenarios recursive-nested ...]
+    python -m Tests.benchmarks.scanner_benchmark --update_baseline  # after an intended change in performance
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Optional
+
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.scanner import Scanner
+from Tests.benchmarks.library_generator import LibraryGenerator
+
+SCENARIOS = ["recursive-nested", "recursive-deep", "recursive-flat", "per-album-nested"]
+BASELINE_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "scanner_benchmark.json")
+DEFAULT_TOLERANCE = 0.25
+SYSCALLS_TOLERANCE = 0.05  # syscall counts hardly depend on the machine, so they are held to a tighter bound
+
+
+def get_peak_rss_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024  # bytes on macOS, kilobytes on linux
+
+
+def get_read_syscalls() -> Optional[int]:
+    """read syscalls issued by this process so far (linux only), covers tag reading which the walker does not count"""
+    try:
+        with open("/proc/self/io") as io_file:
+            for line in io_file:
+                if line.startswith("syscr:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run_scenario(scenario: str, root_dir: str, album_folders: list[str]) -> dict[str, Any]:
+    """runs inside a fresh process"""
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("Modules."):
+            logging.getLogger(name).setLevel(logging.ERROR)  # per folder logging would dominate the measurement
+    scanner = Scanner()
+    read_syscalls_before = get_read_syscalls()
+    start = time.perf_counter()
+    files_seen, walk_syscalls, albums_found = 0, 0, 0
+    if scenario.startswith("recursive-"):
+        albums_found = len(scanner.scan_albums_recursively(root_dir))
+        if scanner.last_walk_stats:
+            files_seen, walk_syscalls = scanner.last_walk_stats.audio_files_found, scanner.last_walk_stats.syscalls
+    else:
+        for album_folder in album_folders:
+            albums_found += scanner.scan_album_in_folder_if_exists(album_folder) is not None
+            if scanner.last_walk_stats:
+                files_seen += scanner.last_walk_stats.audio_files_found
+                walk_syscalls += scanner.last_walk_stats.syscalls
+    elapsed_seconds = time.perf_counter() - start
+    read_syscalls_after = get_read_syscalls()
+    scanner.close()
+    read_syscalls = read_syscalls_after - read_syscalls_before if read_syscalls_before is not None and read_syscalls_after is not None else None
+    return {
+        "audio_files": files_seen,
+        "albums_found": albums_found,
+        "seconds": round(elapsed_seconds, 3),
+        "files_per_second": round(files_seen / elapsed_seconds, 1) if elapsed_seconds else 0.0,
+        "peak_rss_mb": round(get_peak_rss_mb(), 1),
+        "walk_syscalls_per_file": round(walk_syscalls / files_seen, 4) if files_seen else 0.0,
+        "read_syscalls_per_file": round(read_syscalls / files_seen, 2) if read_syscalls is not None and files_seen else None,
+    }
+
+
+def find_regressions(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    if result["albums_found"] != baseline["albums_found"]:
+        regressions.append(f"found {result['albums_found']} albums instead of {baseline['albums_found']}")
+    if result["files_per_second"] < baseline["files_per_second"] * (1 - tolerance):
+        regressions.append(f"files/sec dropped from {baseline['files_per_second']} to {result['files_per_second']}")
+    if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+        regressions.append(f"peak RSS grew from {baseline['peak_rss_mb']}MB to {result['peak_rss_mb']}MB")
+    for metric in ["walk_syscalls_per_file", "read_syscalls_per_file"]:
+        if result[metric] is not None and baseline.get(metric) is not None and result[metric] > baseline[metric] * (1 + SYSCALLS_TOLERANCE):
+            regressions.append(f"{metric} grew from {baseline[metric]} to {result[metric]}")
+    return regressions
+
+
+def load_baseline(settings: dict[str, Any]) -> dict[str, Any]:
+    if not os.path.exists(BASELINE_FILE_PATH):
+        return {}
+    with open(BASELINE_FILE_PATH) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("settings") != settings:
+        print(f"baseline was recorded with {baseline.get('settings')}, not comparing")
+        return {}
+    return baseline.get("scenarios", {})
+
+
+def save_baseline(settings: dict[str, Any], results: dict[str, dict[str, Any]]):
+    os.makedirs(os.path.dirname(BASELINE_FILE_PATH), exist_ok=True)
+    with open(BASELINE_FILE_PATH, "w") as baseline_file:
+        json.dump({"settings": settings, "scenarios": results}, baseline_file, indent=4, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="benchmark the scanner on synthetic libraries")
+    parser.add_argument("--albums", type=int, default=2000, help="albums per generated library")
+    parser.add_argument("--link_mode", choices=["hardlink", "copy"], default="hardlink", help="how library files are created from the tagged templates")
+    parser.add_argument("--with_covers", action="store_true", help="embed a cover in every file")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative drop in files/sec and growth in peak RSS")
+    parser.add_argument("--update_baseline", action="store_true", help=f"store the results as the new baseline in {BASELINE_FILE_PATH}")
+    args = parser.parse_args()
+    settings = {"albums": args.albums, "link_mode": args.link_mode, "with_covers": args.with_covers}
+
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        generator = LibraryGenerator(os.path.join(work_dir, "templates"), args.link_mode, args.with_covers)
+        libraries = {}
+        for layout in sorted({scenario.split("-")[-1] for scenario in args.scenarios}):
+            start = time.perf_counter()
+            libraries[layout] = generator.generate(os.path.join(work_dir, layout), layout, args.albums)  # type: ignore
+            print(f"generated the {layout} library ({libraries[layout].total_files} files) in {time.perf_counter() - start:.1f}s")
+        context = multiprocessing.get_context("spawn")
+        for scenario in args.scenarios:
+            library = libraries[scenario.split("-")[-1]]
+            with context.Pool(1) as pool:
+                results[scenario] = pool.apply(run_scenario, (scenario, library.root_dir, library.album_folders))
+            if results[scenario]["albums_found"] != library.total_albums:
+                print(f"{scenario}: expected {library.total_albums} albums, found {results[scenario]['albums_found']}")
+
+    baseline = load_baseline(settings)
+    rows: list[tuple[Any, ...]] = []
+    regressions: dict[str, list[str]] = {}
+    for scenario, result in results.items():
+        if scenario in baseline:
+            regressions[scenario] = find_regressions(result, baseline[scenario], args.tolerance)
+        status = ("REGRESSED" if regressions[scenario] else "ok") if scenario in regressions else "no baseline"
+        rows.append(
+            (
+                scenario,
+                result["audio_files"],
+                result["albums_found"],
+                result["files_per_second"],
+                result["peak_rss_mb"],
+                result["walk_syscalls_per_file"],
+                result["read_syscalls_per_file"] if result["read_syscalls_per_file"] is not None else "-",
+                status,
+            )
+        )
+    columns = (
+        Column(header="Scenario"),
+        Column(header="Audio Files", justify="right"),
+        Column(header="Albums", justify="right"),
+        Column(header="Files/sec", justify="right", style="bold"),
+        Column(header="Peak RSS (MB)", justify="right"),
+        Column(header="Walk Syscalls/File", justify="right"),
+        Column(header="Read Syscalls/File", justify="right"),
+        Column(header="Baseline"),
+    )
+    tabulate(rows, columns=columns, title=f"scanner benchmark, {args.albums} albums per library ({args.link_mode})")
+    for scenario, scenario_regressions in regressions.items():
+        for regression in scenario_regressions:
+            print(f"{scenario}: {regression}")
+
+    if args.update_baseline:
+        save_baseline(settings, results)
+        print(f"baseline saved to {BASELINE_FILE_PATH}")
+        return 0
+    return 1 if any(regressions.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
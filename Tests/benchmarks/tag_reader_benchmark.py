@@ -0,0 +1,89 @@
+"""
+compares the header only fast tag reader against a full parse through unigen on every format of Tests/testSamples
+each sample is tagged like a typical album track and given an embedded cover of the requested size, since covers dominate the cost of a full parse
+usage: python -m Tests.benchmarks.tag_reader_benchmark [--cover_mb 2] [--iterations 200]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable
+from unigen import AudioFactory
+
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.fast_tag_reader import read_track_tags_fast
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Scan.tag_reader import read_track_tags
+from Modules.Tag import custom_tags
+from Tests.test_utils import create_minimal_flac_file, get_test_file_path
+
+EXTENSIONS = ["flac", "mp3", "m4a", "ogg", "opus"]
+
+
+def create_sample(folder: str, extension: str, cover_size: int) -> str:
+    file_path = os.path.join(folder, f"sample.{extension}")
+    if extension == "flac":
+        create_minimal_flac_file(file_path)
+    else:
+        shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+    audio_manager = AudioFactory.buildAudioManager(file_path)
+    audio_manager.setPictureOfType(b"\xff\xd8\xff\xe0" + os.urandom(cover_size), "Cover (front)")
+    audio_manager.setAlbum(["Benchmark Album"])
+    audio_manager.setDiscNumbers(1, 2)
+    audio_manager.setTrackNumbers(3, 12)
+    audio_manager.setDate("2014-05-13")
+    audio_manager.setCatalog(["BNCH-0001"])
+    audio_manager.setCustomTag(custom_tags.VGMDB_LINK, ["https://vgmdb.net/album/1"])
+    audio_manager.save()
+    return file_path
+
+
+def time_reader(reader: Callable[[str], Any], file_path: str, iterations: int) -> float:
+    """returns the average seconds per read"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        reader(file_path)
+    return (time.perf_counter() - start) / iterations
+
+
+def read_with_unigen(file_path: str) -> LocalTrackTags:
+    return LocalTrackTags.from_audio_manager(AudioFactory.buildAudioManager(file_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the fast tag reader against unigen")
+    parser.add_argument("--cover_mb", type=float, default=2, help="size of the embedded cover in MB")
+    parser.add_argument("--iterations", type=int, default=200, help="reads per format and reader")
+    args = parser.parse_args()
+
+    rows: list[tuple[Any, ...]] = []
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in EXTENSIONS:
+            file_path = create_sample(folder, extension, int(args.cover_mb * 1024 * 1024))
+            fast_path_used = read_track_tags_fast(file_path) is not None
+            if fast_path_used and read_track_tags_fast(file_path) != read_with_unigen(file_path):
+                raise AssertionError(f"fast reader disagrees with unigen for {extension}")
+            unigen_seconds = time_reader(read_with_unigen, file_path, args.iterations)
+            scanner_seconds = time_reader(read_track_tags, file_path, args.iterations)
+            rows.append(
+                (
+                    extension,
+                    "fast" if fast_path_used else "unigen fallback",
+                    f"{unigen_seconds * 1000:.3f}",
+                    f"{scanner_seconds * 1000:.3f}",
+                    f"{unigen_seconds / scanner_seconds:.1f}x",
+                )
+            )
+    columns = (
+        Column(header="Format"),
+        Column(header="Scanner Path"),
+        Column(header="unigen (ms/file)", justify="right"),
+        Column(header="Scanner (ms/file)", justify="right"),
+        Column(header="Speedup", justify="right", style="bold"),
+    )
+    tabulate(rows, columns=columns, title=f"tag reading with a {args.cover_mb}MB cover, {args.iterations} iterations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+cpu cost of the Tagger on a synthetic box set, without any file I/O
+tracks are backed by in-memory audio managers so that only the python work done per track is measured, which should stay
+negligible next to the time taken to save the files
+the album payload is built once per album, the "per track" row builds it for every track (which the Tagger used to do) to show what that costs
+usage: python -m Tests.benchmarks.tagger_benchmark [--tracks 2000] [--discs 20] [--credits 300]
+"""
+import argparse
+import contextlib
+import io
+import time
+from typing import Any, Callable, Optional
+from unigen.types.picture import PICTURE_NAME_TO_NUMBER, Picture
+
+from Imports.config import Config
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.models.local_album_data import LocalAlbumData, LocalTrackData
+from Modules.Tag.tagger import Tagger
+from Modules.VGMDB.models.vgmdb_album_data import (
+    ArrangerOrComposerOrLyricistOrPerformer,
+    Names,
+    OrganizationOrPublisherOrDistributor,
+    VgmdbAlbumData,
+    VgmdbDiscData,
+    VgmdbTrackData,
+)
+
+
+class MemoryAudioManager:
+    """the subset of IAudioManager used by the Tagger, kept in memory"""
+
+    def __init__(self):
+        self.tags: dict[str, Any] = {}
+        self.pictures: list[Picture] = []
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("get"):
+            return lambda: self.tags.get(name[3:], [] if name[3:] not in ["Date", "DiscNumber", "TotalDiscs", "TrackNumber", "TotalTracks"] else None)
+        if name.startswith("set"):
+            return lambda value: self.tags.__setitem__(name[3:], value)
+        raise AttributeError(name)
+
+    def getCustomTag(self, key: str) -> list[str]:
+        return self.tags.get(f"custom:{key}", [])
+
+    def setCustomTag(self, key: str, value: list[str]):
+        self.tags[f"custom:{key}"] = value
+
+    def getDiscNumber(self) -> Optional[int]:
+        return self.tags.get("DiscNumber")
+
+    def getTotalDiscs(self) -> Optional[int]:
+        return self.tags.get("TotalDiscs")
+
+    def setDiscNumbers(self, disc_number: int, total_discs: int):
+        self.tags["DiscNumber"], self.tags["TotalDiscs"] = disc_number, total_discs
+
+    def getTrackNumber(self) -> Optional[int]:
+        return self.tags.get("TrackNumber")
+
+    def getTotalTracks(self) -> Optional[int]:
+        return self.tags.get("TotalTracks")
+
+    def setTrackNumbers(self, track_number: int, total_tracks: int):
+        self.tags["TrackNumber"], self.tags["TotalTracks"] = track_number, total_tracks
+
+    def getAllPictures(self) -> list[Picture]:
+        return self.pictures
+
+    def deletePictureOfType(self, picture_type: str) -> bool:
+        self.pictures = [picture for picture in self.pictures if picture.picture_type != PICTURE_NAME_TO_NUMBER[picture_type]]  # type: ignore
+        return True
+
+    def setPictureOfType(self, data: bytes, picture_type: str):
+        self.pictures.append(Picture(picture_type=PICTURE_NAME_TO_NUMBER[picture_type], data=data))  # type: ignore
+
+
+def build_album(total_tracks: int, total_discs: int, total_credits: int) -> tuple[LocalAlbumData, VgmdbAlbumData]:
+    local_album_data = LocalAlbumData(album_folder_path="/music/Box Set")
+    discs: dict[int, VgmdbDiscData] = {}
+    tracks_per_disc = -(-total_tracks // total_discs)
+    for index in range(total_tracks):
+        disc_number, track_number = index // tracks_per_disc + 1, index % tracks_per_disc + 1
+        file_path = f"/music/Box Set/Disc {disc_number}/{track_number:03}. Track.flac"
+        local_album_data.set_track(disc_number, track_number, LocalTrackData(file_path, 2, audio_manager=MemoryAudioManager()))  # type: ignore
+        discs.setdefault(disc_number, VgmdbDiscData(tracks={})).tracks[track_number] = VgmdbTrackData(names=Names(en=f"Track {track_number}", ja=f"トラック {track_number}"))
+    credits = [ArrangerOrComposerOrLyricistOrPerformer(names=Names(en=f"Artist {index % (total_credits // 2 or 1)}")) for index in range(total_credits)]  # half of them are repeated
+    vgmdb_album_data = VgmdbAlbumData(
+        link="album/1",
+        name="Box Set",
+        names=Names(en="Box Set", ja="ボックスセット", **{"ja-latn": "Bokkusu Setto"}),
+        discs=discs,
+        media_format=f"{total_discs} CD",
+        notes="",
+        vgmdb_link="https://vgmdb.net/album/1",
+        release_date="2020-01-01",
+        catalog="BOX-0001~20",
+        barcode="4580000000000",
+        picture_full="https://media.vgm.io/albums/box.jpg",
+        picture_small=None,
+        picture_thumb=None,
+        arrangers=credits,
+        composers=credits,
+        lyricists=credits,
+        performers=credits,
+        organizations=[OrganizationOrPublisherOrDistributor(names=Names(en=f"Label {index}"), role=f"Role {index}") for index in range(5)],
+        album_id="1",
+        album_cover_cache=b"\xff\xd8" + bytes(300 * 1024),  # never downloaded
+    )
+    vgmdb_album_data.link_local_album_data(local_album_data)
+    return local_album_data, vgmdb_album_data
+
+
+def measure(operation: Callable[[], Any]) -> float:
+    """progress output is captured so that the terminal does not dominate the measurement"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        operation()
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the cpu cost of tagging a box set")
+    parser.add_argument("--tracks", type=int, default=2000)
+    parser.add_argument("--discs", type=int, default=20)
+    parser.add_argument("--credits", type=int, default=300, help="credits per role (arrangers, composers, ...), half of them repeated")
+    args = parser.parse_args()
+    config = Config(root_dir="/music/Box Set", arrangers=True, composers=True, lyricists=True, performers=True)
+
+    rows: list[tuple[Any, ...]] = []
+
+    def add_row(name: str, seconds: float):
+        rows.append((name, f"{seconds * 1000:.1f}", f"{seconds * 1e6 / args.tracks:.1f}"))
+
+    local_album_data, vgmdb_album_data = build_album(args.tracks, args.discs, args.credits)
+    tagger = Tagger(local_album_data, vgmdb_album_data, config)
+    add_row("track data", measure(tagger._tag_track_specific_data))
+    add_row("album data (first time)", measure(tagger._tag_album_specific_data))
+    add_row("album data (unchanged)", measure(tagger._tag_album_specific_data))
+    add_row("album payload per track", measure(lambda: [tagger._get_album_tag_payload() for _ in range(args.tracks)]))
+
+    names = [f"Artist {index % (args.credits // 2 or 1)}" for index in range(args.credits)]
+    add_row("quadratic dedupe per track", measure(lambda: [[x for i, x in enumerate(names) if x not in names[:i]] for _ in range(args.tracks)]))
+    add_row("dict.fromkeys dedupe per track", measure(lambda: [list(dict.fromkeys(names)) for _ in range(args.tracks)]))
+
+    columns = (
+        Column(header="Stage"),
+        Column(header="Total (ms)", justify="right"),
+        Column(header="Per Track (µs)", justify="right", style="bold"),
+    )
+    tabulate(rows, columns=columns, title=f"tagger cpu cost, {args.tracks} tracks on {args.discs} discs, {args.credits} credits per role")
+
+
+if __name__ == "__main__":
+    main()
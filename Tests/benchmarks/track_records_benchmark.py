@@ -0,0 +1,100 @@
+"""
+memory and construction time of the scan results for a synthetic library, slotted records against the pydantic models they replaced
+the pydantic models are reproduced here as they were, tags are created up front and shared by both, since they are the same LocalTrackTags for both
+usage: python -m Tests.benchmarks.track_records_benchmark [--tracks 100000] [--tracks_per_album 12]
+"""
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+from typing import Any, Callable
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from Modules.Print.table import Column, tabulate
+from Modules.Scan.models.local_album_data import LocalAlbumData, LocalTrackData
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+
+
+class PydanticTrackData(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    file_path: str = Field(frozen=True)
+    depth_in_parent_folder: int
+    tags: LocalTrackTags = Field(default_factory=LocalTrackTags)
+    _audio_manager: Any = PrivateAttr(default=None)
+
+
+class PydanticDiscData(BaseModel):
+    tracks: dict[int, PydanticTrackData] = {}
+
+
+class PydanticAlbumData(BaseModel):
+    album_folder_path: str
+    discs: dict[int, PydanticDiscData] = {}
+    unclean_tracks: list[PydanticTrackData] = []
+    shares_album_folder: bool = False
+
+
+def build_slotted(paths: list[tuple[str, list[str]]], tags: list[LocalTrackTags]) -> list[Any]:
+    albums: list[Any] = []
+    for album_folder, file_paths in paths:
+        album = LocalAlbumData(album_folder_path=album_folder)
+        for track_number, file_path in enumerate(file_paths, start=1):
+            album.set_track(1, track_number, LocalTrackData(file_path=file_path, depth_in_parent_folder=1, tags=tags[track_number - 1]))
+        albums.append(album)
+    return albums
+
+
+def build_pydantic(paths: list[tuple[str, list[str]]], tags: list[LocalTrackTags]) -> list[Any]:
+    albums: list[Any] = []
+    for album_folder, file_paths in paths:
+        album = PydanticAlbumData(album_folder_path=album_folder)
+        album.discs[1] = PydanticDiscData()
+        for track_number, file_path in enumerate(file_paths, start=1):
+            album.discs[1].tracks[track_number] = PydanticTrackData(file_path=file_path, depth_in_parent_folder=1, tags=tags[track_number - 1])
+        albums.append(album)
+    return albums
+
+
+def measure(build: Callable[[], list[Any]]) -> tuple[float, float]:
+    """returns (seconds, retained MB) of building the scan results"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    albums = build()
+    seconds = time.perf_counter() - start
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del albums
+    return seconds, retained_bytes / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark scan result records")
+    parser.add_argument("--tracks", type=int, default=100000, help="tracks in the synthetic library")
+    parser.add_argument("--tracks_per_album", type=int, default=12)
+    args = parser.parse_args()
+
+    tags = [LocalTrackTags(album=["Album"], catalog=["CAT-0001"], track_number=i) for i in range(1, args.tracks_per_album + 1)]
+    paths: list[tuple[str, list[str]]] = []
+    for album_index in range(-(-args.tracks // args.tracks_per_album)):
+        album_folder = os.path.join("/music", f"Label {album_index // 50:04}", f"[CAT-{album_index:05}] Album {album_index}")
+        paths.append((album_folder, [os.path.join(album_folder, f"{i:02}. Track Title {i}.flac") for i in range(1, args.tracks_per_album + 1)]))
+    del paths[-1][1][args.tracks % args.tracks_per_album or args.tracks_per_album :]
+
+    rows: list[tuple[Any, ...]] = []
+    for name, build in [("pydantic models", build_pydantic), ("slotted records", build_slotted)]:
+        seconds, retained_mb = measure(lambda: build(paths, tags))
+        rows.append((name, f"{seconds:.3f}", f"{args.tracks / seconds:.0f}", f"{retained_mb:.1f}", f"{retained_mb * 1024 * 1024 / args.tracks:.0f}"))
+    columns = (
+        Column(header="Representation"),
+        Column(header="Construct (s)", justify="right"),
+        Column(header="Tracks/sec", justify="right", style="bold"),
+        Column(header="Retained (MB)", justify="right", style="bold"),
+        Column(header="Bytes/Track", justify="right"),
+    )
+    tabulate(rows, columns=columns, title=f"scan results of {args.tracks} tracks (paths included, shared tags excluded)")
+
+
+if __name__ == "__main__":
+    main()
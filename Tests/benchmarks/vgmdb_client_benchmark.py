@@ -0,0 +1,87 @@
+"""
+time taken to fetch the details of many albums from a local server answering after a fixed latency, one at a time against concurrently
+usage: python -m Tests.benchmarks.vgmdb_client_benchmark [--albums 200] [--latency_ms 100] [--concurrency 1 4 8 16]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from Modules.Print.table import Column, tabulate
+from Modules.VGMDB.api.client import VgmdbClient
+
+LATENCY_SECONDS = 0.1
+
+
+class LatencyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(LATENCY_SECONDS)
+        album_id = self.path.split("/")[-1]
+        data = {
+            "link": f"album/{album_id}",
+            "name": f"Album {album_id}",
+            "names": {"en": f"Album {album_id}"},
+            "discs": [],
+            "media_format": "CD",
+            "notes": "",
+            "vgmdb_link": f"https://vgmdb.net/album/{album_id}",
+            "picture_full": None,
+            "picture_small": None,
+            "picture_thumb": None,
+            "arrangers": [],
+            "composers": [],
+            "lyricists": [],
+            "performers": [],
+        }
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object):
+        pass
+
+
+def main():
+    global LATENCY_SECONDS
+    parser = argparse.ArgumentParser(description="benchmark fetching album details concurrently")
+    parser.add_argument("--albums", type=int, default=200)
+    parser.add_argument("--latency_ms", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+    LATENCY_SECONDS = args.latency_ms / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LatencyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    album_ids = [str(album_id) for album_id in range(args.albums)]
+    rows: list[tuple[Any, ...]] = []
+
+    client = VgmdbClient(base_url=base_url)
+    start = time.perf_counter()
+    for album_id in album_ids:
+        client.get_album_details(album_id)
+    seconds = time.perf_counter() - start
+    client.close()
+    rows.append(("one at a time (as the CLI fetches)", f"{seconds:.2f}", f"{args.albums / seconds:.1f}"))
+    for concurrency in args.concurrency:
+        client = VgmdbClient(base_url=base_url, max_concurrent_requests=concurrency)
+        start = time.perf_counter()
+        client.get_many_album_details(album_ids)
+        seconds = time.perf_counter() - start
+        client.close()
+        rows.append((f"{concurrency} at once", f"{seconds:.2f}", f"{args.albums / seconds:.1f}"))
+    server.shutdown()
+
+    columns = (Column(header="Fetching"), Column(header="Time (s)", justify="right"), Column(header="Albums/s", justify="right", style="bold"))
+    tabulate(rows, columns=columns, title=f"fetching {args.albums} albums with {args.latency_ms} ms of latency")
+
+
+if __name__ == "__main__":
+    main()
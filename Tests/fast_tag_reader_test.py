@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory, IAudioManager
+
+from Modules.Scan.fast_tag_reader import read_track_tags_fast
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Tag import custom_tags
+from Tests.test_utils import create_minimal_flac_file, getRandomCoverImageData, get_test_file_path
+
+
+class TestFastTagReader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_file(self, extension: str) -> str:
+        file_path = os.path.join(self.temp_dir.name, f"track.{extension}")
+        if extension == "flac":
+            create_minimal_flac_file(file_path)
+        else:
+            shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+        return file_path
+
+    def _tag(self, audio_manager: IAudioManager):
+        audio_manager.setPictureOfType(getRandomCoverImageData(), "Cover (front)")
+        audio_manager.setTitle(["メインテーマ", "Main Theme"])
+        audio_manager.setAlbum(["ゼノブレイド オリジナル・サウンドトラック", "Xenoblade Original Soundtrack"])
+        audio_manager.setDiscName(["Disc of Light"])
+        audio_manager.setDiscNumbers(2, 4)
+        audio_manager.setTrackNumbers(7, 19)
+        audio_manager.setDate("2010-6-23")
+        audio_manager.setCatalog(["DFCL-1771~4"])
+        audio_manager.setBarcode(["4582117980943"])
+        audio_manager.setCustomTag(custom_tags.VGMDB_LINK, ["https://vgmdb.net/album/19513"])
+        audio_manager.setCustomTag(custom_tags.VGMDB_ID, ["19513"])
+        audio_manager.setCustomTag(custom_tags.YEAR, ["2010"])
+
+    def _assert_same_as_unigen(self, file_path: str):
+        tags = read_track_tags_fast(file_path)
+        self.assertIsNotNone(tags)
+        self.assertEqual(tags, LocalTrackTags.from_audio_manager(AudioFactory.buildAudioManager(file_path)))
+
+    def test_matches_unigen(self):
+        for extension in ["flac", "mp3", "m4a"]:
+            with self.subTest(extension=extension):
+                file_path = self._create_file(extension)
+                self._assert_same_as_unigen(file_path)  # untagged
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                self._tag(audio_manager)
+                audio_manager.save()
+                self._assert_same_as_unigen(file_path)
+                tags = read_track_tags_fast(file_path)
+                assert tags
+                self.assertEqual((tags.disc_number, tags.total_discs, tags.total_tracks, tags.disc_name), (2, 4, 19, ["Disc of Light"]))
+
+    def test_id3v23_dates(self):
+        file_path = self._create_file("mp3")
+        audio_manager = AudioFactory.buildAudioManager(file_path)
+        self._tag(audio_manager)
+        audio_manager.audio.save(v2_version=3)  # TDRC is stored as TYER and TDAT
+        self._assert_same_as_unigen(file_path)
+        self.assertEqual(read_track_tags_fast(file_path).date, "2010-06-23")  # type: ignore
+
+    def test_unhandled_files_fall_back(self):
+        self.assertIsNone(read_track_tags_fast(self._create_file("ogg")))
+        corrupt_file_path = os.path.join(self.temp_dir.name, "corrupt.flac")
+        with open(corrupt_file_path, "wb") as file:
+            file.write(b"fLaC\x04\xff\xff\xff")
+        self.assertIsNone(read_track_tags_fast(corrupt_file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import time
+import unittest
+from typing import Any
+
+from Modules.Utils.rate_limiter import get_rate_limiter
+from Modules.VGMDB.api.async_client import AsyncVgmdbClient
+from Modules.VGMDB.api.transport import CircuitBreaker, HedgedTransport, LatencyHistogram, VgmdbServerException
+from Tests.test_utils import FakeClock, FakeVgmdbInfoServer
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram(bounds=[0.1, 0.2, 0.4, 0.8])
+        self.assertEqual(histogram.percentile(0.9), 0)
+        for seconds in [0.05] * 8 + [0.3, 5]:
+            histogram.record(seconds)
+        self.assertEqual(histogram.percentile(0.5), 0.1)
+        self.assertEqual(histogram.percentile(0.9), 0.4)
+        self.assertEqual(histogram.percentile(1), 0.8)  # beyond the last bound
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_lets_a_trial_through(self):
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=clock)
+        circuit_breaker.record_failure()
+        self.assertTrue(circuit_breaker.allow())
+        circuit_breaker.record_failure()
+        self.assertFalse(circuit_breaker.allow())
+        clock.now = 10
+        self.assertTrue(circuit_breaker.allow())
+        self.assertFalse(circuit_breaker.allow())  # a single trial at once
+        circuit_breaker.record_failure()
+        clock.now = 15
+        self.assertFalse(circuit_breaker.allow())
+        clock.now = 20
+        self.assertTrue(circuit_breaker.allow())
+        circuit_breaker.record_success()
+        self.assertEqual((circuit_breaker.state, circuit_breaker.times_opened), (CircuitBreaker.CLOSED, 2))
+
+
+class TestHedgedTransport(unittest.TestCase):
+    def setUp(self):
+        get_rate_limiter().configure(max_requests_per_second=0)  # shared by the process, another test may have bound it
+
+    def _start_server(self, delay_seconds: float = 0, status: int = 200) -> tuple[str, list[str]]:
+        server = FakeVgmdbInfoServer(delay_seconds=delay_seconds, status=status)
+        self.addCleanup(server.close)
+        return server.base_url, server.requests_seen
+
+    def _get_many(self, transport: HedgedTransport, total: int) -> list[Any]:
+        """the base url of the server which answered every request, or the exception raised for it"""
+
+        async def get_all():
+            results: list[Any] = []
+            for index in range(total):
+                try:
+                    response = await transport.get(f"album/{index}", {})
+                    results.append(str(response.url).removesuffix(f"album/{index}"))
+                except VgmdbServerException as e:
+                    results.append(e)
+            await transport.close()
+            return results
+
+        return asyncio.run(get_all())
+
+    def test_slow_server_is_hedged(self):
+        slow_url, _ = self._start_server(delay_seconds=1)
+        fast_url, _ = self._start_server()
+        transport = HedgedTransport([slow_url, fast_url], default_hedge_delay=0.05)
+        start = time.perf_counter()
+        results = self._get_many(transport, 2)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(results, [fast_url] * 2)
+        self.assertEqual((transport.hedges_sent, transport.endpoints[1].hedges_won), (2, 2))
+
+    def test_cancelled_trial_does_not_close_the_server_for_good(self):
+        slow_url, slow_requests = self._start_server(delay_seconds=1)
+        fast_url, _ = self._start_server()
+        clock = FakeClock()
+        transport = HedgedTransport([slow_url, fast_url], default_hedge_delay=0.05, failure_threshold=1, reset_seconds=10, clock=clock)
+        circuit_breaker = transport.endpoints[0].circuit_breaker
+        circuit_breaker.record_failure()
+        clock.now = 10
+        self.assertEqual(self._get_many(transport, 1), [fast_url])  # the trial request to the slow server is cancelled by the hedge
+        self.assertEqual((len(slow_requests), circuit_breaker.state), (1, CircuitBreaker.OPEN))
+        self.assertFalse(circuit_breaker.allow())
+        clock.now = 20
+        self.assertTrue(circuit_breaker.allow())
+
+    def test_failing_server_trips_its_circuit_breaker(self):
+        failing_url, failing_requests = self._start_server(status=503)
+        healthy_url, _ = self._start_server()
+        transport = HedgedTransport([failing_url, healthy_url], failure_threshold=3, hedge=False)
+        results = self._get_many(transport, 6)
+        self.assertEqual(results, [healthy_url] * 6)  # every failure goes to the next server right away
+        self.assertEqual(len(failing_requests), 3)
+        self.assertEqual(transport.endpoints[0].circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(len(transport.summary()), 2)
+
+    def test_every_server_failing(self):
+        failing_url, failing_requests = self._start_server(status=500)
+        transport = HedgedTransport([failing_url], failure_threshold=2, hedge=False)
+        results = self._get_many(transport, 3)
+        self.assertTrue(all(isinstance(result, VgmdbServerException) for result in results))
+        self.assertEqual(len(failing_requests), 2)  # the last request is not sent at all
+
+    def test_client_does_not_retry_client_errors(self):
+        missing_url, missing_requests = self._start_server(status=404)
+
+        async def get():
+            async_client = AsyncVgmdbClient(missing_url)
+            result = await async_client.get_request(f"{missing_url}album/1")
+            await async_client.close()
+            return result
+
+        self.assertIsInstance(asyncio.run(get()), Exception)
+        self.assertEqual(missing_requests, ["/album/1"])
+
+    def test_client_falls_back_with_the_same_path(self):
+        failing_url, _ = self._start_server(status=502)
+        fallback_url, fallback_requests = self._start_server()
+
+        async def get():
+            async_client = AsyncVgmdbClient(failing_url, fallback_base_urls=[fallback_url])
+            result = await async_client.get_request(f"{failing_url}search?q=Rewrite")
+            await async_client.close()
+            return result
+
+        self.assertEqual(asyncio.run(get())["results"]["albums"][0]["catalog"], "KSLA-0001")
+        self.assertEqual(fallback_requests, ["/search?q=Rewrite"])
+
+
+if __name__ == "__main__":
+    unittest.main()
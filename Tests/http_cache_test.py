@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+from Modules.Utils.rate_limiter import get_rate_limiter
+from Modules.VGMDB.api.client import VgmdbClient
+from Modules.VGMDB.api.http_cache import HttpCache, normalize_url
+from Modules.VGMDB.constants import ALBUM_CACHE_TTL_SECONDS, SEARCH_CACHE_TTL_SECONDS
+from Tests.test_utils import FakeClock, FakeVgmdbInfoServer
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "responses.sqlite")
+        self.clock = FakeClock(now=1_000_000.0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_normalize_url(self):
+        base_url = "http://localhost:5020/"
+        self.assertEqual(normalize_url("http://localhost:5020/album/551", base_url), "album/551")
+        self.assertEqual(normalize_url("http://localhost:5020/search?q=Rewrite   OST ", base_url), "search?q=Rewrite+OST")
+        self.assertEqual(normalize_url("http://localhost:5020/search?q=a&format=json", base_url), normalize_url("http://localhost:5020/search?format=json&q=a", base_url))
+        self.assertEqual(normalize_url("https://VGMDB.info/album/551/", base_url), "vgmdb.info/album/551")
+
+    def test_ttl_and_persistence(self):
+        http_cache = HttpCache(self.cache_path, clock=self.clock)
+        http_cache.put("album/551", {"name": "Rewrite"}, etag='"abc"')
+        http_cache.close()
+
+        http_cache = HttpCache(self.cache_path, clock=self.clock)
+        cached_response, fresh = http_cache.get("album/551", ttl_seconds=60)
+        self.assertTrue(fresh)
+        assert cached_response
+        self.assertEqual((cached_response.data, cached_response.etag), ({"name": "Rewrite"}, '"abc"'))
+        self.clock.now += 61
+        cached_response, fresh = http_cache.get("album/551", ttl_seconds=60)
+        self.assertFalse(fresh)
+        self.assertIsNotNone(cached_response)  # kept for revalidation
+        http_cache.refresh("album/551")
+        self.assertTrue(http_cache.get("album/551", ttl_seconds=60)[1])
+        self.assertEqual(http_cache.get("album/1", ttl_seconds=60), (None, False))
+        self.assertEqual((http_cache.hits, http_cache.misses, http_cache.revalidations), (2, 2, 1))
+        http_cache.close()
+
+    def test_least_recently_used_responses_are_evicted(self):
+        http_cache = HttpCache(self.cache_path, max_bytes=3000, clock=self.clock)
+        for album_id in range(3):
+            self.clock.now += 1
+            http_cache.put(f"album/{album_id}", {"notes": "x" * 900})
+        self.clock.now += 1
+        http_cache.get("album/0", ttl_seconds=60)  # album/1 is now the least recently used
+        self.clock.now += 1
+        http_cache.put("album/3", {"notes": "x" * 900})
+        self.assertEqual([http_cache.get(f"album/{album_id}", ttl_seconds=60)[0] is not None for album_id in range(4)], [True, False, True, True])
+        self.assertLessEqual(http_cache.get_size(), 3000)
+        http_cache.close()
+
+
+class TestVgmdbClientCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "responses.sqlite")
+        self.clock = FakeClock(now=1_000_000.0)
+        get_rate_limiter().configure(max_requests_per_second=0)  # shared by the process, another test may have bound it
+        self.server = FakeVgmdbInfoServer()
+        self.base_url = self.server.base_url
+
+    def tearDown(self):
+        self.server.close()
+        self.temp_dir.cleanup()
+
+    def _get_client(self) -> VgmdbClient:
+        http_cache = HttpCache(self.cache_path, clock=self.clock)
+        client = VgmdbClient(http_cache=http_cache, base_url=self.base_url)
+        self.addCleanup(http_cache.close)
+        self.addCleanup(client.close)
+        return client
+
+    def test_repeat_runs_do_not_download_again(self):
+        first_client = self._get_client()
+        first_client.search_album("Rewrite OST")
+        self.assertEqual(first_client.get_request(self.base_url + "album/551", ttl_seconds=ALBUM_CACHE_TTL_SECONDS)["link"], "album/551")
+        self.assertEqual(len(self.server.requests_seen), 2)
+
+        second_client = self._get_client()  # a new run
+        second_client.search_album("Rewrite: OST")  # cleaned to the same search term
+        second_client.get_request(self.base_url + "album/551", ttl_seconds=ALBUM_CACHE_TTL_SECONDS)
+        self.assertEqual(len(self.server.requests_seen), 2)
+
+        self.clock.now += SEARCH_CACHE_TTL_SECONDS + 1  # searches expire long before albums
+        third_client = self._get_client()
+        third_client.search_album("Rewrite OST")
+        third_client.get_request(self.base_url + "album/551", ttl_seconds=ALBUM_CACHE_TTL_SECONDS)
+        self.assertEqual(len(self.server.requests_seen), 3)
+        assert third_client.http_cache
+        self.assertEqual(third_client.http_cache.revalidations, 1)  # answered with a 304
+
+    def test_uncached_requests(self):
+        client = VgmdbClient(base_url=self.base_url)
+        self.addCleanup(client.close)
+        client.get_request(self.base_url + "album/551", ttl_seconds=ALBUM_CACHE_TTL_SECONDS)
+        client.get_request(self.base_url + "album/551", ttl_seconds=ALBUM_CACHE_TTL_SECONDS)
+        self.assertEqual(len(self.server.requests_seen), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from Modules.Utils.io_governor import IOGovernor, TokenBucket
+from Tests.test_utils import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_writes_beyond_the_burst_wait(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, burst=100, clock=clock, sleep=clock.sleep)
+        self.assertEqual(bucket.consume(100), 0)  # the burst is available up front
+        self.assertEqual(bucket.consume(50), 0.5)
+        self.assertEqual(bucket.consume(300), 3)  # a write larger than the burst only waits for its own size
+        clock.now += 10
+        self.assertEqual(bucket.consume(100), 0)  # refilled, but never beyond the burst
+        self.assertEqual(bucket.consume(1), 0.01)
+        self.assertAlmostEqual(clock.now, 13.51)
+
+    def test_average_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10 * 1024 * 1024, clock=clock, sleep=clock.sleep)
+        for _ in range(100):
+            bucket.consume(1024 * 1024)
+        self.assertAlmostEqual(clock.now, 9)  # 100 MB at 10 MB/s, after the first second worth of burst
+
+
+class TestIOGovernor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unbounded_writes_are_only_measured(self):
+        governor = IOGovernor()
+        for _ in range(4):
+            governor.throttle(1024 * 1024)
+        self.assertEqual((governor.bytes_written, governor.operations, governor.throttled_seconds), (4 * 1024 * 1024, 4, 0))
+        self.assertIn("wrote 4.0 MB in 4 writes", governor.summary())
+
+    def test_operations_bound(self):
+        clock = FakeClock()
+        governor = IOGovernor(max_operations_per_second=10)
+        governor.operations_bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+        for _ in range(30):
+            governor.throttle(0)
+        self.assertAlmostEqual(governor.throttled_seconds, 2)
+        self.assertIn("held back for 2.0 seconds", governor.summary())
+
+    def test_backups_and_renames_go_through_the_governor(self):
+        album_folder = os.path.join(self.temp_dir.name, "Album")
+        os.makedirs(os.path.join(album_folder, "Disc 1"))
+        for index in range(3):
+            with open(os.path.join(album_folder, "Disc 1", f"{index}.flac"), "wb") as file:
+                file.write(os.urandom(1024 * 1024 + 1))  # two chunks each
+        governor = IOGovernor(max_bytes_per_second=1024 * 1024 * 1024)
+        backup_folder = os.path.join(self.temp_dir.name, "Backup")
+        shutil.copytree(album_folder, backup_folder, copy_function=governor.copy_file)
+        with open(os.path.join(album_folder, "Disc 1", "1.flac"), "rb") as source, open(os.path.join(backup_folder, "Disc 1", "1.flac"), "rb") as copy:
+            self.assertEqual(source.read(), copy.read())
+        self.assertEqual((governor.bytes_written, governor.operations), (3 * (1024 * 1024 + 1), 6))
+        governor.rename(backup_folder, album_folder + " (Backup)")
+        self.assertTrue(os.path.isdir(album_folder + " (Backup)"))
+        self.assertEqual(governor.operations, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Journal import constants
+from Modules.Journal.journal import Journal, JournalException, get_album_key, get_journal_path
+from Modules.VGMDB.user_interface.cli import CLI
+from Tests.test_utils import get_test_file_path
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = os.path.join(self.temp_dir.name, "Music")
+        self.journal_path = os.path.join(self.temp_dir.name, "journal.jsonl")
+        self.album = os.path.join(self.root_dir, "Album")
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _get_journal(self, resume: bool = False) -> Journal:
+        journal = Journal(self.root_dir, resume=resume, journal_path=self.journal_path)
+        self.addCleanup(journal.close)  # before the temporary directory is removed
+        return journal
+
+    def test_resume_picks_up_the_recorded_stages(self):
+        journal = self._get_journal()
+        journal.record(self.album, "fetched", album_id="19513")
+        journal.record(self.album, "confirmed")
+        journal.record(self.album, "tagged")
+        journal.record(self.album, "saved", file_path=os.path.join(self.album, "01.flac"))
+        journal.close()  # interrupted while saving the other files
+
+        resumed_journal = self._get_journal(resume=True)
+        state = resumed_journal.get_album_state(self.album + os.sep)
+        assert state
+        self.assertEqual((state.album_id, state.stages, state.done), ("19513", {"fetched", "confirmed", "tagged"}, False))
+        self.assertTrue(state.is_file_saved(os.path.join(self.album, ".", "01.flac")))
+        self.assertFalse(state.is_file_saved(os.path.join(self.album, "02.flac")))
+        self.assertIsNone(resumed_journal.get_album_state(os.path.join(self.root_dir, "Other Album")))
+        resumed_journal.close()
+
+    def test_renamed_albums_are_found_under_their_new_name(self):
+        renamed_album = os.path.join(self.root_dir, "[2010.06.23] Album")
+        journal = self._get_journal()
+        journal.record(self.album, "renamed", new_path=renamed_album)
+        journal.record(self.album, "done")
+        journal.close()
+        state = self._get_journal(resume=True).get_album_state(renamed_album)
+        assert state
+        self.assertTrue(state.done)
+
+    def test_entries_are_synced_in_batches(self):
+        journal = self._get_journal()
+        for track_number in range(constants.JOURNAL_FSYNC_INTERVAL_ENTRIES * 2):
+            journal.record(self.album, "saved", file_path=os.path.join(self.album, f"{track_number}.flac"))
+        self.assertEqual(journal.syncs, 2)
+        with open(self.journal_path) as file:
+            self.assertEqual(len(file.readlines()), constants.JOURNAL_FSYNC_INTERVAL_ENTRIES * 2 + 1)  # unsynced entries are written as well
+        journal.close()
+
+    def test_torn_entries_and_fresh_runs(self):
+        journal = self._get_journal()
+        journal.record(self.album, "done")
+        journal.close()
+        with open(self.journal_path, "a") as file:
+            file.write('{"album": "/Mus')  # cut short by a power loss
+        resumed_journal = self._get_journal(resume=True)
+        self.assertTrue(resumed_journal.get_album_state(self.album).done)  # type: ignore
+        other_album = os.path.join(self.root_dir, "Other Album")
+        resumed_journal.record(other_album, "done")
+        resumed_journal.close()
+        self.assertTrue(self._get_journal(resume=True).get_album_state(other_album).done)  # type: ignore
+        self.assertIsNone(self._get_journal().get_album_state(self.album))  # without resuming the journal starts over
+        self.assertIsNone(self._get_journal(resume=True).get_album_state(self.album))
+
+        with open(self.journal_path, "w") as file:
+            file.write('{"format": "something else", "version": 1, "root_dir": "/"}\n')
+        with self.assertRaises(JournalException):
+            self._get_journal(resume=True)
+
+    def test_albums_sharing_a_folder_have_their_own_state(self):
+        first_album = get_album_key(self.album, [os.path.join(self.album, "01.flac"), os.path.join(self.album, "02.flac")])
+        second_album = get_album_key(self.album, [os.path.join(self.album, "03.flac")])
+        self.assertNotEqual(first_album, second_album)
+        self.assertEqual(first_album, get_album_key(self.album + os.sep, [os.path.join(self.album, "02.flac"), os.path.join(self.album, "01.flac")]))
+        self.assertEqual(get_album_key(self.album + os.sep), self.album)
+        journal = self._get_journal()
+        journal.record(first_album, "done")
+        self.assertIsNone(journal.get_album_state(second_album))
+        journal.close()
+
+    def test_journal_path_per_root_dir(self):
+        self.assertEqual(get_journal_path(self.root_dir), get_journal_path(self.root_dir + os.sep))
+        self.assertNotEqual(get_journal_path(self.root_dir), get_journal_path(os.path.join(self.temp_dir.name, "Other", "Music")))
+        self.assertTrue(os.path.basename(get_journal_path(self.root_dir)).startswith("Music-"))
+
+
+class TestResumingRuns(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.album_folder = os.path.join(self.temp_dir.name, "Music", "Album")
+        os.makedirs(self.album_folder)
+        file_path = os.path.join(self.album_folder, "01.mp3")
+        shutil.copy(get_test_file_path("mp3", use_modified_folder=False), file_path)
+        audio_manager = AudioFactory.buildAudioManager(file_path)
+        audio_manager.setAlbum(["Xenoblade"])
+        audio_manager.setTrackNumbers(1, 1)
+        audio_manager.save()
+        cache_dir_patch = mock.patch("Modules.Journal.journal.CACHE_DIR", os.path.join(self.temp_dir.name, "cache"))
+        cache_dir_patch.start()
+        self.addCleanup(cache_dir_patch.stop)
+
+    def _run(self, resume: bool, tagged: bool | Exception) -> int:
+        """runs the CLI over the album with tagging stubbed out, returns the number of times the album was tagged"""
+        config = Config(root_dir=self.album_folder, resume=resume, no_input=True, organize=False, scan_index=False, http_cache=False, prefetch_albums=0, max_requests_per_second=0)
+        with mock.patch.object(CLI, "tag", side_effect=tagged if isinstance(tagged, Exception) else None, return_value=tagged) as tag:
+            CLI(config).run()
+        return tag.call_count
+
+    def test_albums_not_tagged_are_resumed(self):
+        self.assertEqual(self._run(resume=False, tagged=False), 1)  # declined, or the files failed to save
+        self.assertEqual(self._run(resume=True, tagged=Exception("could not find the album")), 1)
+        self.assertEqual(self._run(resume=True, tagged=True), 1)
+        self.assertEqual(self._run(resume=True, tagged=True), 0)  # done
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,8 @@ import sys
 sys.path.append(os.getcwd())
 # REMOVE
 
-from Modules.Scan.models.local_album_data import LocalTrackData
+from Modules.Scan.models.local_album_data import LocalAlbumData, LocalAlbumDataModel, LocalTrackData
+from Modules.Scan.models.local_track_tags import LocalTrackTags
 from Tests.test_utils import get_test_file_path
 
 
@@ -154,5 +155,27 @@ class TestRenameTemplate(unittest.TestCase):
         )
 
 
+class TestLocalAlbumData(unittest.TestCase):
+    def test_tracks_share_interned_folder_and_extension(self):
+        first = LocalTrackData(file_path="/music/" + "album/01.flac", depth_in_parent_folder=1)
+        second = LocalTrackData(file_path="/music/" + "album/02.flac", depth_in_parent_folder=1)
+        self.assertEqual((first.file_path, first.file_name, first.extension), ("/music/album/01.flac", "01.flac", ".flac"))
+        self.assertIs(first._folder_path, second._folder_path)
+        self.assertIs(first.extension, second.extension)
+        self.assertEqual(first, LocalTrackData(file_path="/music/album/01.flac", depth_in_parent_folder=2))
+        self.assertFalse(hasattr(first, "__dict__"))
+
+    def test_model_round_trip(self):
+        album = LocalAlbumData(album_folder_path="/music/album", shares_album_folder=True)
+        album.set_track(1, 1, LocalTrackData(file_path="/music/album/01.flac", depth_in_parent_folder=1, tags=LocalTrackTags(album=["Album"], track_number=1)))
+        album.unclean_tracks.append(LocalTrackData(file_path="/music/album/bonus.flac", depth_in_parent_folder=1))
+        model = LocalAlbumDataModel.model_validate_json(album.to_model().model_dump_json())
+        restored = LocalAlbumData.from_model(model)
+        self.assertEqual(restored.album_folder_path, album.album_folder_path)
+        self.assertTrue(restored.shares_album_folder)
+        self.assertEqual(restored.get_track(1, 1).tags.album, ["Album"])  # type: ignore
+        self.assertEqual(restored.get_all_tracks(), album.get_all_tracks())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,43 @@
+import threading
+import time
+import unittest
+
+from Modules.Utils.memory_budget import MemoryBudget
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def _run_concurrently(self, budget: MemoryBudget, sizes: list[int]) -> int:
+        """returns the highest number of reservations held at once"""
+        held, max_held, lock = 0, 0, threading.Lock()
+
+        def reserve(size: int):
+            nonlocal held, max_held
+            with budget.reserve(size):
+                with lock:
+                    held += 1
+                    max_held = max(max_held, held)
+                time.sleep(0.01)
+                with lock:
+                    held -= 1
+
+        threads = [threading.Thread(target=reserve, args=(size,)) for size in sizes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return max_held
+
+    def test_reservations_stay_under_the_ceiling(self):
+        budget = MemoryBudget(max_bytes=100)
+        self._run_concurrently(budget, [40] * 8)
+        self.assertLessEqual(budget.peak_reserved_bytes, 100)
+        self.assertEqual(budget.reserved_bytes, 0)
+
+    def test_oversized_reservations_run_alone(self):
+        budget = MemoryBudget(max_bytes=100)
+        self.assertEqual(self._run_concurrently(budget, [150] * 4), 1)
+        self.assertEqual(budget.peak_reserved_bytes, 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from mutagen import PaddingInfo
+from unigen import AudioFactory
+
+from Modules.Scan.audio_manager_pool import AudioManagerPool, run_on_audio_manager
+from Modules.Tag import constants
+from Modules.Tag.padded_save import get_padding, save_with_padding
+from Tests.test_utils import create_minimal_flac_file, getRandomCoverImageData, get_test_file_path
+
+
+class TestPaddedSave(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_file(self, extension: str) -> str:
+        file_path = os.path.join(self.temp_dir.name, f"track.{extension}")
+        if extension == "flac":
+            create_minimal_flac_file(file_path)
+        else:
+            shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+        return file_path
+
+    def test_padding(self):
+        self.assertEqual(get_padding(PaddingInfo(padding=5000, size=10**8)), 5000)  # existing padding is never shrunk
+        self.assertEqual(get_padding(PaddingInfo(padding=-1, size=10**6)), constants.TAG_PADDING_MIN_BYTES)
+        self.assertEqual(get_padding(PaddingInfo(padding=-1, size=10**8)), int(10**8 * constants.TAG_PADDING_AUDIO_RATIO))
+        self.assertEqual(get_padding(PaddingInfo(padding=-1, size=10**10)), constants.TAG_PADDING_MAX_BYTES)
+
+    def test_tagging_again_happens_in_place(self):
+        for extension in ["flac", "mp3", "m4a", "ogg", "opus"]:
+            with self.subTest(extension=extension):
+                file_path = self._create_file(extension)
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                audio_manager.setPictureOfType(getRandomCoverImageData(), "Cover (front)")
+                audio_manager.setAlbum(["Album"])
+                first_save = save_with_padding(audio_manager)
+                assert first_save
+                self.assertFalse(first_save.in_place)
+                self.assertGreater(first_save.bytes_written, first_save.padding_bytes)
+                self.assertGreaterEqual(first_save.padding_bytes, constants.TAG_PADDING_MIN_BYTES)
+
+                file_size = os.path.getsize(file_path)
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                audio_manager.setAlbum(["A much longer album name than before", "with a second value"])
+                audio_manager.setCatalog(["CAT-0001"])
+                second_save = save_with_padding(audio_manager)
+                assert second_save
+                self.assertTrue(second_save.in_place)
+                self.assertEqual(os.path.getsize(file_path), file_size)
+                if extension != "flac":  # the minimal flac file has no audio frames, its metadata is the whole file
+                    self.assertLess(second_save.bytes_written, file_size)
+                self.assertLess(second_save.bytes_written, first_save.bytes_written)
+                self.assertEqual(AudioFactory.buildAudioManager(file_path).getAlbum(), ["A much longer album name than before", "with a second value"])
+
+    def test_pooled_save_marks_clean(self):
+        file_path = self._create_file("mp3")
+        pool = AudioManagerPool()
+        handle = pool.get_handle(file_path)
+        handle.setAlbum(["Pooled"])
+        self.assertTrue(pool.is_dirty(file_path))
+        self.assertIsNotNone(run_on_audio_manager(handle, save_with_padding, saves=True))
+        self.assertFalse(pool.is_dirty(file_path))
+        self.assertEqual(AudioFactory.buildAudioManager(file_path).getAlbum(), ["Pooled"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Organize.organizer import Organizer
+from Modules.Plan.models.album_plan import AlbumPlan, FileTagPlan
+from Modules.Plan.plan_applier import PlanApplier
+from Modules.Plan.plan_file import PlanException, PlanWriter, get_sidecar_folder, read_plan
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
+from Modules.Scan.scanner import Scanner
+from Modules.Tag.tagger import Tagger
+from Tests.tagger_test import get_vgmdb_album_data
+from Tests.test_utils import getRandomCoverImageData, get_test_file_path
+
+EXTENSIONS = ["mp3", "ogg", "m4a", "opus"]
+
+
+class TestPlan(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.album_folder = os.path.join(self.temp_dir.name, "Music", "Album")
+        self.plan_path = os.path.join(self.temp_dir.name, "plan.jsonl")
+        self.cover_data = getRandomCoverImageData()
+        for disc_number in range(1, 3):
+            for track_number in range(1, 3):
+                extension = EXTENSIONS[(disc_number - 1) * 2 + track_number - 1]
+                file_path = os.path.join(self.album_folder, f"Disc {disc_number}", f"{track_number:02}.{extension}")
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                audio_manager.clearTags()
+                audio_manager.setAlbum(["Xenoblade"])
+                audio_manager.setDiscNumbers(disc_number, 2)
+                audio_manager.setTrackNumbers(track_number, 2)
+                audio_manager.save()
+        self.config = Config(root_dir=self.album_folder, composers=True)
+
+    def tearDown(self):
+        get_audio_manager_pool().evict_modified = True
+        self.temp_dir.cleanup()
+
+    def _plan_album(self) -> AlbumPlan:
+        """what the CLI does for every album while planning"""
+        get_audio_manager_pool().evict_modified = False
+        local_album_data = Scanner().scan_album_in_folder_if_exists(self.album_folder)
+        assert local_album_data
+        vgmdb_album_data = get_vgmdb_album_data("DFCL-1771~4", self.cover_data)
+        vgmdb_album_data.link_local_album_data(local_album_data)
+        tag_result = Tagger(local_album_data, vgmdb_album_data, self.config).plan_files()
+        file_tag_plans = []
+        for result in tag_result.file_tag_results:
+            stat = os.stat(result.file_path)
+            file_tag_plans.append(FileTagPlan(file_path=result.file_path, size=stat.st_size, modification_time=stat.st_mtime_ns, changes=result.changes))
+        album_plan = AlbumPlan(album_folder_path=self.album_folder, file_tag_plans=file_tag_plans, folder_organize_result=Organizer(local_album_data, self.config).organize())
+        for track in local_album_data.get_all_tracks():
+            get_audio_manager_pool().discard(track.file_path, save=False)
+        return album_plan
+
+    def _get_modification_times(self) -> dict[str, int]:
+        return {os.path.join(root, name): os.stat(os.path.join(root, name)).st_mtime_ns for root, _, names in os.walk(self.album_folder) for name in names}
+
+    def test_plan_and_apply(self):
+        modification_times = self._get_modification_times()
+        album_plan = self._plan_album()
+        self.assertEqual(self._get_modification_times(), modification_times)  # planning does not modify any file
+        folder_organize_result = album_plan.folder_organize_result
+        assert folder_organize_result
+        self.assertTrue(str(folder_organize_result.new_name).startswith("[2010.06.23] Xenoblade Original Soundtrack [DFCL-1771"))  # organized with the planned tags
+        with PlanWriter(self.plan_path) as writer:
+            writer.write(album_plan)
+        self.assertEqual(len(os.listdir(get_sidecar_folder(self.plan_path))), 1)  # the cover is stored once for the whole album
+
+        (loaded_plan,) = read_plan(self.plan_path)
+        ((applied_plan, tag_result),) = PlanApplier(self.config).apply([loaded_plan])
+        self.assertEqual((tag_result.files_rewritten, len(tag_result.failed_file_tag_results)), (4, 0))
+        new_album_folder = folder_organize_result.new_path
+        self.assertFalse(os.path.exists(self.album_folder))
+        audio_manager = AudioFactory.buildAudioManager(os.path.join(new_album_folder, "Disc 2", "2. Track 2-2.opus"))
+        self.assertEqual(audio_manager.getCatalog(), ["DFCL-1771~4"])
+        self.assertEqual([picture.data for picture in audio_manager.getAllPictures()], [self.cover_data])
+
+    def test_files_changed_since_planning_are_not_tagged(self):
+        with PlanWriter(self.plan_path) as writer:
+            writer.write(self._plan_album())
+        changed_file_path = os.path.join(self.album_folder, "Disc 1", "01.mp3")
+        audio_manager = AudioFactory.buildAudioManager(changed_file_path)
+        audio_manager.setAlbum(["Tagged by something else"])
+        audio_manager.save()
+
+        ((_, tag_result),) = PlanApplier(self.config).apply(read_plan(self.plan_path))
+        self.assertEqual([result.file_path for result in tag_result.failed_file_tag_results], [changed_file_path])
+        self.assertEqual(tag_result.files_rewritten, 3)
+        self.assertTrue(os.path.exists(self.album_folder))  # not renamed
+        self.assertEqual(AudioFactory.buildAudioManager(changed_file_path).getAlbum(), ["Tagged by something else"])
+
+    def test_plans_are_appended(self):
+        album_plan = AlbumPlan(album_folder_path=self.album_folder)
+        for _ in range(2):
+            with PlanWriter(self.plan_path) as writer:
+                writer.write(album_plan)
+        self.assertEqual(len(list(read_plan(self.plan_path))), 2)
+        not_a_plan = os.path.join(self.temp_dir.name, "not_a_plan.jsonl")
+        with open(not_a_plan, "w") as file:
+            file.write('{"album_folder_path": "Album"}\n')
+        with self.assertRaises(PlanException):
+            PlanWriter(not_a_plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import time
+import unittest
+
+from Modules.Utils.rate_limiter import get_rate_limiter
+from Modules.VGMDB.api.client import VgmdbClient
+from Modules.VGMDB.api.prefetcher import Prefetcher
+from Tests.test_utils import FakeVgmdbInfoServer, getRandomCoverImageData, get_search_result
+
+# searching for 'unique' finds album 1, 'ambiguous' finds albums 2 and 3 released in different years, albums share one cover
+SEARCH_RESULTS = {"unique": [get_search_result("1")], "ambiguous": [get_search_result("2", "2010-01-01"), get_search_result("3", "2012-01-01")]}
+
+
+class TestPrefetcher(unittest.TestCase):
+    def setUp(self):
+        get_rate_limiter().configure(max_requests_per_second=0)  # shared by the process, another test may have bound it
+        self.server = FakeVgmdbInfoServer(search_results=SEARCH_RESULTS, cover_data=getRandomCoverImageData())
+        self.client = VgmdbClient(base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def _wait(self, prefetcher: Prefetcher, album_key: str):
+        prefetcher.prefetches[album_key].result(timeout=10)
+
+    def test_unambiguous_albums_are_fetched_with_their_cover(self):
+        prefetcher = Prefetcher(self.client, max_bytes=64 * 1024 * 1024)
+        prefetcher.prefetch("/music/Unique", "unique")
+        self._wait(prefetcher, "/music/Unique")
+        self.assertEqual(sorted(self.server.requests_seen), ["/album/1", "/cover.jpg", "/search?q=unique"])
+        self.assertGreater(prefetcher.get_held_bytes(), 0)
+
+        self.assertEqual(self.client.search_album("unique")[0].album_id, "1")  # what tagging the album asks for
+        vgmdb_album_data = self.client.get_album_details("1")
+        self.assertIsNotNone(vgmdb_album_data.get_album_cover_data())
+        self.assertEqual(len(self.server.requests_seen), 3)
+        prefetcher.release("/music/Unique")
+        self.assertEqual(prefetcher.get_held_bytes(), 0)
+
+    def test_albums_joined_while_prefetched_are_shared(self):
+        self.server.delay_seconds = 0.2
+        prefetcher = Prefetcher(self.client, max_bytes=64 * 1024 * 1024)
+        prefetcher.prefetch("/music/Embedded", None, album_id="4")
+        time.sleep(0.05)  # the album is still in flight
+        vgmdb_album_data = self.client.get_album_details("4")
+        self._wait(prefetcher, "/music/Embedded")
+        self.assertIs(self.client.album_cache["4"], vgmdb_album_data)
+        self.assertIsNotNone(vgmdb_album_data.get_album_cover_data())
+        self.assertEqual(sorted(self.server.requests_seen), ["/album/4", "/cover.jpg"])  # the cover is downloaded once
+
+    def test_ambiguous_searches_are_filtered_by_year(self):
+        prefetcher = Prefetcher(self.client, max_bytes=64 * 1024 * 1024)
+        prefetcher.prefetch("/music/Ambiguous", "ambiguous")
+        prefetcher.prefetch("/music/Ambiguous 2012", "ambiguous", year="2012")
+        prefetcher.prefetch("/music/Embedded", None, album_id="4")
+        for album_key in ["/music/Ambiguous", "/music/Ambiguous 2012", "/music/Embedded"]:
+            self._wait(prefetcher, album_key)
+        self.assertEqual(sorted(self.server.requests_seen), ["/album/3", "/album/4", "/cover.jpg", "/cover.jpg", "/search?q=ambiguous"])  # the search is shared
+        self.assertEqual((prefetcher.albums_prefetched, prefetcher.albums_skipped), (2, 1))
+
+    def test_memory_ceiling(self):
+        prefetcher = Prefetcher(self.client, max_bytes=0)
+        prefetcher.prefetch("/music/Unique", "unique")
+        self._wait(prefetcher, "/music/Unique")
+        self.assertEqual(self.server.requests_seen, ["/search?q=unique"])
+        self.assertEqual(prefetcher.albums_skipped, 1)
+
+    def test_close_cancels_running_prefetches(self):
+        self.server.delay_seconds = 0.5
+        prefetcher = Prefetcher(self.client, max_bytes=64 * 1024 * 1024)
+        prefetcher.prefetch("/music/Unique", "unique")
+        prefetch = prefetcher.prefetches["/music/Unique"]
+        time.sleep(0.1)
+        prefetcher.close()
+        time.sleep(0.6)
+        self.assertTrue(prefetch.cancelled())
+        self.assertEqual(self.server.requests_seen, ["/search?q=unique"])  # the album was never fetched
+        self.assertEqual(prefetcher.prefetches, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import time
+import unittest
+
+from Modules.Utils.rate_limiter import RateLimiter
+from Tests.test_utils import FakeClock
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_every_host_has_its_own_bucket(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(max_requests_per_second=2, burst=2, clock=clock, sleep=clock.sleep)
+        for _ in range(6):
+            with rate_limiter.limit("https://vgmdb.info/album/551"):
+                clock.now += 0.1  # the transfer
+        with rate_limiter.limit("https://media.vgm.io/albums/cover.jpg"):
+            pass
+        stats = rate_limiter.get_stats()
+        self.assertEqual((stats["vgmdb.info"].requests, stats["media.vgm.io"].requests), (6, 1))
+        self.assertAlmostEqual(stats["vgmdb.info"].transfer_seconds, 0.6)
+        self.assertAlmostEqual(stats["vgmdb.info"].wait_seconds, 1.5)  # 2.1 seconds for 6 requests at 2 per second after a burst of 2, less the time spent transferring
+        self.assertEqual(stats["media.vgm.io"].wait_seconds, 0)
+        self.assertAlmostEqual(stats["vgmdb.info"].requests_per_second, 6 / 2.1)
+        self.assertEqual(len(rate_limiter.summary()), 2)
+
+    def test_unlimited_requests_are_only_measured(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+        for _ in range(100):
+            with rate_limiter.limit("http://localhost:5020/search?q=a"):
+                pass
+        self.assertEqual(clock.now, 0)
+        self.assertEqual(rate_limiter.get_stats()["localhost:5020"].requests, 100)
+
+    def test_loopback_hosts_are_not_limited(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(max_requests_per_second=1, burst=1, clock=clock, sleep=clock.sleep)
+        for url in ["http://localhost:9999/album/1", "http://127.0.0.1:9999/album/1", "http://[::1]:9999/album/1"] * 5:
+            with rate_limiter.limit(url):
+                pass
+        self.assertEqual(clock.now, 0)
+        self.assertEqual(rate_limiter.get_stats()["127.0.0.1:9999"].requests, 5)
+        with rate_limiter.limit("https://vgmdb.info/album/1"):
+            pass
+        with rate_limiter.limit("https://vgmdb.info/album/2"):
+            pass
+        self.assertEqual(clock.now, 1)
+
+    def test_coroutines_wait_without_blocking(self):
+        rate_limiter = RateLimiter(max_requests_per_second=20, burst=1)
+
+        async def request(url: str):
+            async with rate_limiter.limit_async(url):
+                await asyncio.sleep(0)
+
+        async def run():
+            other_work_done = asyncio.Event()
+
+            async def other_work():
+                other_work_done.set()
+
+            await asyncio.gather(*[request("https://vgmdb.info/album/1") for _ in range(5)], other_work())
+            return other_work_done.is_set()
+
+        start = time.perf_counter()
+        self.assertTrue(asyncio.run(run()))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.19)  # 4 requests beyond the burst at 20 per second
+        self.assertEqual(rate_limiter.get_stats()["vgmdb.info"].requests, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Modules.Scan.scan_index import ScanIndex
+from Modules.Scan.scanner import Scanner
+from Tests.test_utils import get_test_file_path
+
+
+class TestScanIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.album_folder = os.path.join(self.temp_dir.name, "library", "Album")
+        os.makedirs(self.album_folder)
+        self.file_paths: list[str] = []
+        for track_number, extension in enumerate(["mp3", "ogg", "opus"], start=1):
+            file_path = os.path.join(self.album_folder, f"{track_number:02}. track.{extension}")
+            shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+            audio_manager = AudioFactory.buildAudioManager(file_path)
+            audio_manager.setAlbum(["Test Album"])
+            audio_manager.setCatalog(["TEST-0001"])
+            audio_manager.setTrackNumbers(track_number, 3)
+            audio_manager.setDiscNumbers(1, 1)
+            audio_manager.save()
+            self.file_paths.append(file_path)
+        self.index_path = os.path.join(self.temp_dir.name, "index.sqlite")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unchanged_files_are_served_from_index(self):
+        first_index = ScanIndex(self.index_path)
+        albums = Scanner(scan_index=first_index).scan_albums_recursively(self.temp_dir.name)
+        first_index.close()
+        self.assertEqual(len(albums), 1)
+        self.assertEqual(first_index.misses, 3)
+
+        second_index = ScanIndex(self.index_path)
+        albums = Scanner(scan_index=second_index).scan_albums_recursively(self.temp_dir.name)
+        second_index.close()
+        self.assertEqual(len(albums), 1)
+        self.assertEqual((second_index.hits, second_index.misses), (3, 0))
+        track = albums[0].get_track(1, 2)
+        self.assertIsNotNone(track)
+        self.assertEqual(track.tags.catalog, ["TEST-0001"])  # type: ignore
+
+    def test_changed_files_are_read_again(self):
+        index = ScanIndex(self.index_path)
+        Scanner(scan_index=index).scan_albums_recursively(self.temp_dir.name)
+
+        audio_manager = AudioFactory.buildAudioManager(self.file_paths[0])
+        audio_manager.setAlbum(["Another Album"])
+        audio_manager.save()
+        os.utime(self.file_paths[0], ns=(0, 0))  # make sure the change is visible even on filesystems with coarse mtime
+
+        index.hits, index.misses = 0, 0
+        albums = Scanner(scan_index=index).scan_albums_recursively(self.temp_dir.name)
+        index.close()
+        self.assertEqual((index.hits, index.misses), (2, 1))
+        track = albums[0].get_track(1, 1)
+        self.assertEqual(track.tags.album, ["Another Album"])  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
+from Modules.Scan.scan_snapshot import ScanSnapshotException, read_scan_snapshot, read_scan_snapshot_header, write_scan_snapshot
+from Modules.Scan.scanner import Scanner
+from Tests.test_utils import get_test_file_path
+
+
+class TestScanSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library = os.path.join(self.temp_dir.name, "scanned", "Music")
+        for album_number in range(3):
+            album_folder = os.path.join(self.library, f"Album {album_number}")
+            for disc_number in range(1, 3):
+                for track_number, extension in enumerate(["mp3", "ogg"], start=1):
+                    file_path = os.path.join(album_folder, f"Disc {disc_number}", f"{track_number:02}.{extension}")
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+                    audio_manager = AudioFactory.buildAudioManager(file_path)
+                    audio_manager.setAlbum([f"Album {album_number}"])
+                    audio_manager.setCatalog([f"CAT-{album_number}"])
+                    audio_manager.setDiscNumbers(disc_number, 2)
+                    audio_manager.setTrackNumbers(track_number, 2)
+                    audio_manager.save()
+        self.albums = Scanner().scan_albums_recursively(self.library)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _get_tracks(self, albums, root: str) -> dict[str, object]:
+        return {os.path.relpath(track.file_path, root): (track.tags, track.depth_in_parent_folder) for album in albums for track in album.get_all_tracks()}
+
+    def test_round_trip_on_another_mount_point(self):
+        for snapshot_name in ["scan.jsonl", "scan.jsonl.gz"]:
+            with self.subTest(snapshot_name=snapshot_name):
+                snapshot_path = os.path.join(self.temp_dir.name, snapshot_name)
+                self.assertEqual(write_scan_snapshot(snapshot_path, self.library, self.albums), 3)
+                self.assertEqual(read_scan_snapshot_header(snapshot_path).root_dir, self.library)
+
+                mount_point = os.path.join(self.temp_dir.name, "mounted", "Music")
+                opened_before = get_audio_manager_pool().opened
+                loaded_albums = list(read_scan_snapshot(snapshot_path, mount_point))
+                self.assertEqual(get_audio_manager_pool().opened, opened_before)  # the audio files are not touched
+
+                self.assertEqual(sorted(album.album_folder_path for album in loaded_albums), [os.path.join(mount_point, f"Album {i}") for i in range(3)])
+                self.assertEqual(self._get_tracks(loaded_albums, mount_point), self._get_tracks(self.albums, self.library))
+                self.assertEqual([album.total_discs for album in loaded_albums], [2, 2, 2])
+
+    def test_album_at_root(self):
+        album_folder = os.path.join(self.library, "Album 0")
+        album = Scanner().scan_album_in_folder_if_exists(album_folder)
+        snapshot_path = os.path.join(self.temp_dir.name, "album.jsonl")
+        write_scan_snapshot(snapshot_path, album_folder, [album])  # type: ignore
+        (loaded_album,) = read_scan_snapshot(snapshot_path)
+        self.assertEqual(loaded_album.album_folder_path, album_folder)
+        self.assertEqual(self._get_tracks([loaded_album], album_folder), self._get_tracks([album], album_folder))
+
+    def test_failed_scan_keeps_previous_snapshot(self):
+        snapshot_path = os.path.join(self.temp_dir.name, "scan.jsonl")
+        write_scan_snapshot(snapshot_path, self.library, self.albums)
+
+        def failing_scan():
+            yield self.albums[0]
+            raise OSError("network share went away")
+
+        with self.assertRaises(OSError):
+            write_scan_snapshot(snapshot_path, self.library, failing_scan())
+        self.assertEqual(len(list(read_scan_snapshot(snapshot_path))), 3)
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ["scan.jsonl", "scanned"])  # the partial snapshot is removed
+
+    def test_invalid_snapshots(self):
+        with self.assertRaises(ScanSnapshotException):
+            write_scan_snapshot(os.path.join(self.temp_dir.name, "scan.jsonl"), os.path.join(self.library, "Album 0"), self.albums)
+        not_a_snapshot = os.path.join(self.temp_dir.name, "not_a_snapshot.jsonl")
+        with open(not_a_snapshot, "w") as file:
+            file.write('{"album_folder_path": "Album 0"}\n')
+        with self.assertRaises(ScanSnapshotException):
+            list(read_scan_snapshot(not_a_snapshot))
+
+
+if __name__ == "__main__":
+    unittest.main()
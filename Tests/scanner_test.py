@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Modules.Scan.scanner import Scanner
+from Tests.test_utils import get_test_file_path
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.album_folders: list[str] = []
+        for album_number in range(6):
+            album_folder = os.path.join(self.root, f"Label {album_number % 2}", f"Album {album_number}")
+            for track_number, extension in enumerate(["mp3", "ogg"], start=1):
+                disc_folder = os.path.join(album_folder, "Disc 1") if album_number % 3 == 0 else album_folder
+                self._create_track(os.path.join(disc_folder, f"{track_number:02}.{extension}"), f"Album {album_number}", track_number)
+            self.album_folders.append(album_folder)
+        os.makedirs(os.path.join(self.root, "No Music", "Deep", "Er"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_track(self, file_path: str, album_name: str, track_number: int):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _, extension = os.path.splitext(file_path)
+        shutil.copy(get_test_file_path(extension[1:], use_modified_folder=False), file_path)
+        audio_manager = AudioFactory.buildAudioManager(file_path)
+        audio_manager.setAlbum([album_name])
+        audio_manager.setTrackNumbers(track_number, 2)
+        audio_manager.save()
+
+    def test_scan_albums_recursively(self):
+        albums = Scanner().scan_albums_recursively(self.root)
+        self.assertEqual(sorted(album.album_folder_path for album in albums), sorted(self.album_folders))
+        self.assertTrue(all(album.total_tracks_in_album == 2 for album in albums))
+
+    def test_mixed_folder_is_split(self):
+        mixed_folder = os.path.join(self.root, "Dump")
+        for track_number in range(1, 3):
+            self._create_track(os.path.join(mixed_folder, f"first {track_number}.mp3"), "First", track_number)
+            self._create_track(os.path.join(mixed_folder, f"second {track_number}.ogg"), "Second", track_number)
+        albums = Scanner().scan_albums_in_folder(mixed_folder)
+        self.assertEqual(len(albums), 2)
+        self.assertTrue(all(album.shares_album_folder and album.total_tracks_in_album == 2 for album in albums))
+
+    def test_albums_in_sub_folders_are_not_merged(self):
+        artist_folder = os.path.join(self.root, "Artist")
+        for album_name in ["First", "Second"]:
+            self._create_track(os.path.join(artist_folder, album_name, "01.mp3"), album_name, 1)
+        self.assertEqual(Scanner().scan_albums_in_folder(artist_folder), [])
+        albums = Scanner().scan_albums_recursively(artist_folder)
+        self.assertEqual(sorted(album.album_folder_name for album in albums), ["First", "Second"])
+        self.assertFalse(any(album.shares_album_folder for album in albums))
+
+    def test_albums_are_yielded_before_the_scan_finishes(self):
+        scanner = Scanner()
+        albums = scanner.iter_albums_recursively(self.root)
+        next(albums)
+        assert scanner.last_walk_stats
+        directories_read_for_first_album = scanner.last_walk_stats.directories_scanned
+        list(albums)
+        self.assertLess(directories_read_for_first_album, scanner.last_walk_stats.directories_scanned)
+
+    def test_background_scanning(self):
+        albums = list(Scanner().iter_albums_recursively(self.root, queue_size=2))
+        self.assertEqual(sorted(album.album_folder_path for album in albums), sorted(self.album_folders))
+
+    def test_background_scanning_stops_with_consumer(self):
+        albums = Scanner().iter_albums_recursively(self.root, queue_size=1)
+        self.assertIsNotNone(next(albums))
+        albums.close()  # must not hang
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unigen import AudioFactory
+
+from Modules.Scan.scanner import Scanner
+from Modules.Scan.tag_reader import TagReaderPool
+from Tests.test_utils import get_test_file_path
+
+
+class TestTagReaderPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_paths: list[str] = []
+        for i in range(12):
+            extension = ["mp3", "ogg", "opus", "m4a"][i % 4]
+            file_path = os.path.join(self.temp_dir.name, f"{i:02}.{extension}")
+            shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+            audio_manager = AudioFactory.buildAudioManager(file_path)
+            audio_manager.setAlbum([f"album {i}"])
+            audio_manager.save()
+            self.file_paths.append(file_path)
+        self.corrupt_file_path = os.path.join(self.temp_dir.name, "corrupt.flac")
+        with open(self.corrupt_file_path, "wb") as file:
+            file.write(b"definitely not a flac file")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_results_keep_input_order(self):
+        for pool_type in ["thread", "process"]:
+            pool = TagReaderPool(workers=4, pool_type=pool_type)  # type: ignore
+            results = pool.read(self.file_paths)
+            pool.close()
+            self.assertEqual([tags.album for tags, _ in results], [[f"album {i}"] for i in range(12)])  # type: ignore
+
+    def test_errors_are_reported_per_file(self):
+        pool = TagReaderPool(workers=2)
+        results = pool.read([self.file_paths[0], self.corrupt_file_path, self.file_paths[1]])
+        pool.close()
+        self.assertIsNotNone(results[0][0])
+        self.assertIsNone(results[1][0])
+        self.assertEqual(results[1][1].file_path, self.corrupt_file_path)  # type: ignore
+        self.assertIsNotNone(results[2][0])
+
+    def test_scanner_collects_errors(self):
+        scanner = Scanner(scan_workers=3)
+        audio_files = scanner.get_supported_audio_files_in_folder(self.temp_dir.name)
+        scanner.close()
+        self.assertEqual(len(audio_files), 12)
+        self.assertEqual([error.file_path for error in scanner.scan_errors], [self.corrupt_file_path])
+
+
+if __name__ == "__main__":
+    unittest.main()
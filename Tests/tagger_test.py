@@ -0,0 +1,209 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from unigen import AudioFactory
+
+from Imports.config import Config
+from Modules.Scan.audio_manager_pool import get_audio_manager_pool
+from Modules.Scan.models.local_track_tags import LocalTrackTags
+from Modules.Scan.scanner import Scanner
+from Modules.Tag import custom_tags
+from Modules.Tag.tagger import Tagger
+from Modules.VGMDB.models.vgmdb_album_data import ArrangerOrComposerOrLyricistOrPerformer, Names, VgmdbAlbumData, VgmdbDiscData, VgmdbTrackData
+from Tests.test_utils import create_minimal_flac_file, getRandomCoverImageData, get_test_file_path
+
+EXTENSIONS = ["flac", "mp3", "ogg", "m4a"]
+
+
+def get_vgmdb_album_data(catalog: str, cover_data: bytes) -> VgmdbAlbumData:
+    composers = [ArrangerOrComposerOrLyricistOrPerformer(names=Names(en=name)) for name in ["Composer A", "Composer B", "Composer A"]]
+    return VgmdbAlbumData(
+        link="album/19513",
+        name="Xenoblade Original Soundtrack",
+        names=Names(en="Xenoblade Original Soundtrack", ja="ゼノブレイド オリジナル・サウンドトラック"),
+        discs={
+            disc_number: VgmdbDiscData(tracks={track_number: VgmdbTrackData(names=Names(en=f"Track {disc_number}-{track_number}")) for track_number in range(1, 3)})
+            for disc_number in range(1, 3)
+        },
+        media_format="CD",
+        notes="",
+        vgmdb_link="https://vgmdb.net/album/19513",
+        release_date="2010-06-23",
+        catalog=catalog,
+        barcode="4582117980943",
+        picture_full="https://media.vgm.io/albums/31/19513/19513-1264694343.jpg",
+        picture_small=None,
+        picture_thumb=None,
+        arrangers=[],
+        composers=composers,
+        lyricists=[],
+        performers=[],
+        album_id="19513",
+        album_cover_cache=cover_data,  # never downloaded
+    )
+
+
+class TestTagger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.album_folder = os.path.join(self.temp_dir.name, "Album")
+        self.cover_data = getRandomCoverImageData()
+        for disc_number in range(1, 3):
+            for track_number in range(1, 3):
+                extension = EXTENSIONS[(disc_number - 1) * 2 + track_number - 1]
+                file_path = os.path.join(self.album_folder, f"Disc {disc_number}", f"{track_number:02}.{extension}")
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                if extension == "flac":
+                    create_minimal_flac_file(file_path)
+                else:
+                    shutil.copy(get_test_file_path(extension, use_modified_folder=False), file_path)
+                audio_manager = AudioFactory.buildAudioManager(file_path)
+                audio_manager.setAlbum(["Xenoblade"])
+                audio_manager.setDiscNumbers(disc_number, 2)
+                audio_manager.setTrackNumbers(track_number, 2)
+                audio_manager.save()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _get_tagger(self, catalog: str = "DFCL-1771~4", **config: object) -> Tagger:
+        local_album_data = Scanner().scan_album_in_folder_if_exists(self.album_folder)
+        assert local_album_data
+        vgmdb_album_data = get_vgmdb_album_data(catalog, self.cover_data)
+        vgmdb_album_data.link_local_album_data(local_album_data)
+        return Tagger(local_album_data, vgmdb_album_data, Config(root_dir=self.album_folder, composers=True, **config))  # type: ignore
+
+    def _tag(self, catalog: str = "DFCL-1771~4", **config: object):
+        return self._get_tagger(catalog, **config).tag_files()
+
+    def _get_modification_times(self) -> dict[str, int]:
+        return {os.path.join(root, name): os.stat(os.path.join(root, name)).st_mtime_ns for root, _, names in os.walk(self.album_folder) for name in names}
+
+    def test_unchanged_files_are_not_saved(self):
+        first_result = self._tag()
+        self.assertEqual((first_result.files_rewritten, first_result.files_skipped), (4, 0))
+        self.assertGreater(first_result.bytes_written, 0)
+        audio_manager = AudioFactory.buildAudioManager(os.path.join(self.album_folder, "Disc 2", "02.m4a"))
+        self.assertEqual(audio_manager.getCatalog(), ["DFCL-1771~4"])
+        self.assertEqual(audio_manager.getTitle(), ["Track 2-2"])
+        self.assertEqual(audio_manager.getCustomTag(custom_tags.COMPOSER), ["Composer A", "Composer B"])
+
+        modification_times = self._get_modification_times()
+        second_result = self._tag()
+        self.assertEqual((second_result.files_rewritten, second_result.files_skipped, second_result.bytes_written), (0, 4, 0))
+        self.assertEqual(self._get_modification_times(), modification_times)
+
+    def test_only_changed_tags_are_written(self):
+        self._tag(keep_title=True)
+        result = self._tag(catalog="DFCL-1771", keep_title=True)
+        self.assertEqual(result.files_rewritten, 4)
+        self.assertEqual(result.files_saved_in_place, 4)  # padding was reserved when the files were first tagged
+        self.assertTrue(all(file_result.changed_fields == ["catalog"] for file_result in result.file_tag_results))
+        self.assertTrue(all(file_result.changed_bytes == len("DFCL-1771") for file_result in result.file_tag_results))
+        self.assertEqual(AudioFactory.buildAudioManager(os.path.join(self.album_folder, "Disc 1", "01.flac")).getCatalog(), ["DFCL-1771"])
+
+    def test_cover_overwrite(self):
+        self._tag()
+        previous_cover_data = self.cover_data
+        while self.cover_data == previous_cover_data:
+            self.cover_data = getRandomCoverImageData()
+        self.assertEqual(self._tag().files_rewritten, 0)  # existing covers are kept
+        result = self._tag(album_cover_overwrite=True)
+        self.assertTrue(all(file_result.changed_fields == ["cover"] for file_result in result.file_tag_results))
+        self.assertEqual(self._tag(album_cover_overwrite=True).files_rewritten, 0)
+
+    def test_stream_pictures(self):
+        result = self._tag(stream_pictures=True, picture_memory_mb=0, save_workers=4)  # a ceiling this low saves the files one by one
+        self.assertEqual(result.files_rewritten, 4)
+        self.assertTrue(all("cover" in file_result.changed_fields for file_result in result.file_tag_results))
+        self.assertFalse(any(file_result.file_path in get_audio_manager_pool().entries for file_result in result.file_tag_results))  # closed once saved
+        audio_manager = AudioFactory.buildAudioManager(os.path.join(self.album_folder, "Disc 1", "02.mp3"))
+        self.assertEqual([picture.data for picture in audio_manager.getAllPictures()], [self.cover_data])
+
+        second_result = self._tag(stream_pictures=True)
+        self.assertEqual((second_result.files_rewritten, second_result.files_skipped), (0, 4))
+
+    def test_tag_snapshot_follows_the_written_tags(self):
+        tagger = self._get_tagger()
+        tagger.tag_files()
+        for local_track in tagger.matched_local_tracks:
+            written_tags = LocalTrackTags.from_audio_manager(AudioFactory.buildAudioManager(local_track.file_path))
+            self.assertEqual(local_track.tags.model_dump(exclude={"year"}), written_tags.model_dump(exclude={"year"}))  # id3 also writes the year along with the date
+        self.assertEqual(tagger.matched_local_tracks[0].tags.title, ["Track 1-1"])
+
+    def test_save_errors_are_collected_per_file(self):
+        tagger = self._get_tagger(save_workers=3)
+        for local_track in tagger.matched_local_tracks:
+            local_track.audio_manager.getAlbum()  # open every file before one of them disappears
+        missing_file_path = os.path.join(self.album_folder, "Disc 1", "01.flac")
+        os.remove(missing_file_path)
+        result = tagger.tag_files()
+        self.assertEqual([file_result.file_path for file_result in result.failed_file_tag_results], [missing_file_path])
+        self.assertEqual(result.files_rewritten, 3)
+        self.assertIn("failed to save 1 files", result.summary())
+        self.assertEqual(AudioFactory.buildAudioManager(os.path.join(self.album_folder, "Disc 2", "02.m4a")).getCatalog(), ["DFCL-1771~4"])
+
+    def test_failed_tagging_is_not_saved(self):
+        tagger = self._get_tagger()
+
+        def fail_to_download_cover():
+            raise ConnectionError("cover could not be downloaded")
+
+        tagger._tag_album_specific_data = fail_to_download_cover  # after the titles were set
+        with self.assertRaises(ConnectionError):
+            tagger.tag_files()
+        for local_track in tagger.matched_local_tracks:
+            get_audio_manager_pool().discard(local_track.file_path)  # as the organizer does before renaming
+            self.assertNotIn("Track", " ".join(AudioFactory.buildAudioManager(local_track.file_path).getTitle()))
+
+    def test_files_saved_by_an_interrupted_run_are_skipped(self):
+        saved_file_path = os.path.join(self.album_folder, "Disc 1", "01.flac")
+        tagger = self._get_tagger()
+        tagger = Tagger(tagger.local_album_data, tagger.vgmdb_album_data, tagger.config, saved_files={saved_file_path})
+        result = tagger.tag_files()
+        self.assertEqual(result.files_rewritten, 3)
+        self.assertNotIn(saved_file_path, [file_result.file_path for file_result in result.file_tag_results])
+        self.assertEqual(AudioFactory.buildAudioManager(saved_file_path).getTitle(), [])
+
+    def test_files_waiting_to_be_saved_are_not_saved_by_the_pool(self):
+        pool = get_audio_manager_pool()
+        self.addCleanup(pool.configure, pool.max_open_files, pool.max_bytes)
+        pool.configure(max_open_files=1, max_bytes=pool.max_bytes)
+        save_if_marked = pool._save_if_marked
+        saved_by_pool: list[str] = []
+
+        def spy(file_path, entry):
+            if entry.dirty:
+                saved_by_pool.append(file_path)
+            save_if_marked(file_path, entry)
+
+        with mock.patch.object(pool, "_save_if_marked", spy):
+            result = self._tag(save_workers=1)
+        self.assertEqual(saved_by_pool, [])
+        self.assertEqual(result.files_rewritten, 4)
+        self.assertTrue(all(file_result.audio_intact and file_result.bytes_written for file_result in result.file_tag_results))
+
+    def test_changed_audio_is_reported(self):
+        tagger = self._get_tagger()
+        save_audio_manager = tagger._save_audio_manager
+        corrupted_file_path = os.path.join(self.album_folder, "Disc 1", "02.mp3")
+
+        def save_and_corrupt(local_track):
+            stats = save_audio_manager(local_track)
+            if local_track.file_path == corrupted_file_path:
+                with open(local_track.file_path, "ab") as file:
+                    file.write(b"\x00" * 16)  # as if the save had spilled into the audio
+            return stats
+
+        tagger._save_audio_manager = save_and_corrupt
+        result = tagger.tag_files()
+        self.assertEqual([file_result.file_path for file_result in result.corrupted_file_tag_results], [corrupted_file_path])
+        self.assertTrue(all(file_result.audio_intact for file_result in result.file_tag_results if file_result.file_path != corrupted_file_path))
+        self.assertIn("the audio of 1 files changed while saving", result.summary())
+        self.assertTrue(all(file_result.audio_intact is None for file_result in self._tag(catalog="DFCL-1771", verify_audio=False).file_tag_results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,14 @@
+import json
 import os
 import random
 import shutil
 import string
-from typing import Any
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
 
 currentFileAbsolutePath = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
 baseFolder = os.path.join(currentFileAbsolutePath, "testSamples", "baseSamples")
@@ -79,6 +85,16 @@ def get_test_file_path(file_extension: str, use_modified_folder: bool = True) ->
     return os.path.join(audio_files_folder, f"{file_extension}_test.{file_extension}")
 
 
+def create_minimal_flac_file(file_path: str):
+    """
+    writes a FLAC file holding only a STREAMINFO block (44.1kHz, 16 bit, stereo, no samples), enough for mutagen to read and tag it
+    the base samples do not contain a FLAC file
+    """
+    stream_info = struct.pack(">HH", 4096, 4096) + b"\x00" * 6 + ((44100 << 44) | (1 << 41) | (15 << 36)).to_bytes(8, "big") + b"\x00" * 16
+    with open(file_path, "wb") as file:
+        file.write(b"fLaC" + bytes([0x80]) + len(stream_info).to_bytes(3, "big") + stream_info)
+
+
 def save_image(image_bytes: bytes, filename: str):
     """
     Save image bytes to a file.
@@ -92,3 +108,110 @@ def save_image(image_bytes: bytes, filename: str):
         print(f"Image saved as {filename}.")
     except Exception as e:
         print(f"Error saving image: {e}")
+
+
+class FakeClock:
+    """a clock which only moves when a test moves it (or sleeps on it)"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def get_search_result(album_id: str, release_date: str = "2010-06-24", catalog: Optional[str] = None, title: Optional[str] = None) -> dict[str, Any]:
+    """an album as found by a vgmdb.info search"""
+    return {"catalog": catalog or f"CAT-{album_id}", "link": f"album/{album_id}", "release_date": release_date, "titles": {"en": title or f"Album {album_id}"}}
+
+
+def get_album_response(album_id: str, picture_full: Optional[str] = None) -> dict[str, Any]:
+    """the smallest album vgmdb.info could answer with"""
+    return {
+        "link": f"album/{album_id}",
+        "name": f"Album {album_id}",
+        "names": {"en": f"Album {album_id}"},
+        "discs": [],
+        "media_format": "CD",
+        "notes": "",
+        "vgmdb_link": f"https://vgmdb.net/album/{album_id}",
+        "picture_full": picture_full,
+        "picture_small": None,
+        "picture_thumb": None,
+        "arrangers": [],
+        "composers": [],
+        "lyricists": [],
+        "performers": [],
+    }
+
+
+class FakeVgmdbInfoServer:
+    """
+    a local stand-in for vgmdb.info answering album/<id>, search?q=<term> and cover.jpg after delay_seconds, from a background thread
+    searches find the results given for their term in search_results, otherwise a single album 1 (KSLA-0001), album 'missing' is not found
+    albums link cover_data when given, every response has an ETag and If-None-Match is answered with a 304
+    a status other than 200 fails every request with it
+    """
+
+    def __init__(self, search_results: Optional[dict[str, list[dict[str, Any]]]] = None, cover_data: Optional[bytes] = None, delay_seconds: float = 0, status: int = 200):
+        self.search_results = search_results or {}
+        self.cover_data = cover_data
+        self.delay_seconds = delay_seconds
+        self.status = status
+        self.lock = threading.Lock()
+        self.requests_seen: list[str] = []
+        self.concurrent, self.max_concurrent = 0, 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler_class())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # private functions
+    def _get_handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keeps connections alive
+
+            def do_GET(self):
+                with fake_server.lock:
+                    fake_server.requests_seen.append(self.path)
+                    fake_server.concurrent += 1
+                    fake_server.max_concurrent = max(fake_server.max_concurrent, fake_server.concurrent)
+                time.sleep(fake_server.delay_seconds)
+                with fake_server.lock:
+                    fake_server.concurrent -= 1
+                status, body, content_type = fake_server._answer(self.path, self.headers["Host"])
+                etag = f'"{self.path}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object):
+                pass
+
+        return Handler
+
+    def _answer(self, path: str, host: str) -> tuple[int, bytes, str]:
+        parts = urlsplit(path)
+        if self.status != 200 or parts.path == "/album/missing":
+            return self.status if self.status != 200 else 404, b"", "application/json"
+        if parts.path == "/cover.jpg" and self.cover_data:
+            return 200, self.cover_data, "image/jpeg"
+        if parts.path == "/search":
+            search_term = parse_qs(parts.query).get("q", [""])[0]
+            albums = self.search_results.get(search_term, [get_search_result("1", catalog="KSLA-0001", title="Rewrite OST")])
+            return 200, json.dumps({"results": {"albums": albums}}).encode(), "application/json"
+        picture_full = f"http://{host}/cover.jpg" if self.cover_data else None
+        return 200, json.dumps(get_album_response(parts.path.split("/")[-1], picture_full)).encode(), "application/json"
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import unittest
+
+from Modules.Utils.rate_limiter import get_rate_limiter
+from Modules.VGMDB import constants
+from Modules.VGMDB.api.async_client import AsyncVgmdbClient
+from Modules.VGMDB.api.client import VgmdbClient, VgmdbRequestException
+from Tests.test_utils import FakeVgmdbInfoServer
+
+RESPONSE_DELAY_SECONDS = 0.1
+
+
+class TestVgmdbClient(unittest.TestCase):
+    def setUp(self):
+        get_rate_limiter().configure(max_requests_per_second=0)  # shared by the process, another test may have bound it
+        self.server = FakeVgmdbInfoServer(delay_seconds=RESPONSE_DELAY_SECONDS)
+        self.base_url = self.server.base_url
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_concurrent_requests_are_bounded(self):
+        client = VgmdbClient(base_url=self.base_url, max_concurrent_requests=4)
+        start = time.perf_counter()
+        albums = client.get_many_album_details([str(album_id) for album_id in range(12)])
+        seconds = time.perf_counter() - start
+        client.close()
+        self.assertEqual([album.album_id for album in albums if not isinstance(album, Exception)], [str(album_id) for album_id in range(12)])
+        self.assertEqual(self.server.max_concurrent, 4)
+        self.assertLess(seconds, 12 * RESPONSE_DELAY_SECONDS)  # about 3 rounds of 4 requests
+
+    def test_same_requests_are_coalesced(self):
+        async def fetch_concurrently():
+            async_client = AsyncVgmdbClient(self.base_url)
+            results = await asyncio.gather(*[async_client.search_album(term) for term in ["Rewrite OST", "Rewrite: OST", "Rewrite~OST"]], *[async_client.get_album_details("551") for _ in range(5)])
+            await async_client.close()
+            return async_client, results
+
+        async_client, results = asyncio.run(fetch_concurrently())
+        self.assertEqual(sorted(self.server.requests_seen), ["/album/551", "/search?q=Rewrite%20OST"])
+        self.assertEqual((async_client.requests_sent, async_client.requests_coalesced), (2, 6))
+        self.assertEqual(results[0][0].catalog, "KSLA-0001")
+        self.assertTrue(all(album is results[3] and album.album_id == "551" for album in results[3:]))  # a single album for every caller
+        self.assertIs(results[0], results[2])  # the same cleaned search term
+
+    def test_sync_facade(self):
+        client = VgmdbClient(base_url=self.base_url)
+        self.assertEqual(client.get_album_details("551").name, "Album 551")
+        self.assertIn("551", client.album_cache)
+        self.assertEqual(client.search_album("Rewrite")[0].album_id, "1")
+        self.assertIsInstance(client.get_many_album_details(["missing"])[0], VgmdbRequestException)
+        client.close()
+
+    def test_albums_in_memory_are_bounded(self):
+        client = VgmdbClient(base_url=self.base_url, max_cache_bytes=3 * constants.ALBUM_DETAILS_SIZE_ESTIMATE)
+        for album_id in ["1", "2", "3", "1", "4", "5"]:
+            client.get_album_details(album_id)
+        client.close()
+        self.assertEqual(list(client.album_cache), ["1", "4", "5"])  # least recently used first
+        self.assertLessEqual(client.async_client.get_cached_bytes(), 3 * constants.ALBUM_DETAILS_SIZE_ESTIMATE)
+        self.assertEqual(self.server.requests_seen.count("/album/1"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
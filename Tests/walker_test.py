@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from Modules.Scan.walker import LibraryTree, LibraryWalker
+
+
+class TestLibraryWalker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        layout = [
+            "Album A/01. track.flac",
+            "Album A/02. track.mp3",
+            "Album A/cover.jpg",
+            "Album B/Disc 1/01. track.flac",
+            "Album B/Disc 2/01. track.m4a",
+            "Album B/logs/rip.log",
+            "Series/Album C/Disc 1/CD/01. track.opus",
+            "Empty/readme.txt",
+        ]
+        for relative_path in layout:
+            path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_max_depths(self):
+        tree = LibraryWalker().walk(self.root)
+        self.assertEqual(tree.max_depths[os.path.join(self.root, "Album A")], 1)
+        self.assertEqual(tree.max_depths[os.path.join(self.root, "Album B")], 2)
+        self.assertEqual(tree.max_depths[os.path.join(self.root, "Album B", "logs")], -1)
+        self.assertEqual(tree.max_depths[os.path.join(self.root, "Series")], 4)
+        self.assertEqual(tree.max_depths[os.path.join(self.root, "Empty")], -1)
+        self.assertEqual(tree.max_depths[self.root], 5)
+
+    def test_audio_files_and_depths(self):
+        tree = LibraryWalker().walk(self.root)
+        album_b = os.path.join(self.root, "Album B")
+        audio_files = sorted(tree.get_audio_files(album_b))
+        self.assertEqual(
+            audio_files,
+            [(os.path.join(album_b, "Disc 1", "01. track.flac"), 2), (os.path.join(album_b, "Disc 2", "01. track.m4a"), 2)],
+        )
+        self.assertEqual(tree.get_audio_files(album_b, max_depth=1), [])
+        self.assertEqual(len(tree.get_audio_files(os.path.join(self.root, "Album A"))), 2)
+
+    def test_stats(self):
+        tree = LibraryWalker().walk(self.root)
+        self.assertEqual(tree.stats.files_seen, 8)
+        self.assertEqual(tree.stats.audio_files_found, 5)
+        self.assertEqual(tree.stats.directories_scanned, 11)
+        self.assertEqual(tree.stats.syscalls, tree.stats.directories_scanned)  # one directory read per folder, no extra stat calls
+
+    def test_bounded_walk(self):
+        walker = LibraryWalker()
+        tree = LibraryTree(self.root)
+        self.assertGreater(walker.walk_bounded(self.root, tree, 2), 2)
+        self.assertNotIn(self.root, tree.max_depths)  # stopped early, so the depth is not final
+        self.assertEqual(walker.walk_bounded(os.path.join(self.root, "Album B"), tree, 2), 2)
+        self.assertEqual(walker.walk(self.root).max_depths[self.root], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ from Modules.VGMDB.user_interface.cli import CLI
 from Modules.VGMDB.user_interface.cli_args import get_config_from_args
 
 
-app = CLI(get_config_from_args())
+if __name__ == "__main__":  # process pools spawn workers which import this module again
+    app = CLI(get_config_from_args())
 
-app.run()
+    app.run()